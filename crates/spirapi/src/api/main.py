@@ -6,20 +6,36 @@ REST API pour le système Pi-D Indexation
 
 from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any
 import uvicorn
+import json
 import logging
 import time
 from datetime import datetime
+from itertools import islice
 from contextlib import asynccontextmanager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def json_response(payload: Any, status_code: int = 200) -> Response:
+    """Sérialiser une réponse en une seule passe, sans validation response_model ni jsonable_encoder"""
+    if orjson is not None:
+        body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
 
 
 
@@ -909,8 +925,9 @@ class RecordResponse(BaseModel):
     updated_at: str
 
 # Endpoints pour gérer les données des tables
+# Déclarés en `def` : FastAPI les exécute dans son pool de threads, les E/S du stockage ne bloquent pas la boucle
 @app.get("/api/tables/{table_name}/records", response_model=List[RecordResponse])
-async def get_table_records(table_name: str, limit: int = Query(100, ge=1, le=1000)):
+def get_table_records(table_name: str, limit: int = Query(100, ge=1, le=1000)):
     """Récupérer les enregistrements d'une table"""
     try:
         if not database or not SPIRAPI_IMPORTS_AVAILABLE:
@@ -925,23 +942,25 @@ async def get_table_records(table_name: str, limit: int = Query(100, ge=1, le=10
         if not schema:
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
-        # Récupérer les enregistrements via search
+        # Seuls les `limit` premiers identifiants sont lus, pas toute la table
         from src.storage.spirapi_database import StorageType
-        records = database.search({"table": table_name}, StorageType.METADATA)
+        storage_engine = database.storage_engine
+        record_ids = storage_engine.search_ids({"table": table_name}, StorageType.METADATA)
         
-        # Convertir en format de réponse
+        # Convertir en format de réponse ; la liste est sérialisée directement, sans passer par les modèles
         response_records = []
-        for record in records:
-            if hasattr(record, 'data') and hasattr(record, 'id'):
-                response_records.append(RecordResponse(
-                    id=record.id,
-                    data=record.data,
-                    created_at=str(record.data.get('created_at', '')),
-                    updated_at=str(record.data.get('updated_at', ''))
-                ))
+        for record_id in islice(record_ids, limit):
+            record = storage_engine.retrieve(record_id, StorageType.METADATA)
+            if record is not None and isinstance(record.data, dict):
+                response_records.append({
+                    "id": record.id,
+                    "data": record.data,
+                    "created_at": str(record.data.get('created_at', '')),
+                    "updated_at": str(record.data.get('updated_at', ''))
+                })
         
         logger.info(f"✅ Retrieved {len(response_records)} records from table '{table_name}'")
-        return response_records
+        return json_response(response_records)
         
     except HTTPException:
         raise
@@ -949,8 +968,33 @@ async def get_table_records(table_name: str, limit: int = Query(100, ge=1, le=10
         logger.error(f"Error getting records from table '{table_name}': {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/tables/{table_name}/count")
+def count_table_records(table_name: str):
+    """Compter les enregistrements d'une table sans les charger"""
+    try:
+        if not database or not SPIRAPI_IMPORTS_AVAILABLE:
+            raise HTTPException(status_code=500, detail="Database not available")
+        
+        if not schema_manager:
+            raise HTTPException(status_code=500, detail="Schema manager not available")
+        
+        if not schema_manager.get_schema(table_name):
+            raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
+        
+        # Seuls les identifiants sont collectés, les données ne sont pas lues
+        from src.storage.spirapi_database import StorageType
+        record_ids = database.storage_engine.search_ids({"table": table_name}, StorageType.METADATA)
+        
+        return {"table_name": table_name, "count": len(record_ids)}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error counting records in table '{table_name}': {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/tables/{table_name}/records", response_model=RecordResponse)
-async def create_record(table_name: str, record: RecordData):
+def create_record(table_name: str, record: RecordData):
     """Créer un nouvel enregistrement dans une table"""
     try:
         if not database or not SPIRAPI_IMPORTS_AVAILABLE:
@@ -1014,7 +1058,7 @@ async def create_record(table_name: str, record: RecordData):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/tables/{table_name}/records/{record_id}", response_model=RecordResponse)
-async def update_record(table_name: str, record_id: str, record: RecordData):
+def update_record(table_name: str, record_id: str, record: RecordData):
     """Mettre à jour un enregistrement existant"""
     try:
         if not database or not SPIRAPI_IMPORTS_AVAILABLE:
@@ -1076,7 +1120,7 @@ async def update_record(table_name: str, record_id: str, record: RecordData):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/tables/{table_name}/records/{record_id}")
-async def delete_record(table_name: str, record_id: str):
+def delete_record(table_name: str, record_id: str):
     """Supprimer un enregistrement"""
     try:
         if not database or not SPIRAPI_IMPORTS_AVAILABLE:
@@ -0,0 +1,8 @@
+"""
+Compatibility helpers shared by the SpiraPi storage modules
+"""
+
+import sys
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep per-instance __dict__
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
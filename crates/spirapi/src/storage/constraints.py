@@ -4,12 +4,14 @@ Handles primary keys, foreign keys, unique constraints, and validation rules
 """
 
 from enum import Enum
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import hashlib
 import json
 
+from ._compat import DATACLASS_OPTIONS
+
 
 class ConstraintType(Enum):
     """Types of database constraints"""
@@ -63,7 +65,7 @@ class Constraint:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class PrimaryKeyConstraint:
     """Primary key constraint"""
     name: str
@@ -105,7 +107,7 @@ class PrimaryKeyConstraint:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ForeignKeyConstraint:
     """Foreign key constraint"""
     name: str
@@ -147,7 +149,7 @@ class ForeignKeyConstraint:
         return base_dict
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class UniqueConstraint:
     """Unique constraint"""
     name: str
@@ -180,7 +182,7 @@ class UniqueConstraint:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class CheckConstraint:
     """Check constraint with custom validation logic"""
     name: str
@@ -293,6 +295,8 @@ class ConstraintManager:
         self.storage_path = storage_path
         self.constraints: Dict[str, Constraint] = {}
         self.table_constraints: Dict[str, List[str]] = {}
+        # Constraints checked by validate_data, per table; dropped on every change
+        self._validation_cache: Dict[str, Tuple[Constraint, ...]] = {}
         self._load_constraints()
     
     def add_constraint(self, constraint: Constraint) -> None:
@@ -306,6 +310,7 @@ class ConstraintManager:
         if constraint.table_name not in self.table_constraints:
             self.table_constraints[constraint.table_name] = []
         self.table_constraints[constraint.table_name].append(constraint.name)
+        self._validation_cache.pop(constraint.table_name, None)
         
         self._save_constraints()
     
@@ -324,6 +329,7 @@ class ConstraintManager:
             ]
         
         del self.constraints[constraint_name]
+        self._validation_cache.pop(constraint.table_name, None)
         self._save_constraints()
     
     def get_table_constraints(self, table_name: str) -> List[Constraint]:
@@ -339,8 +345,12 @@ class ConstraintManager:
     
     def validate_data(self, table_name: str, data: Dict[str, Any]) -> bool:
         """Validate data against all constraints for a table"""
-        constraints = self.get_table_constraints(table_name)
+        constraints = self._validation_cache.get(table_name)
+        if constraints is None:
+            constraints = tuple(self.get_table_constraints(table_name))
+            self._validation_cache[table_name] = constraints
         
+        # is_active is read on every call, so toggling it needs no invalidation
         for constraint in constraints:
             if constraint.is_active:
                 try:
@@ -12,6 +12,8 @@ import hashlib
 import bisect
 from collections import defaultdict
 
+from ._compat import DATACLASS_OPTIONS
+
 
 class IndexType(Enum):
     """Types of database indexes"""
@@ -61,7 +63,7 @@ class IndexEntry:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class IndexDefinition:
     """Definition of a database index"""
     name: str
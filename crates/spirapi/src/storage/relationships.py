@@ -9,6 +9,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import json
 
+from ._compat import DATACLASS_OPTIONS
+
 
 class RelationshipType(Enum):
     """Types of table relationships"""
@@ -27,7 +29,7 @@ class CascadeAction(Enum):
     NO_ACTION = "NO_ACTION"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class TableRelationship:
     """Represents a relationship between two tables"""
     name: str
@@ -4,26 +4,50 @@ Real database implementation with adaptive schemas and π-based indexing
 """
 
 import json
+import os
+import re
 import time
-from .spirapi_database import SpiraPiDatabase, StorageType
+from ._compat import DATACLASS_OPTIONS
+from .spirapi_database import SpiraPiDatabase, StorageType, _locked_fd, generate_record_id
 from .constraints import ConstraintManager, PrimaryKeyConstraint, UniqueConstraint, CheckConstraint, DefaultConstraint, ConstraintType
 from .relationships import RelationshipManager, TableRelationship, RelationshipType
 from .transactions import TransactionManager, IsolationLevel
 from .indexing import IndexManager, IndexDefinition, IndexType
 import threading
 import logging
-from typing import Dict, Any, List, Optional, Union, Tuple
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Tuple, Iterator
+from itertools import islice
 from dataclasses import dataclass, asdict, field
 from enum import Enum, auto
+from functools import lru_cache
 import hashlib
 
 from datetime import datetime, timedelta
 import pickle
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Append-only record storage: one log of JSON lines per table plus an
+# index of (record_id, offset, length) entries pointing into it
+RECORD_LOG_FILE = "records.log"
+RECORD_INDEX_FILE = "records.idx"
+
+# Thread pool size for reading legacy one-file-per-record tables
+LEGACY_READ_WORKERS = 8
+
+# Seconds a database size reading is served before it is refreshed
+DATABASE_SIZE_TTL = 5.0
+
+# Seconds the schema persistence writer waits for more work before exiting
+PERSIST_WORKER_IDLE_TIMEOUT = 1.0
+
 
 class SchemaZone(Enum):
     """Schema zones for different data types and access patterns"""
@@ -59,7 +83,62 @@ class ValidationRule(Enum):
     CUSTOM_FUNCTION = auto()
 
 
-@dataclass
+# A JSON number of 20 or more digits may not fit in 64 bits; orjson reads it as a float
+_WIDE_INT_PATTERN = re.compile(rb'(?:^|[:,\[])\s*-?\d{20}')
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits and similar edge cases
+            pass
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(payload: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when available"""
+    if orjson is not None and not _WIDE_INT_PATTERN.search(payload):
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+_yaml_module = None
+
+
+def _get_yaml() -> Tuple[Any, Any]:
+    """Import PyYAML on first use and pick the LibYAML-backed dumper when available"""
+    global _yaml_module
+    if _yaml_module is None:
+        import yaml
+        _yaml_module = yaml
+    return _yaml_module, getattr(_yaml_module, 'CSafeDumper', _yaml_module.SafeDumper)
+
+
+def _read_json_file(path: str) -> Optional[Any]:
+    """Read one JSON record file, logging and skipping unreadable files"""
+    try:
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
+    except Exception as e:
+        logger.warning(f"Error reading record file {path}: {e}")
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _infer_string_field_type(value: str) -> FieldType:
+    """Classify a string value, cached for repeat-shape ingest workloads"""
+    if value.isdigit():
+        return FieldType.INTEGER
+    elif value.replace('.', '').replace('-', '').isdigit():
+        return FieldType.FLOAT
+    else:
+        return FieldType.STRING
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class SchemaField:
     """Schema field definition with comprehensive metadata"""
     name: str
@@ -102,17 +181,18 @@ class SchemaField:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert field to dictionary"""
-        return asdict(self)
+        data = asdict(self)
+        data['field_type'] = self.field_type.name
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SchemaField':
         """Create field from dictionary"""
         # Convert enum values back
-        data['field_type'] = FieldType[data['field_type']]
-        return cls(**data)
+        return cls(**{**data, 'field_type': FieldType[data['field_type']]})
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class AdaptiveSchema:
     """
     Adaptive schema that can evolve based on data patterns
@@ -145,7 +225,8 @@ class AdaptiveSchema:
             'timestamp': time.time(),
             'version': self.version
         })
-        logger.info(f"Added field '{field.name}' to schema '{self.name}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Added field '{field.name}' to schema '{self.name}'")
     
     def remove_field(self, field_name: str) -> None:
         """Remove a field from the schema"""
@@ -161,7 +242,8 @@ class AdaptiveSchema:
             'timestamp': time.time(),
             'version': self.version
         })
-        logger.info(f"Removed field '{field_name}' from schema '{self.name}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Removed field '{field_name}' from schema '{self.name}'")
     
     def modify_field(self, field_name: str, **kwargs) -> None:
         """Modify an existing field"""
@@ -185,25 +267,13 @@ class AdaptiveSchema:
             'timestamp': time.time(),
             'version': self.version
         })
-        logger.info(f"Modified field '{field_name}' in schema '{self.name}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Modified field '{field_name}' in schema '{self.name}'")
     
     def get_field(self, field_name: str) -> Optional[SchemaField]:
         """Get a field by name"""
         return self.fields.get(field_name)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert schema to dictionary"""
-        return {
-            'name': self.name,
-            'version': self.version,
-            'fields': {name: field.to_dict() for name, field in self.fields.items()},
-            'zone': self.zone.name,
-            'created_at': self.created_at,
-            'last_modified': self.last_modified,
-            'evolution_history': self.evolution_history,
-            'metadata': self.metadata
-        }
-    
     def validate_data(self, data: Dict[str, Any]) -> Dict[str, List[str]]:
         """
         Validate data against schema with comprehensive error reporting
@@ -322,28 +392,36 @@ class AdaptiveSchema:
         
         evolution_actions = []
         
-        for field_name, value in data.items():
-            if field_name not in self.fields:
-                # Auto-discover new field
-                field_type = self._infer_field_type(value)
-                new_field = SchemaField(
-                    name=field_name,
-                    field_type=field_type,
-                    description=f"Auto-discovered field from data evolution"
-                )
-                
-                self.add_field(new_field)
-                evolution_actions.append({
-                    'action': 'auto_discover_field',
-                    'field_name': field_name,
-                    'field_type': field_type.name,
-                    'timestamp': time.time()
-                })
+        # Only the unknown keys need inference; repeat-shape records stop here
+        unknown_fields = [name for name in data if name not in self.fields]
+        if not unknown_fields:
+            return {
+                'evolution_actions': evolution_actions,
+                'new_version': self.version,
+                'fields_added': 0
+            }
+        
+        for field_name in unknown_fields:
+            # Auto-discover new field
+            field_type = self._infer_field_type(data[field_name])
+            new_field = SchemaField(
+                name=field_name,
+                field_type=field_type,
+                description=f"Auto-discovered field from data evolution"
+            )
+            
+            self.add_field(new_field)
+            evolution_actions.append({
+                'action': 'auto_discover_field',
+                'field_name': field_name,
+                'field_type': field_type.name,
+                'timestamp': time.time()
+            })
         
         if evolution_actions:
             self.version += 1
             self.last_modified = time.time()
-            logger.info(f"Schema '{self.name}' evolved to version {self.version}")
+            logger.debug(f"Schema '{self.name}' evolved to version {self.version}")
         
         return {
             'evolution_actions': evolution_actions,
@@ -354,12 +432,7 @@ class AdaptiveSchema:
     def _infer_field_type(self, value: Any) -> FieldType:
         """Infer field type from value"""
         if isinstance(value, str):
-            if value.isdigit():
-                return FieldType.INTEGER
-            elif value.replace('.', '').replace('-', '').isdigit():
-                return FieldType.FLOAT
-            else:
-                return FieldType.STRING
+            return _infer_string_field_type(value)
         elif isinstance(value, int):
             return FieldType.INTEGER
         elif isinstance(value, float):
@@ -423,6 +496,38 @@ class AdaptiveSchema:
         }
 
 
+# SQL column types used when exporting schemas as CREATE TABLE statements
+_SQL_TYPE_MAP: Dict[FieldType, str] = {
+    FieldType.STRING: 'TEXT',
+    FieldType.INTEGER: 'INTEGER',
+    FieldType.FLOAT: 'REAL',
+    FieldType.BOOLEAN: 'INTEGER',
+    FieldType.DATETIME: 'TEXT',
+    FieldType.JSON: 'TEXT',
+    FieldType.BLOB: 'BLOB',
+    FieldType.PI_SEQUENCE: 'TEXT',
+    FieldType.SPIRAL_COORDINATE: 'TEXT'
+}
+
+
+def _format_sql_default(value: Any) -> str:
+    """Format a field default as a SQLite literal"""
+    value_type = type(value)
+    if value is None:
+        return 'NULL'
+    if value_type is bool:
+        return '1' if value else '0'
+    if value_type is int or value_type is float:
+        return str(value)
+    if value_type is str:
+        return "'" + value.replace("'", "''") + "'"
+    if value_type is dict or value_type is list:
+        value = _json_dumps(value).decode('utf-8')
+    else:
+        value = repr(value)
+    return "'" + value.replace("'", "''") + "'"
+
+
 class SchemaManager:
     """
     Advanced schema manager with database persistence and intelligent evolution
@@ -441,6 +546,25 @@ class SchemaManager:
         self.schema_evolution_patterns: Dict[str, List[Dict[str, Any]]] = {}
         self.thread_lock = threading.RLock()
         
+        # Append-only record logs, opened lazily per table
+        self._record_log_fds: Dict[str, Tuple[int, int]] = {}
+        self._record_indexes: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._record_index_sizes: Dict[str, int] = {}
+        self._ensured_dirs: set = set()
+        
+        # Database size is refreshed in the background once it goes stale
+        self._database_size_cache: Optional[Tuple[int, float]] = None
+        self._database_size_refresh: Optional[Future] = None
+        self._stats_executor: Optional[ThreadPoolExecutor] = None
+        self._read_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Background writer for schema persistence off the request path. It is
+        # started on demand and is not a daemon, so queued writes complete
+        # before the interpreter exits.
+        self._persist_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._persist_thread: Optional[threading.Thread] = None
+        self._persist_thread_lock = threading.Lock()
+        
         # Initialize advanced database systems
         self.constraint_manager = ConstraintManager(db_path)
         self.relationship_manager = RelationshipManager(db_path)
@@ -464,11 +588,20 @@ class SchemaManager:
                 try:
                     if hasattr(schema_record, 'data') and isinstance(schema_record.data, dict):
                         schema_name = schema_record.data.get('name')
-                        if schema_name:
+                        if schema_name and schema_name not in self.schemas:
                             schema = AdaptiveSchema.from_dict(schema_record.data)
                             self.schemas[schema_name] = schema
                 except Exception as e:
                     logger.error(f"Failed to load schema {schema_record.data.get('name', 'unknown') if hasattr(schema_record, 'data') else 'unknown'}: {e}")
+            
+            # _persist_schema writes schemas to SCHEMA storage
+            for schema_data in self.database.search_schemas({}):
+                schema_name = schema_data.get('name')
+                if schema_name and schema_name not in self.schemas and 'fields' in schema_data:
+                    try:
+                        self.schemas[schema_name] = AdaptiveSchema.from_dict(schema_data)
+                    except Exception as e:
+                        logger.error(f"Failed to load schema {schema_name}: {e}")
         except Exception as e:
             logger.warning(f"Failed to load schemas from database: {e}")
         
@@ -488,6 +621,9 @@ class SchemaManager:
                 return
             
             for schema_file in schema_dir.glob("*.dat"):
+                # Segment files hold many records, not one legacy schema each
+                if schema_file.name.startswith("seg_"):
+                    continue
                 try:
                     schema_name = schema_file.stem
                     if schema_name not in self.schemas:
@@ -591,6 +727,10 @@ class SchemaManager:
         """Get schema by name"""
         return self.schemas.get(name)
     
+    def has_schema(self, name: str) -> bool:
+        """Check whether a schema exists"""
+        return name in self.schemas
+    
     def list_schemas(self) -> List[str]:
         """List all available schema names"""
         return list(self.schemas.keys())
@@ -625,6 +765,9 @@ class SchemaManager:
             
             # Remove from memory
             del self.schemas[name]
+            self._close_record_log(name)
+            self._record_indexes.pop(name, None)
+            self._ensured_dirs.discard(os.path.join("data", "tables", name))
             
             logger.info(f"Deleted schema '{name}'")
             return True
@@ -662,19 +805,64 @@ class SchemaManager:
     def _persist_schema(self, schema: AdaptiveSchema):
         """Persist schema to SpiraPi database"""
         try:
-            # Convert schema to dictionary format
-            schema_data = schema.to_dict()
-            schema_data['id'] = schema.name  # Use name as ID
+            schema_data = self._schema_record_data(schema)
             
             # Store schema in database
             self.database.store_schema(schema_data)
             
-            logger.info(f"Schema '{schema.name}' persisted to SpiraPi database")
+            logger.debug(f"Schema '{schema.name}' persisted to SpiraPi database")
             
         except Exception as e:
             logger.error(f"Failed to persist schema {schema.name}: {e}")
             raise
     
+    @staticmethod
+    def _schema_record_data(schema: AdaptiveSchema) -> Dict[str, Any]:
+        """Convert a schema to the dictionary stored in the database"""
+        schema_data = schema.to_dict()
+        schema_data['id'] = schema.name  # Use name as ID
+        return schema_data
+    
+    def _schedule_persist(self, schema: AdaptiveSchema) -> None:
+        """Queue a schema for persistence by the background writer"""
+        with self._persist_thread_lock:
+            self._persist_queue.put(schema.name)
+            if self._persist_thread is None:
+                self._persist_thread = threading.Thread(target=self._persist_worker, name="schema-persist")
+                self._persist_thread.start()
+    
+    def _persist_worker(self) -> None:
+        """Drain the persist queue, writing each schema's state at write time"""
+        while True:
+            try:
+                name = self._persist_queue.get(timeout=PERSIST_WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                # Items are queued under the same lock, so none can be missed
+                with self._persist_thread_lock:
+                    if self._persist_queue.empty():
+                        self._persist_thread = None
+                        return
+                continue
+            try:
+                if name is None:
+                    with self._persist_thread_lock:
+                        self._persist_thread = None
+                    return
+                # Persisting the current state means a late write can never
+                # overwrite a newer synchronous one with a stale snapshot
+                with self.thread_lock:
+                    schema = self.schemas.get(name)
+                    if schema is not None:
+                        self._persist_schema(schema)
+            except Exception as e:
+                logger.error(f"Background persistence failed for schema {name}: {e}")
+            finally:
+                self._persist_queue.task_done()
+    
+    def flush(self) -> None:
+        """Block until all queued schema writes have been persisted"""
+        self._persist_queue.join()
+    
     def _record_evolution(self, schema_name: str, evolution_result: Dict[str, Any]):
         """Record schema evolution in SpiraPi database"""
         try:
@@ -686,7 +874,7 @@ class SchemaManager:
             }
             self.database.store_query(evolution_data)  # Use query storage for evolution records
             
-            logger.info(f"Evolution recorded for schema {schema_name}")
+            logger.debug(f"Evolution recorded for schema {schema_name}")
         except Exception as e:
             logger.error(f"Failed to record evolution for schema {schema_name}: {e}")
     
@@ -718,29 +906,31 @@ class SchemaManager:
             True if merge successful
         """
         with self.thread_lock:
-            if source_name not in self.schemas or target_name not in self.schemas:
+            schemas = self.schemas
+            source_schema = schemas.get(source_name)
+            target_schema = schemas.get(target_name)
+            if source_schema is None or target_schema is None:
                 return False
             
-            source_schema = self.schemas[source_name]
-            target_schema = self.schemas[target_name]
-            
             # Merge fields
+            target_fields = target_schema.fields
+            add_field = target_schema.add_field
             for field_name, field in source_schema.fields.items():
-                if field_name not in target_schema.fields:
-                    target_schema.add_field(field)
+                target_field = target_fields.get(field_name)
+                if target_field is None:
+                    add_field(field)
                 else:
                     # Merge field properties
-                    target_field = target_schema.fields[field_name]
                     target_field.usage_count += field.usage_count
-                    target_field.evolution_history.extend(field.evolution_history)
+                    target_field.evolution_history += field.evolution_history
             
             # Merge evolution history
             target_schema.evolution_history.extend(source_schema.evolution_history)
             target_schema.version += 1
             target_schema.last_modified = time.time()
             
-            # Persist merged schema
-            self._persist_schema(target_schema)
+            # Persist merged schema in the background
+            self._schedule_persist(target_schema)
             
             logger.info(f"Merged schema '{source_name}' into '{target_name}'")
             return True
@@ -766,45 +956,25 @@ class SchemaManager:
         elif format.lower() == 'sql':
             return self._generate_sql_schema(schema)
         elif format.lower() == 'yaml':
-            import yaml
-            return yaml.dump(schema.to_dict(), default_flow_style=False)
+            yaml, dumper = _get_yaml()
+            return yaml.dump(schema.to_dict(), Dumper=dumper, default_flow_style=False)
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
     def _generate_sql_schema(self, schema: AdaptiveSchema) -> str:
         """Generate SQL CREATE TABLE statement for schema"""
-        sql_lines = [f"CREATE TABLE {schema.name} ("]
-        
-        field_definitions = []
-        for field in schema.fields.values():
-            # Map field types to SQL types
-            sql_type = {
-                FieldType.STRING: 'TEXT',
-                FieldType.INTEGER: 'INTEGER',
-                FieldType.FLOAT: 'REAL',
-                FieldType.BOOLEAN: 'INTEGER',
-                FieldType.DATETIME: 'TEXT',
-                FieldType.JSON: 'TEXT',
-                FieldType.BLOB: 'BLOB',
-                FieldType.PI_SEQUENCE: 'TEXT',
-                FieldType.SPIRAL_COORDINATE: 'TEXT'
-            }.get(field.field_type, 'TEXT')
-            
-            field_def = f"    {field.name} {sql_type}"
-            
-            if field.is_required:
-                field_def += " NOT NULL"
-            if field.is_unique:
-                field_def += " UNIQUE"
-            if field.default_value is not None:
-                field_def += f" DEFAULT {repr(field.default_value)}"
-            
-            field_definitions.append(field_def)
-        
-        sql_lines.append(",\n".join(field_definitions))
-        sql_lines.append(");")
+        sql_type_map = _SQL_TYPE_MAP
+        field_definitions = ",\n".join(
+            "".join((
+                "    ", field.name, " ", sql_type_map.get(field.field_type, 'TEXT'),
+                " NOT NULL" if field.is_required else "",
+                " UNIQUE" if field.is_unique else "",
+                " DEFAULT " + _format_sql_default(field.default_value) if field.default_value is not None else ""
+            ))
+            for field in schema.fields.values()
+        )
         
-        return "\n".join(sql_lines)
+        return "".join((f"CREATE TABLE {schema.name} (\n", field_definitions, "\n);"))
     
     def import_schema(self, schema_data: Dict[str, Any]) -> str:
         """
@@ -820,15 +990,18 @@ class SchemaManager:
             schema = AdaptiveSchema.from_dict(schema_data)
             
             # Check for name conflicts
+            schemas = self.schemas
             original_name = schema.name
+            name = original_name
             counter = 1
-            while schema.name in self.schemas:
-                schema.name = f"{original_name}_{counter}"
+            while name in schemas:
+                name = f"{original_name}_{counter}"
                 counter += 1
+            schema.name = name
             
-            # Store schema
-            self.schemas[schema.name] = schema
-            self._persist_schema(schema)
+            # Store schema, persisting in the background
+            schemas[name] = schema
+            self._schedule_persist(schema)
             
             logger.info(f"Imported schema '{schema.name}' (original: '{original_name}')")
             return schema.name
@@ -839,33 +1012,64 @@ class SchemaManager:
     
     def get_schema_statistics(self) -> Dict[str, Any]:
         """Get comprehensive schema management statistics"""
-        total_fields = sum(len(schema.fields) for schema in self.schemas.values())
-        total_evolutions = sum(len(schema.evolution_history) for schema in self.schemas.values())
+        total_fields = 0
+        total_evolutions = 0
+        schema_zones = {zone.name: 0 for zone in SchemaZone}
+        most_evolved, most_evolutions = None, -1
+        largest, largest_fields = None, -1
+        
+        # Single pass over all schemas for every aggregate
+        schemas = self.schemas
+        for schema in schemas.values():
+            field_count = len(schema.fields)
+            evolution_count = len(schema.evolution_history)
+            total_fields += field_count
+            total_evolutions += evolution_count
+            schema_zones[schema.zone.name] += 1
+            if evolution_count > most_evolutions:
+                most_evolved, most_evolutions = schema.name, evolution_count
+            if field_count > largest_fields:
+                largest, largest_fields = schema.name, field_count
         
         return {
-            'total_schemas': len(self.schemas),
+            'total_schemas': len(schemas),
             'total_fields': total_fields,
             'total_evolutions': total_evolutions,
-            'schema_zones': {zone.name: sum(1 for s in self.schemas.values() if s.zone == zone) 
-                           for zone in SchemaZone},
-            'most_evolved_schema': max(
-                self.schemas.values(), 
-                key=lambda s: len(s.evolution_history)
-            ).name if self.schemas else None,
-            'largest_schema': max(
-                self.schemas.values(), 
-                key=lambda s: len(s.fields)
-            ).name if self.schemas else None,
+            'schema_zones': schema_zones,
+            'most_evolved_schema': most_evolved,
+            'largest_schema': largest,
             'database_size': self._get_database_size()
         }
     
     def _get_database_size(self) -> int:
-        """Get SpiraPi database size in bytes"""
-        try:
-            db_stats = self.database.get_database_stats()
-            return db_stats.get('total_records', 0)
-        except:
-            return 0
+        """Get SpiraPi database size, serving the last reading while a stale one refreshes"""
+        cached = self._database_size_cache
+        if cached is None:
+            return self._refresh_database_size()
+        
+        size, measured_at = cached
+        if time.time() - measured_at >= DATABASE_SIZE_TTL:
+            with self.thread_lock:
+                pending = self._database_size_refresh
+                if pending is None or pending.done():
+                    if self._stats_executor is None:
+                        self._stats_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="schema-stats")
+                    self._database_size_refresh = self._stats_executor.submit(self._refresh_database_size)
+        return size
+    
+    def _refresh_database_size(self) -> int:
+        """Read the SpiraPi database size and store it in the TTL cache"""
+        database = self.database
+        if database is None or not hasattr(database, 'get_database_stats'):
+            size = 0
+        else:
+            try:
+                size = database.get_database_stats().get('total_records', 0)
+            except Exception as e:
+                logger.warning(f"Failed to read SpiraPi database size: {e}")
+                size = 0
+        self._database_size_cache = (size, time.time())
+        return size
     
     def cleanup_old_evolutions(self, older_than_days: int = 30):
         """Clean up old evolution records from SpiraPi database"""
@@ -883,33 +1087,44 @@ class SchemaManager:
             timestamp = int(time.time())
             backup_path = f"schema_backup_{timestamp}.json"
         
-        backup_data = {
-            'backup_timestamp': time.time(),
-            'schema_count': len(self.schemas),
-            'schemas': {name: schema.to_dict() for name, schema in self.schemas.items()}
-        }
+        with self.thread_lock:
+            schemas = list(self.schemas.items())
         
-        with open(backup_path, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        # Stream one schema at a time so only the largest schema is held in memory
+        with open(backup_path, 'wb') as f:
+            f.write(b'{"backup_timestamp":' + _json_dumps(time.time()))
+            f.write(b',"schema_count":' + _json_dumps(len(schemas)))
+            f.write(b',"schemas":{')
+            for position, (name, schema) in enumerate(schemas):
+                if position:
+                    f.write(b',')
+                f.write(_json_dumps(name) + b':' + _json_dumps(schema.to_dict()))
+            f.write(b'}}')
         
         logger.info(f"Schema backup created: {backup_path}")
         return backup_path
     
     def restore_schemas(self, backup_path: str) -> int:
         """Restore schemas from backup"""
-        with open(backup_path, 'r') as f:
-            backup_data = json.load(f)
+        with open(backup_path, 'rb') as f:
+            backup_data = _json_loads(f.read())
         
-        restored_count = 0
+        restored = []
         for name, schema_data in backup_data['schemas'].items():
             try:
-                schema = AdaptiveSchema.from_dict(schema_data)
-                self.schemas[name] = schema
-                self._persist_schema(schema)
-                restored_count += 1
+                restored.append((name, AdaptiveSchema.from_dict(schema_data)))
             except Exception as e:
                 logger.error(f"Failed to restore schema {name}: {e}")
         
+        # Persist every parsed schema with one batched database write
+        with self.thread_lock:
+            schema_records = [self._schema_record_data(schema) for _, schema in restored]
+            with self.database.batch() as batch:
+                for schema_data in schema_records:
+                    batch.store_schema(schema_data)
+            self.schemas.update(restored)
+        
+        restored_count = len(restored)
         logger.info(f"Restored {restored_count} schemas from backup")
         return restored_count
     
@@ -1073,89 +1288,330 @@ class SchemaManager:
             if not schema:
                 raise ValueError(f"Table '{table_name}' not found")
             
-            # Valider les données contre le schéma
-            validation_errors = schema.validate_data(data)
-            if validation_errors:
-                raise ValueError(f"Data validation failed: {validation_errors}")
-            
-            # Générer un ID unique si pas fourni
-            if not data.get('id'):
-                data['id'] = f"record_{int(time.time() * 1000000)}"
-            
-            # Ajouter les timestamps si pas fournis
-            if not data.get('created_at'):
-                data['created_at'] = time.time()
-            if not data.get('updated_at'):
-                data['updated_at'] = time.time()
+            self._prepare_record(schema, data)
             
             # Stocker l'enregistrement
             record_id = self._store_record(table_name, data)
-            logger.info(f"Created record '{record_id}' in table '{table_name}'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Created record '{record_id}' in table '{table_name}'")
             return record_id
             
         except Exception as e:
             logger.error(f"Error creating record in table '{table_name}': {e}")
             raise
     
-    def _store_record(self, table_name: str, data: Dict[str, Any]) -> str:
-        """Store a record in the database"""
+    def create_records(self, table_name: str, records: List[Dict[str, Any]], sync: bool = False) -> List[str]:
+        """
+        Create several records in a table with one batched write
+        
+        Args:
+            table_name: Table name
+            records: Records to insert; all are validated before anything is written
+            sync: Flush the table's record log to stable storage once the batch is written
+            
+        Returns:
+            List of created record IDs, in input order
+        """
         try:
-            # Pour l'instant, stockons simplement dans un fichier JSON
-            # C'est une solution temporaire en attendant de corriger le storage engine
-            record_id = data.get('id', f"record_{int(time.time() * 1000000)}")
+            schema = self.get_schema(table_name)
+            if not schema:
+                raise ValueError(f"Table '{table_name}' not found")
             
-            # Créer le répertoire de données s'il n'existe pas
-            import os
-            data_dir = os.path.join("data", "tables", table_name)
-            os.makedirs(data_dir, exist_ok=True)
+            for data in records:
+                self._prepare_record(schema, data)
             
-            # Stocker l'enregistrement dans un fichier JSON
-            record_file = os.path.join(data_dir, f"{record_id}.json")
-            with open(record_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            record_ids = self._store_records(table_name, records)
+            if sync:
+                with self.thread_lock:
+                    for fd in self._get_record_log(table_name):
+                        os.fsync(fd)
             
-            logger.info(f"Stored record {record_id} in {record_file}")
-            return record_id
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Created {len(record_ids)} records in table '{table_name}'")
+            return record_ids
+            
+        except Exception as e:
+            logger.error(f"Error creating records in table '{table_name}': {e}")
+            raise
+    
+    def _prepare_record(self, schema: AdaptiveSchema, data: Dict[str, Any]) -> None:
+        """Validate a record and fill in its ID and timestamps"""
+        # Valider les données contre le schéma
+        validation_errors = schema.validate_data(data)
+        if validation_errors:
+            raise ValueError(f"Data validation failed: {validation_errors}")
+        
+        # Générer un ID unique si pas fourni
+        if not data.get('id'):
+            data['id'] = generate_record_id("record")
+        
+        # Ajouter les timestamps si pas fournis
+        now = time.time()
+        if not data.get('created_at'):
+            data['created_at'] = now
+        if not data.get('updated_at'):
+            data['updated_at'] = now
+    
+    def _store_record(self, table_name: str, data: Dict[str, Any]) -> str:
+        """Store a record by appending it to the table's record log"""
+        return self._store_records(table_name, [data])[0]
+    
+    def _store_records(self, table_name: str, records: List[Dict[str, Any]]) -> List[str]:
+        """Append records to the table's record log with one write per file"""
+        try:
+            record_ids = []
+            lines = []
+            for data in records:
+                record_id = data.get('id')
+                if record_id is None:
+                    record_id = data['id'] = generate_record_id("record")
+                record_ids.append(record_id)
+                lines.append(_json_dumps(data) + b'\n')
+            
+            with self.thread_lock:
+                log_fd, index_fd = self._get_record_log(table_name)
+                # Other processes append to the same files under the same lock
+                with _locked_fd(index_fd):
+                    index = self._catch_up_record_index(table_name, index_fd)
+                    offset = os.lseek(log_fd, 0, os.SEEK_END)
+                    entries = []
+                    for record_id, line in zip(record_ids, lines):
+                        entries.append((record_id, (offset, len(line))))
+                        offset += len(line)
+                    os.write(log_fd, b''.join(lines))
+                    os.write(index_fd, b''.join(
+                        _json_dumps([record_id, start, length]) + b'\n'
+                        for record_id, (start, length) in entries
+                    ))
+                    index.update(entries)
+                    self._record_index_sizes[table_name] = os.fstat(index_fd).st_size
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Stored {len(record_ids)} records in table log '{table_name}'")
+            return record_ids
                 
         except Exception as e:
             logger.error(f"Error storing record: {e}")
             raise
     
+    def _get_record_log(self, table_name: str) -> Tuple[int, int]:
+        """Get (log_fd, index_fd) for a table, opening the append-only files on first use"""
+        fds = self._record_log_fds.get(table_name)
+        if fds is None:
+            data_dir = self._ensure_table_dir(table_name)
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+            fds = (
+                os.open(os.path.join(data_dir, RECORD_LOG_FILE), flags, 0o644),
+                os.open(os.path.join(data_dir, RECORD_INDEX_FILE), flags, 0o644)
+            )
+            self._record_log_fds[table_name] = fds
+        return fds
+    
+    def _ensure_table_dir(self, table_name: str) -> str:
+        """Create a table's data directory once per manager lifetime"""
+        data_dir = os.path.join("data", "tables", table_name)
+        if data_dir not in self._ensured_dirs:
+            os.makedirs(data_dir, exist_ok=True)
+            self._ensured_dirs.add(data_dir)
+        return data_dir
+    
+    def _get_record_index(self, table_name: str) -> Dict[str, Tuple[int, int]]:
+        """Get the in-memory {record_id: (offset, length)} index for a table; caller holds thread_lock"""
+        index = self._record_indexes.get(table_name)
+        index_fd = self._get_record_log(table_name)[1]
+        if index is not None and os.fstat(index_fd).st_size == self._record_index_sizes[table_name]:
+            return index
+        with _locked_fd(index_fd):
+            return self._catch_up_record_index(table_name, index_fd)
+    
+    def _catch_up_record_index(self, table_name: str, index_fd: int) -> Dict[str, Tuple[int, int]]:
+        """Load a table's record index, or add the entries other processes appended since
+
+        The caller holds the lock on the index file.
+        """
+        index = self._record_indexes.get(table_name)
+        if index is not None:
+            index_path = os.path.join("data", "tables", table_name, RECORD_INDEX_FILE)
+            with open(index_path, 'rb') as f:
+                f.seek(self._record_index_sizes[table_name])
+                for line in f:
+                    try:
+                        record_id, offset, length = _json_loads(line)
+                    except ValueError:
+                        line = b''
+                    if not line.endswith(b'\n'):
+                        # Torn write left by a crashed process; a full load repairs it
+                        index = None
+                        break
+                    index[record_id] = (offset, length)
+        if index is None:
+            index = self._load_record_index(table_name)
+            self._record_indexes[table_name] = index
+        self._record_index_sizes[table_name] = os.fstat(index_fd).st_size
+        return index
+    
+    def _load_record_index(self, table_name: str) -> Dict[str, Tuple[int, int]]:
+        """Load a table's record index and catch it up with records.log
+
+        Records appended to the log after the last intact index entry (a crash
+        between the two writes, or a torn index line) are recovered by scanning
+        the log tail and are appended back to records.idx.
+        """
+        data_dir = os.path.join("data", "tables", table_name)
+        index_path = os.path.join(data_dir, RECORD_INDEX_FILE)
+        log_path = os.path.join(data_dir, RECORD_LOG_FILE)
+        index: Dict[str, Tuple[int, int]] = {}
+        log_end = 0
+        
+        if os.path.exists(index_path):
+            intact = 0
+            with open(index_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record_id, offset, length = _json_loads(line)
+                    except ValueError:
+                        # Torn trailing write; later entries are unreliable
+                        break
+                    if not line.endswith(b'\n'):
+                        break
+                    index[record_id] = (offset, length)
+                    log_end = max(log_end, offset + length)
+                    intact += len(line)
+                index_size = f.seek(0, os.SEEK_END)
+            if intact < index_size:
+                # Drop the torn tail so recovered entries start on a fresh line
+                os.truncate(index_path, intact)
+        
+        if not os.path.exists(log_path):
+            return index
+        
+        recovered = []
+        with open(log_path, 'rb') as f:
+            f.seek(log_end)
+            offset = log_end
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record_id = _json_loads(line)['id']
+                except (ValueError, KeyError, TypeError):
+                    break
+                entry = (offset, len(line))
+                index[record_id] = entry
+                recovered.append(_json_dumps([record_id, *entry]) + b'\n')
+                offset += len(line)
+        
+        if recovered:
+            with open(index_path, 'ab') as f:
+                f.write(b''.join(recovered))
+            logger.warning(f"Recovered {len(recovered)} unindexed records in table '{table_name}'")
+        return index
+    
+    def _close_record_log(self, table_name: str) -> None:
+        """Close a table's record log file descriptors"""
+        fds = self._record_log_fds.pop(table_name, None)
+        if fds is not None:
+            for fd in fds:
+                os.close(fd)
+    
+    def sync_records(self) -> None:
+        """Flush all open record logs to stable storage"""
+        with self.thread_lock:
+            for fds in self._record_log_fds.values():
+                for fd in fds:
+                    os.fsync(fd)
+    
+    def close(self) -> None:
+        """Flush pending schema writes, sync and close all open record logs, then release the database"""
+        with self._persist_thread_lock:
+            persist_thread = self._persist_thread
+            if persist_thread is not None:
+                self._persist_queue.put(None)
+        if persist_thread is not None:
+            persist_thread.join()
+        with self.thread_lock:
+            self.sync_records()
+            for table_name in list(self._record_log_fds):
+                self._close_record_log(table_name)
+            for executor in (self._stats_executor, self._read_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            self._stats_executor = None
+            self._read_executor = None
+        self.transaction_manager.close()
+        self.database.close()
+    
     def get_records(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get records from a table"""
         try:
-            # Vérifier que la table existe
-            schema = self.get_schema(table_name)
-            if not schema:
-                raise ValueError(f"Table '{table_name}' not found")
-            
-            # Récupérer les enregistrements depuis les fichiers JSON
-            import os
-            import glob
-            data_dir = os.path.join("data", "tables", table_name)
-            
-            if not os.path.exists(data_dir):
-                return []
-            
-            # Lire tous les fichiers JSON dans le répertoire
-            record_files = glob.glob(os.path.join(data_dir, "*.json"))
-            result = []
-            
-            for record_file in record_files[:limit]:
-                try:
-                    with open(record_file, 'r', encoding='utf-8') as f:
-                        record_data = json.load(f)
-                        result.append(record_data)
-                except Exception as e:
-                    logger.warning(f"Error reading record file {record_file}: {e}")
-                    continue
-            
-            logger.info(f"Retrieved {len(result)} records from table '{table_name}'")
+            result = list(self.iter_records(table_name, limit))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Retrieved {len(result)} records from table '{table_name}'")
             return result
             
         except Exception as e:
             logger.error(f"Error getting records from table '{table_name}': {e}")
             return []
+    
+    def iter_records(self, table_name: str, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield up to ``limit`` records from a table without materializing them all"""
+        # Vérifier que la table existe
+        schema = self.get_schema(table_name)
+        if not schema:
+            raise ValueError(f"Table '{table_name}' not found")
+        
+        data_dir = os.path.join("data", "tables", table_name)
+        
+        if data_dir not in self._ensured_dirs and not os.path.exists(data_dir):
+            return
+        
+        count = 0
+        
+        # Lire les enregistrements depuis le journal de la table
+        with self.thread_lock:
+            entries = list(islice(self._get_record_index(table_name).values(), limit))
+        if entries:
+            with open(os.path.join(data_dir, RECORD_LOG_FILE), 'rb') as f:
+                for offset, length in entries:
+                    try:
+                        f.seek(offset)
+                        record = _json_loads(f.read(length))
+                    except Exception as e:
+                        logger.warning(f"Error reading record at offset {offset} in table '{table_name}': {e}")
+                        continue
+                    count += 1
+                    yield record
+        
+        # Enregistrements hérités stockés un fichier JSON par enregistrement;
+        # ceux réécrits depuis dans le journal ont déjà été produits
+        if count < limit:
+            remaining = limit - count
+            with self.thread_lock:
+                indexed = self._get_record_index(table_name)
+            record_files = []
+            with os.scandir(data_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name[0] == '.' or not name.endswith('.json') or name[:-5] in indexed:
+                        continue
+                    record_files.append(entry.path)
+                    if len(record_files) >= remaining:
+                        break
+            
+            # Overlap file reads on a small pool once there are enough of them
+            if len(record_files) > LEGACY_READ_WORKERS:
+                with self.thread_lock:
+                    if self._read_executor is None:
+                        self._read_executor = ThreadPoolExecutor(
+                            max_workers=LEGACY_READ_WORKERS, thread_name_prefix="record-read"
+                        )
+                    executor = self._read_executor
+                records = executor.map(_read_json_file, record_files)
+            else:
+                records = map(_read_json_file, record_files)
+            for record in records:
+                if record is not None and record.get('id') not in indexed:
+                    yield record
 
 
 # Example usage and demonstration
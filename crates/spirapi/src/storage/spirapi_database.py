@@ -6,22 +6,319 @@ Implements custom storage, indexing, and query mechanisms without external depen
 
 import os
 import json
+import shutil
 import pickle
 import hashlib
 import time
 import threading
-from typing import Dict, List, Any, Optional, Tuple, Union, Iterator
+import itertools
+import secrets
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Iterator
 from dataclasses import dataclass, asdict
 from enum import Enum, auto
 import logging
 from pathlib import Path
 import mmap
 import struct
+import zlib
+
+try:
+    from ._compat import DATACLASS_OPTIONS
+except ImportError:
+    # Run as a script, outside the storage package
+    from _compat import DATACLASS_OPTIONS
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Lock file in each component's meta directory, held by the process that is
+# appending to its segments or changing its index files
+COMPONENT_LOCK_FILE = "component.lock"
+
+# Windows byte-range locks are mandatory, so locks cover one byte far past
+# the end of any data rather than the data itself
+_MSVCRT_LOCK_OFFSET = 0x7FFFFFFE
+
+# Number of logged index operations before the memory index is snapshotted
+MEMORY_INDEX_SNAPSHOT_INTERVAL = 1000
+
+# Maximum number of read-only file mappings kept open per storage component
+MMAP_CACHE_SIZE = 256
+
+# Number of recently retrieved records kept in memory by the storage engine
+RECORD_CACHE_SIZE = 10000
+
+# Number of records validated per lock acquisition during a scrub
+SCRUB_BATCH_SIZE = 1000
+
+# Batches at least this large are serialized on several threads; zlib,
+# zstd and hashlib release the GIL while they work
+BULK_PARALLEL_THRESHOLD = 256
+BULK_SERIALIZE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Number of files copied concurrently by backup
+BACKUP_COPY_WORKERS = 8
+
+# Readahead hints for mapped segments: random for point lookups, sequential for scans
+_MADV_RANDOM = getattr(mmap, 'MADV_RANDOM', None)
+_MADV_SEQUENTIAL = getattr(mmap, 'MADV_SEQUENTIAL', None)
+
+# Linux ioctl cloning a whole file on copy-on-write filesystems (btrfs, XFS)
+_FICLONE = 0x40049409
+
+# Size at which the active segment file is sealed and a new one started
+SEGMENT_MAX_SIZE = 256 * 1024 * 1024
+
+# Segment entry header: data length, metadata length
+_SEGMENT_HEADER = struct.Struct("<II")
+
+# Leading byte of tagged payloads. Untagged payloads are the original
+# pickle / zlib-compressed pickle format and start with 0x80 or 0x78.
+_CODEC_MSGPACK = 0x01
+_CODEC_MSGPACK_ZSTD = 0x02
+_CODEC_MSGPACK_ZLIB = 0x03
+_CODEC_PICKLE_ZSTD = 0x04
+
+# msgpack extension type carrying a tuple, which would otherwise come back as a list
+_MSGPACK_EXT_TUPLE = 0x01
+
+# Record checksum algorithms. SHA-256 checksums are bare hex digests; any
+# other algorithm prefixes its digest with its name so both can coexist.
+CHECKSUM_SHA256 = "sha256"
+CHECKSUM_XXH3 = "xxh3"
+_CHECKSUM_ALGORITHMS = frozenset({CHECKSUM_SHA256, CHECKSUM_XXH3})
+_XXH3_PREFIX = CHECKSUM_XXH3 + ":"
+
+# Longest string or bytes value kept in the per-field search index
+FIELD_INDEX_MAX_VALUE_LENGTH = 256
+
+_CANONICAL_JSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _canonical_json(value: Any) -> bytes:
+    """Serialize a value to compact, key-sorted JSON bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=_CANONICAL_JSON_OPTIONS)
+        except TypeError:
+            # Integers beyond 64 bits and similar edge cases
+            pass
+    return json.dumps(value, sort_keys=True, default=str, separators=(',', ':'),
+                      ensure_ascii=False).encode()
+
+
+def _is_field_indexable(value: Any) -> bool:
+    """Whether a field value is small and hashable enough for the field index"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return True
+    if isinstance(value, (str, bytes)):
+        return len(value) <= FIELD_INDEX_MAX_VALUE_LENGTH
+    return False
+
+
+def _copy_file(source: Path, target: Path):
+    """Copy a file, letting the kernel clone or copy it in place when it can"""
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            if fcntl is not None:
+                try:
+                    fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                    shutil.copystat(source, target)
+                    return
+                except OSError:
+                    pass
+            
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            
+            if hasattr(os, 'copy_file_range'):
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    shutil.copystat(source, target)
+                    return
+    except OSError:
+        # Cross-device copies and filesystems without support fall through
+        pass
+    
+    shutil.copy2(source, target)
+
+
+def _advise(mapped: Union[mmap.mmap, bytes], advice: Optional[int]):
+    """Give the kernel a readahead hint for a mapping, where supported"""
+    if advice is None or not isinstance(mapped, mmap.mmap):
+        return
+    try:
+        mapped.madvise(advice)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+@contextmanager
+def _locked_fd(fd: int):
+    """Hold an exclusive lock on an open file against other processes and descriptors"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, _MSVCRT_LOCK_OFFSET, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            os.lseek(fd, _MSVCRT_LOCK_OFFSET, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        yield
+
+
+@contextmanager
+def _locked_path(path: str):
+    """Hold an exclusive lock on a lock file, through a descriptor of its own"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        with _locked_fd(fd):
+            yield
+    finally:
+        os.close(fd)
+
+
+def _file_identity(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Device, inode and size of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_size
+
+
+def _json_bytes(value: Any, indent: bool = False) -> bytes:
+    """Serialize a value to JSON bytes, compact unless indent is requested"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(value, option=option)
+    if indent:
+        return json.dumps(value, indent=2).encode()
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Pack tuples as an extension type; anything else msgpack rejects falls back to pickle"""
+    if type(obj) is tuple:
+        return msgpack.ExtType(_MSGPACK_EXT_TUPLE, _msgpack_packb(list(obj)))
+    raise TypeError(f"Cannot pack {type(obj).__name__} with msgpack")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Rebuild values packed by _msgpack_default"""
+    if code == _MSGPACK_EXT_TUPLE:
+        return tuple(_msgpack_unpackb(data))
+    return msgpack.ExtType(code, data)
+
+
+def _msgpack_packb(data: Any) -> bytes:
+    """Pack data with msgpack, keeping exact types or raising TypeError"""
+    # strict_types sends tuples and subclasses of dict, list, str and int to
+    # _msgpack_default, so none of them silently decode as a plainer type
+    return msgpack.packb(data, use_bin_type=True, strict_types=True, default=_msgpack_default)
+
+
+def _msgpack_unpackb(packed: Any) -> Any:
+    """Unpack data written by _msgpack_packb or by the earlier plain msgpack codec"""
+    return msgpack.unpackb(packed, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook)
+
+
+def _json_line(value: Any) -> bytes:
+    """Serialize a value to a single newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(value, separators=(',', ':')).encode() + b"\n"
+
+
+class _ReadWriteLock:
+    """Lock admitting many concurrent readers or a single writer, preferring writers"""
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+    
+    @contextmanager
+    def read(self):
+        """Hold the lock shared"""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively"""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
 
 class StorageType(Enum):
     """Types of data storage in SpiraPi"""
@@ -42,7 +339,7 @@ class IndexType(Enum):
     QUANTUM = auto()
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class StorageRecord:
     """Base record structure for all stored data"""
     id: str
@@ -57,31 +354,152 @@ class StorageRecord:
         if not self.checksum:
             self.checksum = self._calculate_checksum()
     
-    def _calculate_checksum(self) -> str:
+    def _canonical_parts(self) -> Tuple[bytes, ...]:
+        """
+        Pieces of the canonical record encoding, in order
+        
+        Joined, they equal the key-sorted JSON object
+        {"data": ..., "id": ..., "meta": ..., "ts": ..., "v": ...}
+        without building that intermediate dict.
+        """
+        return (
+            b'{"data":', _canonical_json(self.data),
+            b',"id":', _canonical_json(self.id),
+            b',"meta":', _canonical_json(self.metadata),
+            b',"ts":', _canonical_json(self.timestamp),
+            b',"v":', _canonical_json(self.version),
+            b'}'
+        )
+    
+    def _canonical_bytes(self) -> bytes:
+        """Canonical byte representation of the record used for checksums"""
+        return b"".join(self._canonical_parts())
+    
+    def _calculate_digest(self) -> bytes:
+        """Calculate the raw SHA-256 digest of the record"""
+        hasher = hashlib.sha256()
+        update = hasher.update
+        for part in self._canonical_parts():
+            update(part)
+        return hasher.digest()
+    
+    def _calculate_checksum(self, algorithm: str = CHECKSUM_SHA256) -> str:
         """Calculate data integrity checksum"""
+        if algorithm == CHECKSUM_XXH3:
+            return _XXH3_PREFIX + xxhash.xxh3_128(self._canonical_bytes()).hexdigest()
+        return self._calculate_digest().hex()
+    
+    def _calculate_legacy_checksum(self) -> str:
+        """Calculate the checksum format used by records written before canonical hashing"""
         data_str = json.dumps(self.data, sort_keys=True, default=str)
         metadata_str = json.dumps(self.metadata, sort_keys=True)
         content = f"{self.id}{data_str}{metadata_str}{self.timestamp}{self.version}"
         return hashlib.sha256(content.encode()).hexdigest()
     
+    @classmethod
+    def create(cls, id: str, data_type: StorageType, data: Any, metadata: Dict[str, Any],
+               timestamp: float, checksum_algorithm: str = CHECKSUM_SHA256) -> 'StorageRecord':
+        """
+        Build a record checksummed with the given algorithm
+        
+        Args:
+            id: Record identifier
+            data_type: Storage type of the record
+            data: Record payload
+            metadata: Record metadata
+            timestamp: Record timestamp
+            checksum_algorithm: CHECKSUM_SHA256 or CHECKSUM_XXH3
+            
+        Returns:
+            The new record
+        """
+        if checksum_algorithm == CHECKSUM_SHA256:
+            return cls(id, data_type, data, metadata, timestamp, checksum="")
+        # A non-empty placeholder keeps __post_init__ from hashing with SHA-256 first
+        record = cls(id, data_type, data, metadata, timestamp, checksum=checksum_algorithm)
+        record.checksum = record._calculate_checksum(checksum_algorithm)
+        return record
+    
+    @staticmethod
+    def calculate_checksums_batch(records: List['StorageRecord'],
+                                  algorithm: str = CHECKSUM_SHA256) -> List[str]:
+        """
+        Calculate checksums for many records in one pass
+        
+        Args:
+            records: Records to checksum
+            algorithm: CHECKSUM_SHA256 or CHECKSUM_XXH3
+            
+        Returns:
+            Checksums in the same order as the records
+        """
+        if algorithm == CHECKSUM_XXH3:
+            xxh3_128 = xxhash.xxh3_128
+            return [_XXH3_PREFIX + xxh3_128(record._canonical_bytes()).hexdigest() for record in records]
+        sha256 = hashlib.sha256
+        return [sha256(record._canonical_bytes()).hexdigest() for record in records]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return asdict(self)
     
     def validate_integrity(self) -> bool:
         """Validate data integrity using checksum"""
-        return self.checksum == self._calculate_checksum()
+        if self.checksum.startswith(_XXH3_PREFIX):
+            if xxhash is None:
+                logger.warning(f"Cannot validate record {self.id}: xxhash is not installed")
+                return False
+            return self.checksum == self._calculate_checksum(CHECKSUM_XXH3)
+        try:
+            expected = bytes.fromhex(self.checksum)
+        except (TypeError, ValueError):
+            return False
+        if expected == self._calculate_digest():
+            return True
+        # Records stored before canonical hashing keep their original checksum
+        try:
+            return self.checksum == self._calculate_legacy_checksum()
+        except (TypeError, ValueError):
+            return False
+
+
+# Storage types that support field search
+_SEARCHABLE_TYPES = frozenset({
+    StorageType.SEQUENCE, StorageType.SCHEMA, StorageType.QUERY, StorageType.METADATA
+})
+
+
+# Counter behind generated record IDs, seeded from the clock so IDs keep
+# increasing across restarts
+_record_id_counter = itertools.count(time.time_ns() // 1000)
+
+
+def generate_record_id(prefix: str) -> str:
+    """Generate a unique, unguessable record ID that sorts by creation order"""
+    return f"{prefix}_{next(_record_id_counter):016x}_{secrets.token_hex(4)}"
+
+
+# Engines opened through SpiraPiStorageEngine.open_shared, by resolved directory
+_shared_engines: Dict[Path, 'SpiraPiStorageEngine'] = {}
+_shared_engines_lock = threading.Lock()
 
 
 class SpiraPiStorageEngine:
     """
     Core storage engine for SpiraPi database
     Implements custom file-based storage with advanced indexing
+    
+    Several processes may open the same data directory. Writers take the
+    component's lock file, append at the end of the segment and operation log,
+    and first apply whatever other processes logged; readers catch up the same
+    way whenever the log changed. Use open_shared to reuse one engine within
+    a process.
     """
     
     def __init__(self, base_path: str = "spirapi_data", 
                  enable_compression: bool = True,
-                 enable_encryption: bool = False):
+                 enable_encryption: bool = False,
+                 verify_reads: bool = False):
         """
         Initialize SpiraPi storage engine
         
@@ -89,13 +507,16 @@ class SpiraPiStorageEngine:
             base_path: Base directory for data storage
             enable_compression: Whether to enable data compression
             enable_encryption: Whether to enable data encryption
+            verify_reads: Whether every retrieval validates the record checksum
         """
         self.base_path = Path(base_path)
         self.enable_compression = enable_compression
         self.enable_encryption = enable_encryption
+        self.verify_reads = verify_reads
         
         # Create storage directories
         self._create_storage_structure()
+        self._shared_users = 0
         
         # Initialize storage components
         self.sequence_storage = self._init_storage_component(StorageType.SEQUENCE)
@@ -105,8 +526,29 @@ class SpiraPiStorageEngine:
         self.index_storage = self._init_storage_component(StorageType.INDEX)
         self.cache_storage = self._init_storage_component(StorageType.CACHE)
         
-        # Thread safety
-        self.lock = threading.RLock()
+        # Component dispatch by data type
+        self.components: Dict[StorageType, 'StorageComponent'] = {
+            StorageType.SEQUENCE: self.sequence_storage,
+            StorageType.SCHEMA: self.schema_storage,
+            StorageType.QUERY: self.query_storage,
+            StorageType.METADATA: self.metadata_storage,
+            StorageType.INDEX: self.index_storage,
+            StorageType.CACHE: self.cache_storage
+        }
+        
+        # Thread safety: one reader-writer lock per storage component, so reads
+        # run concurrently and only writes to the same component serialize
+        self.locks = {storage_type: _ReadWriteLock() for storage_type in StorageType}
+        self._stats_lock = threading.Lock()
+        
+        # In-memory LRU of retrieved records keyed by (data type, record ID).
+        # cache_storage only holds records explicitly stored as CACHE data.
+        self._record_cache: 'OrderedDict[Tuple[StorageType, str], StorageRecord]' = OrderedDict()
+        self._record_cache_lock = threading.Lock()
+        
+        # Serialization pool for bulk stores, created on first use
+        self._bulk_executor: Optional[ThreadPoolExecutor] = None
+        self._bulk_executor_lock = threading.Lock()
         
         # Performance tracking
         self.stats = {
@@ -119,6 +561,81 @@ class SpiraPiStorageEngine:
         
         logger.info(f"SpiraPi Storage Engine initialized at {self.base_path}")
     
+    @classmethod
+    def open_shared(cls, base_path: str = "spirapi_data", **kwargs) -> 'SpiraPiStorageEngine':
+        """Return the engine that owns base_path in this process, opening it on first use"""
+        key = Path(base_path).resolve()
+        with _shared_engines_lock:
+            engine = _shared_engines.get(key)
+            if engine is None:
+                engine = cls(base_path, **kwargs)
+                _shared_engines[key] = engine
+            elif kwargs.get('verify_reads'):
+                engine.verify_reads = True
+            engine._shared_users += 1
+            return engine
+    
+    def release(self):
+        """Drop one open_shared user, closing the engine after the last one"""
+        with _shared_engines_lock:
+            self._shared_users -= 1
+            if self._shared_users > 0:
+                return
+            self._forget_shared()
+        self.close()
+    
+    def _forget_shared(self):
+        """Remove this engine from the shared registry; caller holds _shared_engines_lock"""
+        key = self.base_path.resolve()
+        if _shared_engines.get(key) is self:
+            del _shared_engines[key]
+    
+    @contextmanager
+    def _writing(self, data_type: StorageType) -> Iterator['StorageComponent']:
+        """
+        Hold a storage component for writing, within this process and across processes
+        
+        Index operations other processes logged since this one last looked are
+        applied first, and their records dropped from the record cache.
+        """
+        component = self.components[data_type]
+        with self.locks[data_type].write(), component.locked():
+            for record_id in component.catch_up():
+                self._cache_invalidate(data_type, record_id)
+            yield component
+    
+    def _refresh(self, data_type: StorageType):
+        """Catch a storage component up with other processes before reading it"""
+        if self.components[data_type].has_external_changes():
+            with self._writing(data_type):
+                pass
+    
+    def _cache_get(self, data_type: StorageType, record_id: str) -> Optional[StorageRecord]:
+        """Look up a record in the in-memory cache"""
+        key = (data_type, record_id)
+        with self._record_cache_lock:
+            record = self._record_cache.get(key)
+            if record is not None:
+                self._record_cache.move_to_end(key)
+            return record
+    
+    def _cache_put(self, record: StorageRecord):
+        """Add a retrieved record to the in-memory cache"""
+        with self._record_cache_lock:
+            self._record_cache[(record.data_type, record.id)] = record
+            if len(self._record_cache) > RECORD_CACHE_SIZE:
+                self._record_cache.popitem(last=False)
+    
+    def _cache_invalidate(self, data_type: StorageType, record_id: str):
+        """Drop a record from the in-memory cache"""
+        with self._record_cache_lock:
+            self._record_cache.pop((data_type, record_id), None)
+    
+    def _count(self, stat: str, amount: int = 1):
+        """Increment a performance counter"""
+        with self._stats_lock:
+            self.stats[stat] += amount
+    
     def _create_storage_structure(self):
         """Create the storage directory structure"""
         storage_types = [t.name.lower() for t in StorageType]
@@ -159,77 +676,71 @@ class SpiraPiStorageEngine:
             True if successful, False otherwise
         """
         try:
-            with self.lock:
-                # Determine storage component
-                if record.data_type == StorageType.SEQUENCE:
-                    success = self.sequence_storage.store(record)
-                elif record.data_type == StorageType.SCHEMA:
-                    success = self.schema_storage.store(record)
-                elif record.data_type == StorageType.QUERY:
-                    success = self.query_storage.store(record)
-                elif record.data_type == StorageType.METADATA:
-                    success = self.metadata_storage.store(record)
-                elif record.data_type == StorageType.INDEX:
-                    success = self.index_storage.store(record)
-                elif record.data_type == StorageType.CACHE:
-                    success = self.cache_storage.store(record)
-                else:
-                    logger.error(f"Unknown storage type: {record.data_type}")
-                    return False
-                
-                if success:
-                    self.stats['writes'] += 1
-                    # Update indices
-                    self._update_indices(record)
-                
-                return success
+            # Determine storage component
+            component = self.components.get(record.data_type)
+            if component is None:
+                logger.error(f"Unknown storage type: {record.data_type}")
+                return False
+            
+            # Invalidate under the write lock, after the write, so a concurrent
+            # reader cannot cache the previous version again
+            with self._writing(record.data_type):
+                success = component.store(record)
+                self._cache_invalidate(record.data_type, record.id)
+            
+            if success:
+                self._count('writes')
+                # Update indices
+                self._update_indices(record)
+            
+            return success
                 
         except Exception as e:
             logger.error(f"Error storing record {record.id}: {e}")
             return False
     
-    def retrieve(self, record_id: str, data_type: StorageType) -> Optional[StorageRecord]:
+    def retrieve(self, record_id: str, data_type: StorageType,
+                 verify: Optional[bool] = None) -> Optional[StorageRecord]:
         """
         Retrieve a record from storage
         
         Args:
             record_id: ID of record to retrieve
             data_type: Type of data to retrieve
+            verify: Whether to validate the record checksum (defaults to verify_reads)
             
         Returns:
             StorageRecord if found, None otherwise
         """
+        if verify is None:
+            verify = self.verify_reads
+        
         try:
-            with self.lock:
-                # Check cache first
-                cached_record = self.cache_storage.retrieve(record_id)
-                if cached_record:
-                    self.stats['cache_hits'] += 1
-                    return cached_record
-                
-                self.stats['cache_misses'] += 1
-                
-                # Retrieve from appropriate storage
-                if data_type == StorageType.SEQUENCE:
-                    record = self.sequence_storage.retrieve(record_id)
-                elif data_type == StorageType.SCHEMA:
-                    record = self.schema_storage.retrieve(record_id)
-                elif data_type == StorageType.QUERY:
-                    record = self.query_storage.retrieve(record_id)
-                elif data_type == StorageType.METADATA:
-                    record = self.metadata_storage.retrieve(record_id)
-                elif data_type == StorageType.INDEX:
-                    record = self.index_storage.retrieve(record_id)
-                else:
-                    logger.error(f"Unknown storage type: {data_type}")
-                    return None
-                
+            component = self.components.get(data_type)
+            if component is None:
+                logger.error(f"Unknown storage type: {data_type}")
+                return None
+            self._refresh(data_type)
+            
+            # Check cache first; verified reads always validate the stored copy
+            cached_record = None if verify else self._cache_get(data_type, record_id)
+            if cached_record:
+                self._count('cache_hits')
+                return cached_record
+            
+            self._count('cache_misses')
+            
+            # Retrieve from appropriate storage
+            with self.locks[data_type].read():
+                record = component.retrieve(record_id, verify=verify)
+                # Cache the record before a writer can replace it
                 if record:
-                    self.stats['reads'] += 1
-                    # Cache the record
-                    self.cache_storage.store(record)
-                
-                return record
+                    self._cache_put(record)
+            
+            if record:
+                self._count('reads')
+            
+            return record
                 
         except Exception as e:
             logger.error(f"Error retrieving record {record_id}: {e}")
@@ -247,69 +758,194 @@ class SpiraPiStorageEngine:
             True if successful, False otherwise
         """
         try:
-            with self.lock:
-                # Remove from cache
-                self.cache_storage.delete(record_id)
+            # Remove from appropriate storage
+            component = self.components.get(data_type)
+            if component is None:
+                logger.error(f"Unknown storage type: {data_type}")
+                return False
+            
+            with self._writing(data_type):
+                success = component.delete(record_id)
+                self._cache_invalidate(data_type, record_id)
+            
+            if success:
+                self._count('deletes')
+                # Update indices
+                self._remove_from_indices(record_id, data_type)
+            
+            return success
+                
+        except Exception as e:
+            logger.error(f"Error deleting record {record_id}: {e}")
+            return False
+    
+    def delete_many(self, record_ids: List[str], data_type: StorageType) -> int:
+        """
+        Delete many records of one type under a single lock acquisition and log write
+        
+        Args:
+            record_ids: IDs of records to delete
+            data_type: Type of data to delete
+            
+        Returns:
+            Number of records deleted
+        """
+        try:
+            component = self.components.get(data_type)
+            if component is None:
+                logger.error(f"Unknown storage type: {data_type}")
+                return 0
+            
+            with self._writing(data_type):
+                deleted = component.delete_many(record_ids)
+                for record_id in record_ids:
+                    self._cache_invalidate(data_type, record_id)
+            
+            if deleted:
+                self._count('deletes', deleted)
+                # Update indices
+                self._remove_from_indices_many(record_ids)
+            
+            return deleted
                 
-                # Remove from appropriate storage
-                if data_type == StorageType.SEQUENCE:
-                    success = self.sequence_storage.delete(record_id)
-                elif data_type == StorageType.SCHEMA:
-                    success = self.schema_storage.delete(record_id)
-                elif data_type == StorageType.QUERY:
-                    success = self.query_storage.delete(record_id)
-                elif data_type == StorageType.METADATA:
-                    success = self.metadata_storage.delete(record_id)
-                elif data_type == StorageType.INDEX:
-                    success = self.index_storage.delete(record_id)
-                else:
+        except Exception as e:
+            logger.error(f"Error deleting batch of {len(record_ids)} records: {e}")
+            return 0
+    
+    def delete_matching(self, query: Dict[str, Any], data_type: StorageType) -> int:
+        """
+        Delete every record of one type matching criteria
+        
+        Only record IDs are collected, then removed with a single delete_many.
+        
+        Args:
+            query: Search criteria dictionary
+            data_type: Type of data to delete
+            
+        Returns:
+            Number of records deleted
+        """
+        record_ids = self.search_ids(query, data_type)
+        if not record_ids:
+            return 0
+        return self.delete_many(record_ids, data_type)
+    
+    def store_many(self, records: List[StorageRecord]) -> int:
+        """
+        Store many records, batching the writes of each storage component
+        
+        Args:
+            records: StorageRecords to store
+            
+        Returns:
+            Number of records stored
+        """
+        batches: Dict[StorageType, List[StorageRecord]] = {}
+        for record in records:
+            batches.setdefault(record.data_type, []).append(record)
+        
+        stored_count = 0
+        try:
+            for data_type, batch in batches.items():
+                component = self.components.get(data_type)
+                if component is None:
                     logger.error(f"Unknown storage type: {data_type}")
-                    return False
+                    continue
                 
-                if success:
-                    self.stats['deletes'] += 1
-                    # Update indices
-                    self._remove_from_indices(record_id, data_type)
+                with self._writing(data_type):
+                    stored = component.store_many(batch, self._get_bulk_executor(len(batch)))
+                    for record in batch:
+                        self._cache_invalidate(data_type, record.id)
                 
-                return success
+                if stored:
+                    stored_count += stored
+                    self._count('writes', stored)
+                    # Update indices
+                    self._update_indices_many(batch)
+            
+            return stored_count
                 
         except Exception as e:
-            logger.error(f"Error deleting record {record_id}: {e}")
-            return False
+            logger.error(f"Error storing batch of {len(records)} records: {e}")
+            return stored_count
+    
+    def _get_bulk_executor(self, batch_size: int) -> Optional[ThreadPoolExecutor]:
+        """Return the serialization pool for batches large enough to use it"""
+        if batch_size < BULK_PARALLEL_THRESHOLD or BULK_SERIALIZE_WORKERS < 2:
+            return None
+        with self._bulk_executor_lock:
+            if self._bulk_executor is None:
+                self._bulk_executor = ThreadPoolExecutor(
+                    max_workers=BULK_SERIALIZE_WORKERS, thread_name_prefix="spirapi-serialize"
+                )
+            return self._bulk_executor
     
     def _update_indices(self, record: StorageRecord):
         """Update all relevant indices for a stored record"""
         try:
-            # Create index entries for fast lookup
-            index_record = StorageRecord(
-                id=f"idx_{record.id}",
-                data_type=StorageType.INDEX,
-                data={
-                    'original_id': record.id,
-                    'data_type': record.data_type.name,
-                    'timestamp': record.timestamp,
-                    'metadata_keys': list(record.metadata.keys())
-                },
-                metadata={'index_type': 'auto'},
-                timestamp=time.time(),
-                checksum=""
-            )
-            
-            self.index_storage.store(index_record)
+            index_record = self._build_index_record(record, time.time())
+            with self._writing(StorageType.INDEX):
+                self.index_storage.store(index_record)
+                self._cache_invalidate(StorageType.INDEX, index_record.id)
             
         except Exception as e:
             logger.warning(f"Failed to update indices for {record.id}: {e}")
     
+    def _update_indices_many(self, records: List[StorageRecord]):
+        """Update indices for a batch of stored records"""
+        try:
+            now = time.time()
+            index_records = [self._build_index_record(record, now) for record in records]
+            with self._writing(StorageType.INDEX):
+                self.index_storage.store_many(index_records, self._get_bulk_executor(len(index_records)))
+                for index_record in index_records:
+                    self._cache_invalidate(StorageType.INDEX, index_record.id)
+            
+        except Exception as e:
+            logger.warning(f"Failed to update indices for {len(records)} records: {e}")
+    
+    def _build_index_record(self, record: StorageRecord, now: float) -> StorageRecord:
+        """Create the index entry for fast lookup of a stored record"""
+        return StorageRecord(
+            id=f"idx_{record.id}",
+            data_type=StorageType.INDEX,
+            data={
+                'original_id': record.id,
+                'data_type': record.data_type.name,
+                'timestamp': record.timestamp,
+                'metadata_keys': list(record.metadata.keys())
+            },
+            metadata={'index_type': 'auto'},
+            timestamp=now,
+            checksum=""
+        )
+    
     def _remove_from_indices(self, record_id: str, data_type: StorageType):
         """Remove index entries for a deleted record"""
         try:
-            # Find and remove index entries
-            index_pattern = f"idx_{record_id}"
-            self.index_storage.delete_pattern(index_pattern)
+            # The index entry ID is derived from the record ID, so it can be
+            # deleted directly; a substring scan over all index entries would
+            # also hit records whose IDs merely extend this one (s1 -> s10)
+            index_id = f"idx_{record_id}"
+            with self._writing(StorageType.INDEX):
+                self.index_storage.delete(index_id)
+                self._cache_invalidate(StorageType.INDEX, index_id)
             
         except Exception as e:
             logger.warning(f"Failed to remove indices for {record_id}: {e}")
     
+    def _remove_from_indices_many(self, record_ids: List[str]):
+        """Remove index entries for many deleted records"""
+        try:
+            index_ids = [f"idx_{record_id}" for record_id in record_ids]
+            with self._writing(StorageType.INDEX):
+                self.index_storage.delete_many(index_ids)
+                for index_id in index_ids:
+                    self._cache_invalidate(StorageType.INDEX, index_id)
+            
+        except Exception as e:
+            logger.warning(f"Failed to remove indices for {len(record_ids)} records: {e}")
+    
     def search(self, query: Dict[str, Any], data_type: StorageType) -> List[StorageRecord]:
         """
         Search for records matching criteria
@@ -322,31 +958,86 @@ class SpiraPiStorageEngine:
             List of matching StorageRecord objects
         """
         try:
-            with self.lock:
-                if data_type == StorageType.SEQUENCE:
-                    return self.sequence_storage.search(query)
-                elif data_type == StorageType.SCHEMA:
-                    return self.schema_storage.search(query)
-                elif data_type == StorageType.QUERY:
-                    return self.query_storage.search(query)
-                elif data_type == StorageType.METADATA:
-                    return self.metadata_storage.search(query)
-                else:
-                    logger.error(f"Search not supported for type: {data_type}")
-                    return []
+            if data_type not in _SEARCHABLE_TYPES:
+                logger.error(f"Search not supported for type: {data_type}")
+                return []
+            component = self.components[data_type]
+            self._refresh(data_type)
+            
+            with self.locks[data_type].read():
+                return component.search(query)
                 
         except Exception as e:
             logger.error(f"Error during search: {e}")
             return []
     
+    def search_ids(self, query: Dict[str, Any], data_type: StorageType) -> List[str]:
+        """
+        Search for the IDs of records matching criteria
+        
+        Args:
+            query: Search criteria dictionary
+            data_type: Type of data to search
+            
+        Returns:
+            IDs of the matching records
+        """
+        try:
+            if data_type not in _SEARCHABLE_TYPES:
+                logger.error(f"Search not supported for type: {data_type}")
+                return []
+            component = self.components[data_type]
+            self._refresh(data_type)
+            
+            with self.locks[data_type].read():
+                return component.search_ids(query)
+                
+        except Exception as e:
+            logger.error(f"Error during search: {e}")
+            return []
+    
+    def scrub(self) -> Dict[str, List[str]]:
+        """
+        Validate the checksum of every stored record
+        
+        Records are checked in batches of SCRUB_BATCH_SIZE, each under a
+        shared lock, so a scrub can run on a background thread without
+        blocking writers for its whole duration.
+        
+        Returns:
+            IDs of records failing validation, keyed by storage type name
+        """
+        report = {}
+        for data_type, component in self.components.items():
+            lock = self.locks[data_type]
+            self._refresh(data_type)
+            with lock.read():
+                record_ids = list(component.memory_index)
+            
+            corrupted = []
+            for start in range(0, len(record_ids), SCRUB_BATCH_SIZE):
+                with lock.read():
+                    corrupted.extend(component.scrub(record_ids[start:start + SCRUB_BATCH_SIZE]))
+            
+            if corrupted:
+                logger.warning(f"Scrub found {len(corrupted)} corrupted {data_type.name} records")
+                report[data_type.name.lower()] = corrupted
+        
+        return report
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive storage statistics"""
+        for data_type in self.components:
+            self._refresh(data_type)
+        with self._stats_lock:
+            performance_stats = self.stats.copy()
+        
         return {
             'storage_engine': 'SpiraPi Custom Database',
             'base_path': str(self.base_path),
             'compression_enabled': self.enable_compression,
             'encryption_enabled': self.enable_encryption,
-            'performance_stats': self.stats.copy(),
+            'performance_stats': performance_stats,
             'storage_components': {
                 'sequence': self.sequence_storage.get_stats(),
                 'schema': self.schema_storage.get_stats(),
@@ -356,10 +1047,7 @@ class SpiraPiStorageEngine:
                 'cache': self.cache_storage.get_stats()
             },
             'total_records': sum(
-                comp.get_stats()['record_count'] 
-                for comp in [self.sequence_storage, self.schema_storage, 
-                           self.query_storage, self.metadata_storage, 
-                           self.index_storage, self.cache_storage]
+                comp.get_stats()['record_count'] for comp in self.components.values()
             )
         }
     
@@ -381,7 +1069,13 @@ class SpiraPiStorageEngine:
         backup_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            with self.lock:
+            statistics = self.get_statistics()
+            with ExitStack() as stack:
+                # Hold every component shared, and other processes off it, in a fixed order
+                for data_type, component in self.components.items():
+                    stack.enter_context(self.locks[data_type].read())
+                    stack.enter_context(component.locked())
+                
                 # Copy all storage components
                 for storage_type in StorageType:
                     source_dir = self.base_path / storage_type.name.lower()
@@ -395,137 +1089,680 @@ class SpiraPiStorageEngine:
                     'backup_timestamp': time.time(),
                     'source_path': str(self.base_path),
                     'storage_components': [t.name for t in StorageType],
-                    'statistics': self.get_statistics()
+                    'statistics': statistics
                 }
                 
                 manifest_path = backup_dir / "backup_manifest.json"
-                with open(manifest_path, 'w') as f:
-                    json.dump(manifest, f, indent=2)
+                with open(manifest_path, 'wb') as f:
+                    f.write(_json_bytes(manifest, indent=True))
                 
                 logger.info(f"Backup created at {backup_path}")
                 return backup_path
                 
         except Exception as e:
-            logger.error(f"Backup failed: {e}")
-            raise
+            logger.error(f"Backup failed: {e}")
+            raise
+    
+    def _copy_directory(self, source: Path, target: Path):
+        """Recursively copy directory contents"""
+        copies = []
+        self._collect_copies(source, target, copies)
+        
+        with ThreadPoolExecutor(max_workers=BACKUP_COPY_WORKERS) as executor:
+            # Consume the results so copy errors propagate
+            list(executor.map(lambda pair: _copy_file(*pair), copies))
+    
+    def _collect_copies(self, source: Path, target: Path, copies: List[Tuple[Path, Path]]):
+        """Create the target directory tree and list the files to copy into it"""
+        target.mkdir(parents=True, exist_ok=True)
+        
+        for item in source.iterdir():
+            if item.is_file():
+                copies.append((item, target / item.name))
+            elif item.is_dir():
+                self._collect_copies(item, target / item.name, copies)
+    
+    def compact(self) -> int:
+        """
+        Compact the segment files of every storage component
+        
+        Returns:
+            Number of bytes reclaimed
+        """
+        reclaimed = 0
+        for data_type in self.components:
+            with self._writing(data_type) as component:
+                reclaimed += component.compact_segments()
+        return reclaimed
+    
+    def close(self):
+        """Flush index state of every storage component"""
+        for data_type, component in self.components.items():
+            with self.locks[data_type].write():
+                component.close()
+        
+        with self._bulk_executor_lock:
+            if self._bulk_executor is not None:
+                self._bulk_executor.shutdown(wait=True)
+                self._bulk_executor = None
+        
+        with _shared_engines_lock:
+            self._forget_shared()
+    
+    def cleanup(self, older_than_days: int = 30) -> int:
+        """
+        Clean up old records and temporary files
+        
+        Args:
+            older_than_days: Age threshold for cleanup
+            
+        Returns:
+            Number of records cleaned up
+        """
+        now = time.time()
+        cutoff_timestamp = now - (older_than_days * 24 * 60 * 60)
+        cleaned_count = 0
+        
+        try:
+            # Clean up each storage component
+            for data_type in self.components:
+                with self._writing(data_type) as component:
+                    cleaned_count += component.cleanup_old_records(cutoff_timestamp)
+                    with self._record_cache_lock:
+                        self._record_cache.clear()
+            
+            # Clean up temporary files
+            temp_dir = self.base_path / "temp"
+            if temp_dir.exists():
+                for temp_file in temp_dir.iterdir():
+                    if temp_file.is_file():
+                        file_age = now - temp_file.stat().st_mtime
+                        if file_age > (older_than_days * 24 * 60 * 60):
+                            temp_file.unlink()
+                            cleaned_count += 1
+            
+            logger.info(f"Cleanup completed: {cleaned_count} items removed")
+            return cleaned_count
+                
+        except Exception as e:
+            logger.error(f"Cleanup failed: {e}")
+            return 0
+
+
+class StorageComponent:
+    """
+    Individual storage component for specific data types
+    Implements custom file-based storage with advanced features
+    
+    Methods that write segments or the operation log expect the caller to
+    hold locked() and to have called catch_up() under it.
+    """
+    
+    def __init__(self, storage_type: StorageType, base_path: Path,
+                 enable_compression: bool = True, enable_encryption: bool = False):
+        """
+        Initialize storage component
+        
+        Args:
+            storage_type: Type of data this component handles
+            base_path: Base directory for this component
+            enable_compression: Whether to enable compression
+            enable_encryption: Whether to enable encryption
+        """
+        self.storage_type = storage_type
+        self.base_path = base_path
+        self.enable_compression = enable_compression
+        self.enable_encryption = enable_encryption
+        
+        # Storage paths
+        self.data_path = base_path / "data"
+        self.index_path = base_path / "index"
+        self.meta_path = base_path / "meta"
+        
+        # Ensure directories exist
+        self.data_path.mkdir(parents=True, exist_ok=True)
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self.meta_path.mkdir(parents=True, exist_ok=True)
+        
+        # Plain string prefix for hot-path file names; Path joins are far slower
+        self._data_prefix = str(self.data_path) + os.sep
+        
+        # Statistics
+        self.stats = {
+            'record_count': 0,
+            'total_size': 0,
+            'last_updated': 0
+        }
+        
+        # In-memory index for fast lookups, persisted as a snapshot plus an
+        # append-only log of the operations applied since that snapshot
+        self.memory_index = {}
+        self._index_file = self.meta_path / "memory_index.json"
+        self._wal_file = self.meta_path / "memory_index.wal"
+        self._rotated_wal_file = self.meta_path / "memory_index.wal.1"
+        self._wal_entries = 0
+        self._replayed_ids: Set[str] = set()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        
+        # Part of the operation log already applied: file identity and size
+        self._wal = None
+        self._wal_identity: Optional[Tuple[int, int]] = None
+        self._wal_offset = 0
+        
+        # Serializes writers of this component across processes
+        self._lock_path = str(self.meta_path / COMPONENT_LOCK_FILE)
+        
+        # Records are appended to segment files; only the newest one is written
+        self._segment_id = max(self._segment_ids(), default=0)
+        self._segment = open(self._segment_path(self._segment_id), 'ab')
+        
+        # Read-only mappings of data files, least recently used first
+        self._mmap_cache: 'OrderedDict[str, mmap.mmap]' = OrderedDict()
+        self._mmap_lock = threading.Lock()
+        
+        # zstd contexts are reusable and cheaper than per-call setup, but not
+        # thread safe, so each thread gets its own
+        self._zstd_contexts = threading.local()
+        
+        # Inverted index of top-level metadata and data fields used by search:
+        # field -> value -> record IDs, plus the IDs carrying each field at all
+        # and those whose value for it is too large or unhashable to index
+        self._field_index_file = self.meta_path / "field_index.pkl"
+        self.field_index: Dict[str, Dict[Any, Set[str]]] = {}
+        self._field_ids: Dict[str, Set[str]] = {}
+        self._unindexed_field_ids: Dict[str, Set[str]] = {}
+        self._record_fields: Dict[str, Optional[Tuple[tuple, tuple]]] = {}
+        
+        with self.locked():
+            self._load_memory_index()
+            self._open_wal()
+            self._load_field_index()
+            
+            # A rotated log left behind by an interrupted snapshot must be folded
+            # into the snapshot before the next rotation can replace it
+            if self._rotated_wal_file.exists():
+                self._save_memory_index(covered_wal=self._rotated_wal_file)
+        
+        logger.info(f"Storage component {storage_type.name} initialized at {base_path}")
+    
+    def locked(self):
+        """Context manager keeping other processes and descriptors from writing this component"""
+        return _locked_path(self._lock_path)
+    
+    def has_external_changes(self) -> bool:
+        """Whether the operation log differs from the part of it this component applied"""
+        identity = _file_identity(self._wal_file)
+        return identity is None or identity != (*self._wal_identity, self._wal_offset)
+    
+    def catch_up(self) -> Set[str]:
+        """
+        Apply the index operations other processes logged since the last call
+        
+        The caller holds locked(). A log that was rotated or folded into a
+        snapshot in the meantime is reloaded from scratch.
+        
+        Returns:
+            IDs of the records other processes stored or deleted
+        """
+        identity = _file_identity(self._wal_file)
+        if identity is not None and identity[:2] == self._wal_identity and identity[2] >= self._wal_offset:
+            if identity[2] == self._wal_offset:
+                return set()
+            self._wal_entries += self._replay_wal(self._wal_file, self._wal_offset)
+            self._wal_offset = identity[2]
+        else:
+            previous = self.memory_index
+            self._load_memory_index()
+            self._open_wal()
+            self._replayed_ids = {
+                record_id for record_id in previous.keys() | self.memory_index.keys()
+                if previous.get(record_id) != self.memory_index.get(record_id)
+            }
+        
+        changed = self._replayed_ids
+        self._replayed_ids = set()
+        self._reindex_fields(changed)
+        return changed
+    
+    def _open_wal(self):
+        """Open the operation log for appending, once everything in it is applied"""
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self._wal_file, 'ab')
+        stat = os.fstat(self._wal.fileno())
+        self._wal_identity = (stat.st_dev, stat.st_ino)
+        self._wal_offset = stat.st_size
+    
+    def _load_memory_index(self):
+        """Load memory index snapshot from disk and replay the operation log"""
+        self.memory_index = {}
+        self._wal_entries = 0
+        try:
+            if self._index_file.exists():
+                with open(self._index_file, 'rb') as f:
+                    raw = f.read()
+                self.memory_index = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    
+        except Exception as e:
+            logger.warning(f"Failed to load memory index: {e}")
+            self.memory_index = {}
+        
+        for wal_file in (self._rotated_wal_file, self._wal_file):
+            self._wal_entries += self._replay_wal(wal_file)
+        
+        self.stats['record_count'] = len(self.memory_index)
+    
+    def _replay_wal(self, wal_file: Path, start: int = 0) -> int:
+        """Apply logged index operations, from byte start on, on top of the loaded snapshot"""
+        if not wal_file.exists():
+            return 0
+        
+        replayed = 0
+        try:
+            with open(wal_file, 'rb') as f:
+                f.seek(start)
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        # Torn write at the end of the log
+                        continue
+                    if op.get('op') == 'put':
+                        self.memory_index[op['id']] = op['entry']
+                    elif op.get('op') == 'del':
+                        self.memory_index.pop(op['id'], None)
+                    else:
+                        continue
+                    self._replayed_ids.add(op['id'])
+                    replayed += 1
+                    
+        except Exception as e:
+            logger.warning(f"Failed to replay memory index log {wal_file}: {e}")
+        
+        return replayed
+    
+    def _log_index_operation(self, operation: Dict[str, Any]):
+        """Append one index operation to the log and snapshot when it grows large"""
+        self._log_index_operations([operation])
+    
+    def _log_index_operations(self, operations: List[Dict[str, Any]]):
+        """Append index operations to the log in a single write"""
+        if self._wal.closed:
+            self._open_wal()
+        payload = b"".join(_json_line(operation) for operation in operations)
+        self._wal.write(payload)
+        self._wal.flush()
+        self._wal_offset += len(payload)
+        self._wal_entries += len(operations)
+        
+        if self._wal_entries >= MEMORY_INDEX_SNAPSHOT_INTERVAL:
+            self._maybe_snapshot()
+    
+    def _maybe_snapshot(self):
+        """Rotate the operation log and write a fresh snapshot in the background"""
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        
+        # The rotated log stays on disk until the snapshot covering it is written.
+        # If the previous snapshot failed it is still there, so extend it rather
+        # than replace operations no snapshot covers yet.
+        self._wal.close()
+        if self._rotated_wal_file.exists():
+            with open(self._wal_file, 'rb') as src, open(self._rotated_wal_file, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+            self._wal_file.unlink()
+        else:
+            os.replace(self._wal_file, self._rotated_wal_file)
+        self._open_wal()
+        self._wal_entries = 0
+        
+        # Shallow copies only; the values are immutable, so pickling can wait
+        # for the snapshot thread instead of stalling this writer
+        snapshot = dict(self.memory_index)
+        field_snapshot = dict(self._record_fields)
+        self._snapshot_thread = threading.Thread(
+            target=self._save_memory_index,
+            args=(snapshot, self._rotated_wal_file, field_snapshot,
+                  _file_identity(self._rotated_wal_file)),
+            name=f"{self.storage_type.name.lower()}-index-snapshot", daemon=True
+        )
+        self._snapshot_thread.start()
+    
+    def _save_memory_index(self, snapshot: Optional[Dict[str, Any]] = None,
+                           covered_wal: Optional[Path] = None,
+                           field_snapshot: Optional[Dict[str, Any]] = None,
+                           covered_identity: Optional[Tuple[int, int, int]] = None) -> bool:
+        """
+        Save memory index to disk, returning whether the snapshot was written
+        
+        The caller holds locked(), except for background snapshots, which pass
+        the identity of the rotated log they cover and lock only to install
+        the files. Another process may have extended that log or folded it into
+        a snapshot of its own since; the snapshot is then dropped.
+        """
+        try:
+            if snapshot is None:
+                snapshot = self.memory_index
+            if field_snapshot is None:
+                field_snapshot = self._record_fields
+            temp_fields = self._field_index_file.with_name(f"field_index.{os.getpid()}.tmp")
+            with open(temp_fields, 'wb') as f:
+                pickle.dump(field_snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            temp_file = self._index_file.with_name(f"memory_index.{os.getpid()}.tmp")
+            with open(temp_file, 'wb') as f:
+                f.write(_json_bytes(snapshot))
+            
+            with self.locked() if covered_identity is not None else nullcontext():
+                if covered_identity is not None and _file_identity(covered_wal) != covered_identity:
+                    temp_fields.unlink()
+                    temp_file.unlink()
+                    return False
+                
+                os.replace(temp_fields, self._field_index_file)
+                os.replace(temp_file, self._index_file)
+                if covered_wal is not None and covered_wal.exists():
+                    covered_wal.unlink()
+            return True
+                
+        except Exception as e:
+            logger.error(f"Failed to save memory index: {e}")
+            return False
+    
+    def close(self):
+        """Write a final index snapshot and release the operation log"""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        
+        if self._wal.closed:
+            return
+        
+        with self.locked():
+            # The snapshot replaces the logs, including what other processes wrote
+            self.catch_up()
+            self._wal.close()
+            # Keep the logs for replay on the next open if the snapshot failed
+            if self._save_memory_index():
+                for wal_file in (self._rotated_wal_file, self._wal_file):
+                    if wal_file.exists():
+                        wal_file.unlink()
+            self._wal_entries = 0
+        
+        self._segment.close()
+        
+        for mapped in self._mmap_cache.values():
+            mapped.close()
+        self._mmap_cache.clear()
+    
+    def _load_field_index(self):
+        """Load the persisted field index and re-index records changed since"""
+        try:
+            if self._field_index_file.exists():
+                with open(self._field_index_file, 'rb') as f:
+                    record_fields = pickle.load(f)
+            else:
+                record_fields = {}
+        except Exception as e:
+            logger.warning(f"Failed to load field index, rebuilding it: {e}")
+            record_fields = {}
+        
+        stale_ids = self._replayed_ids | (self.memory_index.keys() - record_fields.keys())
+        for record_id, fields in record_fields.items():
+            if record_id in self.memory_index and record_id not in stale_ids:
+                self._add_fields(record_id, fields)
+        
+        self._reindex_fields(stale_ids)
+        self._replayed_ids.clear()
     
-    def _copy_directory(self, source: Path, target: Path):
-        """Recursively copy directory contents"""
-        target.mkdir(parents=True, exist_ok=True)
+    def _reindex_fields(self, record_ids: Set[str]):
+        """Re-read changed records into the field index"""
+        for record_id in record_ids:
+            record = self.retrieve(record_id) if record_id in self.memory_index else None
+            if record is not None:
+                self._index_fields(record)
+                continue
+            self._unindex_fields(record_id)
+            if record_id in self.memory_index:
+                # Unreadable records are matched against their payload by search
+                self._add_fields(record_id, None)
+        self.stats['record_count'] = len(self.memory_index)
+    
+    def _index_fields(self, record: StorageRecord):
+        """Add the top-level fields of a record to the field index"""
+        self._unindex_fields(record.id)
         
-        for item in source.iterdir():
-            if item.is_file():
-                import shutil
-                shutil.copy2(item, target / item.name)
-            elif item.is_dir():
-                self._copy_directory(item, target / item.name)
+        if not isinstance(record.data, dict) or not isinstance(record.metadata, dict):
+            # Search on non-dict payloads has no field semantics to index
+            self._add_fields(record.id, None)
+            return
+        
+        # Metadata takes precedence over data for keys present in both
+        indexed, unindexed = [], []
+        for key, value in {**record.data, **record.metadata}.items():
+            if _is_field_indexable(value):
+                indexed.append((key, value))
+            else:
+                unindexed.append(key)
+        self._add_fields(record.id, (tuple(indexed), tuple(unindexed)))
     
-    def cleanup(self, older_than_days: int = 30) -> int:
+    def _add_fields(self, record_id: str, fields: Optional[Tuple[tuple, tuple]]):
+        """Register the field entries of one record"""
+        self._record_fields[record_id] = fields
+        if fields is None:
+            return
+        
+        indexed, unindexed = fields
+        for key, value in indexed:
+            self.field_index.setdefault(key, {}).setdefault(value, set()).add(record_id)
+            self._field_ids.setdefault(key, set()).add(record_id)
+        for key in unindexed:
+            self._unindexed_field_ids.setdefault(key, set()).add(record_id)
+            self._field_ids.setdefault(key, set()).add(record_id)
+    
+    def _unindex_fields(self, record_id: str):
+        """Remove a record from the field index"""
+        fields = self._record_fields.pop(record_id, None)
+        if fields is None:
+            return
+        
+        indexed, unindexed = fields
+        for key, value in indexed:
+            ids = self.field_index[key][value]
+            ids.discard(record_id)
+            if not ids:
+                del self.field_index[key][value]
+            self._field_ids[key].discard(record_id)
+        for key in unindexed:
+            self._unindexed_field_ids[key].discard(record_id)
+            self._field_ids[key].discard(record_id)
+    
+    def _candidate_ids(self, query: Dict[str, Any]) -> Optional[Set[str]]:
         """
-        Clean up old records and temporary files
+        Narrow a search to the records that can match a query
         
-        Args:
-            older_than_days: Age threshold for cleanup
-            
         Returns:
-            Number of records cleaned up
+            Superset of the matching record IDs, or None if the query cannot be narrowed
         """
-        cutoff_timestamp = time.time() - (older_than_days * 24 * 60 * 60)
-        cleaned_count = 0
+        candidates = None
+        for key, value in query.items():
+            if key == 'id':
+                try:
+                    matched = {value} if value in self.memory_index else set()
+                except TypeError:
+                    continue
+            elif key == 'timestamp' or not _is_field_indexable(value):
+                continue
+            else:
+                # Records without the field are not filtered on it
+                field_ids = self._field_ids.get(key, set())
+                matched = set(self.field_index.get(key, {}).get(value, ()))
+                matched |= self._unindexed_field_ids.get(key, set())
+                if len(field_ids) < len(self.memory_index):
+                    matched |= self.memory_index.keys() - field_ids
+            
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                break
         
-        try:
-            with self.lock:
-                # Clean up each storage component
-                for component in [self.sequence_storage, self.schema_storage,
-                                self.query_storage, self.metadata_storage,
-                                self.index_storage, self.cache_storage]:
-                    cleaned_count += component.cleanup_old_records(cutoff_timestamp)
-                
-                # Clean up temporary files
-                temp_dir = self.base_path / "temp"
-                if temp_dir.exists():
-                    for temp_file in temp_dir.iterdir():
-                        if temp_file.is_file():
-                            file_age = time.time() - temp_file.stat().st_mtime
-                            if file_age > (older_than_days * 24 * 60 * 60):
-                                temp_file.unlink()
-                                cleaned_count += 1
-                
-                logger.info(f"Cleanup completed: {cleaned_count} items removed")
-                return cleaned_count
-                
-        except Exception as e:
-            logger.error(f"Cleanup failed: {e}")
-            return 0
-
-
-class StorageComponent:
-    """
-    Individual storage component for specific data types
-    Implements custom file-based storage with advanced features
-    """
+        return candidates
     
-    def __init__(self, storage_type: StorageType, base_path: Path,
-                 enable_compression: bool = True, enable_encryption: bool = False):
+    def _map_file(self, path: str, min_size: int = 0) -> Union[mmap.mmap, bytes]:
         """
-        Initialize storage component
+        Return a cached read-only mapping of a file
         
-        Args:
-            storage_type: Type of data this component handles
-            base_path: Base directory for this component
-            enable_compression: Whether to enable compression
-            enable_encryption: Whether to enable encryption
+        Concurrent readers share the cache, so mappings that are replaced or
+        evicted here are not closed; they are released once no reader holds them.
         """
-        self.storage_type = storage_type
-        self.base_path = base_path
-        self.enable_compression = enable_compression
-        self.enable_encryption = enable_encryption
-        
-        # Storage paths
-        self.data_path = base_path / "data"
-        self.index_path = base_path / "index"
-        self.meta_path = base_path / "meta"
+        with self._mmap_lock:
+            mapped = self._mmap_cache.get(path)
+            if mapped is not None and len(mapped) >= min_size:
+                self._mmap_cache.move_to_end(path)
+                return mapped
+            
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                if os.fstat(fd).st_size == 0:
+                    # Empty files cannot be mapped
+                    return b""
+                mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+            _advise(mapped, _MADV_RANDOM)
+            
+            self._mmap_cache[path] = mapped
+            self._mmap_cache.move_to_end(path)
+            if len(self._mmap_cache) > MMAP_CACHE_SIZE:
+                self._mmap_cache.popitem(last=False)
+            return mapped
+    
+    @contextmanager
+    def _sequential_scan(self):
+        """Hint sequential readahead on all segments for the duration of a scan"""
+        self._advise_segments(_MADV_SEQUENTIAL)
+        try:
+            yield
+        finally:
+            self._advise_segments(_MADV_RANDOM)
+    
+    def _advise_segments(self, advice: Optional[int]):
+        """Apply a readahead hint to the mapping of every segment"""
+        if advice is None:
+            return
+        for segment_id in self._segment_ids():
+            _advise(self._map_file(self._segment_path(segment_id)), advice)
+    
+    def _unmap_file(self, path: str):
+        """Drop the cached mapping of a file before it is rewritten or removed; writers only"""
+        mapped = self._mmap_cache.pop(path, None)
+        if mapped is not None:
+            mapped.close()
+    
+    def _segment_path(self, segment_id: int) -> str:
+        """Path of a segment file"""
+        return f"{self._data_prefix}seg_{segment_id:04d}.dat"
+    
+    def _segment_ids(self) -> List[int]:
+        """IDs of the segment files present on disk"""
+        segment_ids = []
+        for segment_file in self.data_path.glob("seg_*.dat"):
+            try:
+                segment_ids.append(int(segment_file.stem[4:]))
+            except ValueError:
+                continue
+        return segment_ids
+    
+    def _rotate_segment(self):
+        """Seal the active segment and start a new one"""
+        self._segment.close()
+        self._segment_id += 1
+        self._segment = open(self._segment_path(self._segment_id), 'ab')
+    
+    def _append_to_segment(self, data_bytes: bytes, meta_bytes: bytes) -> Tuple[int, int]:
+        """Append one entry to the active segment and return its location"""
+        return self._append_many_to_segment([(data_bytes, meta_bytes)])[0]
+    
+    def _append_many_to_segment(self, payloads: List[Tuple[bytes, bytes]]) -> List[Tuple[int, int]]:
+        """
+        Append entries to the active segment in a single write and return their locations
         
-        # Ensure directories exist
-        self.data_path.mkdir(parents=True, exist_ok=True)
-        self.index_path.mkdir(parents=True, exist_ok=True)
-        self.meta_path.mkdir(parents=True, exist_ok=True)
+        Other processes append to the same segment, so the write lands at the
+        end of the file as it stands under locked(), not where this one left it.
+        """
+        if self._segment.closed or os.fstat(self._segment.fileno()).st_nlink == 0:
+            # Reopened after close, or removed by another process's compaction
+            self._segment.close()
+            self._segment_id = max(self._segment_ids(), default=0)
+            self._segment = open(self._segment_path(self._segment_id), 'ab')
         
-        # Statistics
-        self.stats = {
-            'record_count': 0,
-            'total_size': 0,
-            'last_updated': 0
-        }
+        offset = os.fstat(self._segment.fileno()).st_size
+        while offset >= SEGMENT_MAX_SIZE:
+            self._rotate_segment()
+            offset = os.fstat(self._segment.fileno()).st_size
+        pack_header = _SEGMENT_HEADER.pack
+        chunks = []
+        locations = []
+        for data_bytes, meta_bytes in payloads:
+            chunks.append(pack_header(len(data_bytes), len(meta_bytes)))
+            chunks.append(data_bytes)
+            chunks.append(meta_bytes)
+            locations.append((self._segment_id, offset))
+            offset += _SEGMENT_HEADER.size + len(data_bytes) + len(meta_bytes)
         
-        # In-memory index for fast lookups
-        self.memory_index = {}
-        self._load_memory_index()
+        self._segment.write(b"".join(chunks))
+        self._segment.flush()
+        return locations
+    
+    def _read_segment_entry(self, index_entry: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        """Read the data and metadata bytes of a segment entry"""
+        path = self._segment_path(index_entry['seg'])
+        start = index_entry['off'] + _SEGMENT_HEADER.size
+        middle = start + index_entry['dlen']
+        end = middle + index_entry['mlen']
         
-        logger.info(f"Storage component {storage_type.name} initialized at {base_path}")
+        # Remaps the segment if it grew since it was mapped
+        mapped = self._map_file(path, end)
+        return mapped[start:middle], mapped[middle:end]
     
-    def _load_memory_index(self):
-        """Load memory index from disk"""
-        try:
-            index_file = self.meta_path / "memory_index.json"
-            if index_file.exists():
-                with open(index_file, 'r') as f:
-                    self.memory_index = json.load(f)
-                    self.stats['record_count'] = len(self.memory_index)
-                    
-        except Exception as e:
-            logger.warning(f"Failed to load memory index: {e}")
-            self.memory_index = {}
+    def _remove_record_files(self, index_entry: Dict[str, Any]):
+        """Remove the per-record files of an entry written before segments"""
+        for key in ('data_file', 'meta_file'):
+            path = index_entry.get(key)
+            if path:
+                self._unmap_file(path)
+                if os.path.exists(path):
+                    os.unlink(path)
     
-    def _save_memory_index(self):
-        """Save memory index to disk"""
-        try:
-            index_file = self.meta_path / "memory_index.json"
-            with open(index_file, 'w') as f:
-                json.dump(self.memory_index, f, indent=2)
-                
-        except Exception as e:
-            logger.error(f"Failed to save memory index: {e}")
+    def compact_segments(self) -> int:
+        """
+        Rewrite live records into a fresh segment and drop sealed segments
+        
+        Returns:
+            Number of bytes reclaimed
+        """
+        old_segment_ids = set(self._segment_ids())
+        old_size = sum(os.path.getsize(self._segment_path(seg)) for seg in old_segment_ids)
+        # Start past every segment, including those other processes rotated to
+        self._segment_id = max(old_segment_ids | {self._segment_id})
+        self._rotate_segment()
+        
+        with self._sequential_scan():
+            for record_id, index_entry in list(self.memory_index.items()):
+                if index_entry.get('seg') not in old_segment_ids:
+                    continue
+                data_bytes, meta_bytes = self._read_segment_entry(index_entry)
+                segment_id, offset = self._append_to_segment(data_bytes, meta_bytes)
+                index_entry = {**index_entry, 'seg': segment_id, 'off': offset}
+                self.memory_index[record_id] = index_entry
+                self._log_index_operation({'op': 'put', 'id': record_id, 'entry': index_entry})
+        
+        for segment_id in old_segment_ids:
+            path = self._segment_path(segment_id)
+            self._unmap_file(path)
+            os.unlink(path)
+        
+        new_size = sum(os.path.getsize(self._segment_path(seg)) for seg in self._segment_ids())
+        return old_size - new_size
     
     def store(self, record: StorageRecord) -> bool:
         """
@@ -538,51 +1775,88 @@ class StorageComponent:
             True if successful, False otherwise
         """
         try:
-            # Generate file paths
-            data_file = self.data_path / f"{record.id}.dat"
-            meta_file = self.meta_path / f"{record.id}.meta"
+            self._store_batch([record])
+            return True
             
-            # Serialize and store data
-            data_bytes = self._serialize_data(record.data)
-            meta_bytes = self._serialize_data(record.metadata)
+        except Exception as e:
+            logger.error(f"Failed to store record {record.id}: {e}")
+            return False
+    
+    def store_many(self, records: List[StorageRecord], executor: Optional[Executor] = None) -> int:
+        """
+        Store several records with one segment write and one index log write
+        
+        Args:
+            records: StorageRecords to store
+            executor: Optional executor used to serialize large batches in parallel
             
-            # Write data file
-            with open(data_file, 'wb') as f:
-                f.write(data_bytes)
+        Returns:
+            Number of records stored
+        """
+        if not records:
+            return 0
+        
+        try:
+            self._store_batch(records, executor)
+            return len(records)
             
-            # Write metadata file
-            with open(meta_file, 'wb') as f:
-                f.write(meta_bytes)
+        except Exception as e:
+            logger.error(f"Failed to store batch of {len(records)} records: {e}")
+            return 0
+    
+    def _store_batch(self, records: List[StorageRecord], executor: Optional[Executor] = None):
+        """Write records to the active segment and index them"""
+        # Serialize data and metadata, in parallel chunks for large batches;
+        # the segment and index log are still written by this thread only
+        if executor is not None and len(records) >= BULK_PARALLEL_THRESHOLD:
+            chunk_size = -(-len(records) // BULK_SERIALIZE_WORKERS)
+            chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+            payloads = [payload for chunk in executor.map(self._serialize_records, chunks)
+                        for payload in chunk]
+        else:
+            payloads = self._serialize_records(records)
+        
+        # Append everything to the active segment at once
+        locations = self._append_many_to_segment(payloads)
+        
+        operations = []
+        total_size = 0
+        for record, (data_bytes, meta_bytes), (segment_id, offset) in zip(records, payloads, locations):
+            # Overwritten records may still live in per-record files
+            previous_entry = self.memory_index.get(record.id)
+            if previous_entry is not None:
+                self._remove_record_files(previous_entry)
             
             # Update memory index
-            self.memory_index[record.id] = {
-                'data_file': str(data_file),
-                'meta_file': str(meta_file),
+            index_entry = {
+                'seg': segment_id,
+                'off': offset,
+                'dlen': len(data_bytes),
+                'mlen': len(meta_bytes),
                 'timestamp': record.timestamp,
                 'size': len(data_bytes),
                 'checksum': record.checksum
             }
-            
-            # Update statistics
-            self.stats['record_count'] = len(self.memory_index)
-            self.stats['total_size'] += len(data_bytes)
-            self.stats['last_updated'] = time.time()
-            
-            # Save memory index
-            self._save_memory_index()
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to store record {record.id}: {e}")
-            return False
+            self.memory_index[record.id] = index_entry
+            self._index_fields(record)
+            operations.append({'op': 'put', 'id': record.id, 'entry': index_entry})
+            total_size += len(data_bytes)
+        
+        # Update statistics
+        self.stats['record_count'] = len(self.memory_index)
+        self.stats['total_size'] += total_size
+        self.stats['last_updated'] = time.time()
+        
+        # Log the index updates
+        self._log_index_operations(operations)
     
-    def retrieve(self, record_id: str) -> Optional[StorageRecord]:
+    def retrieve(self, record_id: str, verify: bool = False) -> Optional[StorageRecord]:
         """
         Retrieve a record from this component
         
         Args:
             record_id: ID of record to retrieve
+            verify: Whether to validate the record checksum
             
         Returns:
             StorageRecord if found, None otherwise
@@ -592,23 +1866,21 @@ class StorageComponent:
                 return None
             
             index_entry = self.memory_index[record_id]
-            data_file = Path(index_entry['data_file'])
-            meta_file = Path(index_entry['meta_file'])
-            
-            if not data_file.exists() or not meta_file.exists():
-                logger.warning(f"Record files missing for {record_id}")
-                return None
-            
-            # Read data and metadata
-            with open(data_file, 'rb') as f:
-                data_bytes = f.read()
-            
-            with open(meta_file, 'rb') as f:
-                meta_bytes = f.read()
-            
-            # Deserialize
-            data = self._deserialize_data(data_bytes)
-            metadata = self._deserialize_data(meta_bytes)
+            if 'seg' in index_entry:
+                data_bytes, meta_bytes = self._read_segment_entry(index_entry)
+                data = self._deserialize_data(data_bytes)
+                metadata = self._deserialize_data(meta_bytes)
+            else:
+                data_file = Path(index_entry['data_file'])
+                meta_file = Path(index_entry['meta_file'])
+                
+                if not data_file.exists() or not meta_file.exists():
+                    logger.warning(f"Record files missing for {record_id}")
+                    return None
+                
+                # Deserialize straight from the mapped pages
+                data = self._deserialize_data(self._map_file(str(data_file)))
+                metadata = self._deserialize_data(self._map_file(str(meta_file)))
             
             # Reconstruct record
             record = StorageRecord(
@@ -621,7 +1893,7 @@ class StorageComponent:
             )
             
             # Validate integrity
-            if not record.validate_integrity():
+            if verify and not record.validate_integrity():
                 logger.warning(f"Data integrity check failed for {record_id}")
                 return None
             
@@ -631,6 +1903,22 @@ class StorageComponent:
             logger.error(f"Failed to retrieve record {record_id}: {e}")
             return None
     
+    def scrub(self, record_ids: List[str]) -> List[str]:
+        """
+        Validate the checksums of stored records
+        
+        Args:
+            record_ids: IDs of records to validate; IDs no longer stored are skipped
+            
+        Returns:
+            IDs of records that could not be loaded or failed validation
+        """
+        with self._sequential_scan():
+            return [
+                record_id for record_id in record_ids
+                if record_id in self.memory_index and self.retrieve(record_id, verify=True) is None
+            ]
+    
     def delete(self, record_id: str) -> bool:
         """
         Delete a record from this component
@@ -646,25 +1934,20 @@ class StorageComponent:
                 return False
             
             index_entry = self.memory_index[record_id]
-            data_file = Path(index_entry['data_file'])
-            meta_file = Path(index_entry['meta_file'])
-            
-            # Remove files
-            if data_file.exists():
-                data_file.unlink()
             
-            if meta_file.exists():
-                meta_file.unlink()
+            # Segment space is reclaimed by compact_segments
+            self._remove_record_files(index_entry)
             
             # Update statistics
             self.stats['total_size'] -= index_entry['size']
             
             # Remove from memory index
             del self.memory_index[record_id]
+            self._unindex_fields(record_id)
             self.stats['record_count'] = len(self.memory_index)
             
-            # Save memory index
-            self._save_memory_index()
+            # Log the index update
+            self._log_index_operation({'op': 'del', 'id': record_id})
             
             return True
             
@@ -672,6 +1955,35 @@ class StorageComponent:
             logger.error(f"Failed to delete record {record_id}: {e}")
             return False
     
+    def delete_many(self, record_ids: List[str]) -> int:
+        """
+        Delete many records from this component with a single log write
+        
+        Args:
+            record_ids: IDs of records to delete
+            
+        Returns:
+            Number of records deleted
+        """
+        operations = []
+        try:
+            for record_id in record_ids:
+                index_entry = self.memory_index.pop(record_id, None)
+                if index_entry is None:
+                    continue
+                self._remove_record_files(index_entry)
+                self.stats['total_size'] -= index_entry['size']
+                self._unindex_fields(record_id)
+                operations.append({'op': 'del', 'id': record_id})
+        except Exception as e:
+            logger.error(f"Failed to delete records: {e}")
+        finally:
+            self.stats['record_count'] = len(self.memory_index)
+            if operations:
+                self._log_index_operations(operations)
+        
+        return len(operations)
+    
     def delete_pattern(self, pattern: str) -> int:
         """
         Delete records matching a pattern
@@ -705,24 +2017,131 @@ class StorageComponent:
         results = []
         
         try:
-            for record_id in self.memory_index:
-                record = self.retrieve(record_id)
-                if record and self._matches_query(record, query):
-                    results.append(record)
+            candidates = self._candidate_ids(query)
+            record_ids = self._index_matches(candidates, query)
+            
+            # Only queries on metadata or data fields need the payload checked
+            payload_query = {key: value for key, value in query.items()
+                             if key not in ('id', 'timestamp')}
+            
+            if candidates is None:
+                # Unindexed queries read every record in insertion order
+                with self._sequential_scan():
+                    results = self._load_matching(record_ids, payload_query)
+            else:
+                results = self._load_matching(record_ids, payload_query)
+                    
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+        
+        return results
+    
+    def search_ids(self, query: Dict[str, Any]) -> List[str]:
+        """
+        Search for the IDs of records matching criteria
+        
+        Payloads are read only for records the field index cannot decide.
+        
+        Args:
+            query: Search criteria dictionary
+            
+        Returns:
+            IDs of the matching records
+        """
+        results = []
+        
+        try:
+            candidates = self._candidate_ids(query)
+            payload_query = {key: value for key, value in query.items()
+                             if key not in ('id', 'timestamp')}
+            
+            for record_id in self._index_matches(candidates, query):
+                matched = self._matches_field_index(record_id, payload_query)
+                if matched is None:
+                    record = self.retrieve(record_id)
+                    matched = record is not None and self._matches_payload(record, payload_query)
+                if matched:
+                    results.append(record_id)
                     
         except Exception as e:
             logger.error(f"Search failed: {e}")
         
         return results
     
+    def _matches_field_index(self, record_id: str, payload_query: Dict[str, Any]) -> Optional[bool]:
+        """Check payload criteria from the field index alone, or None if the payload must be read"""
+        if self._record_fields.get(record_id) is None:
+            return None
+        
+        for key, value in payload_query.items():
+            if record_id in self._unindexed_field_ids.get(key, ()):
+                return None
+            if record_id in self._field_ids.get(key, ()):
+                try:
+                    if record_id not in self.field_index[key].get(value, ()):
+                        return False
+                except TypeError:
+                    return None
+        
+        return True
+    
+    def _load_matching(self, record_ids: List[str], payload_query: Dict[str, Any]) -> List[StorageRecord]:
+        """Load records and keep those matching the payload criteria"""
+        results = []
+        for record_id in record_ids:
+            record = self.retrieve(record_id)
+            if record and (not payload_query or self._matches_payload(record, payload_query)):
+                results.append(record)
+        return results
+    
     def _matches_query(self, record: StorageRecord, query: Dict[str, Any]) -> bool:
         """Check if record matches search query"""
+        index_entry = {'timestamp': record.timestamp}
+        return (self._matches_index(record.id, index_entry, query)
+                and self._matches_payload(record, query))
+    
+    def _index_matches(self, candidates: Optional[Set[str]], query: Dict[str, Any]) -> List[str]:
+        """
+        Filter on id and timestamp from the index alone
+        
+        Without candidates every record is checked in insertion order. Narrowed
+        queries walk only the candidate set and return it oldest record first,
+        so they do not pay for a pass over the whole index.
+        """
+        memory_index = self.memory_index
+        if candidates is None:
+            return [record_id for record_id, index_entry in memory_index.items()
+                    if self._matches_index(record_id, index_entry, query)]
+        
+        matches = []
+        for record_id in candidates:
+            index_entry = memory_index.get(record_id)
+            if index_entry is not None and self._matches_index(record_id, index_entry, query):
+                matches.append((index_entry['timestamp'], record_id))
+        matches.sort()
+        return [record_id for _, record_id in matches]
+    
+    def _matches_index(self, record_id: str, index_entry: Dict[str, Any],
+                       query: Dict[str, Any]) -> bool:
+        """Check the id and timestamp criteria of a query against an index entry"""
         try:
             for key, value in query.items():
-                if key == 'id' and record.id != value:
+                if key == 'id' and record_id != value:
                     return False
-                elif key == 'timestamp' and record.timestamp != value:
+                elif key == 'timestamp' and index_entry['timestamp'] != value:
                     return False
+            
+            return True
+            
+        except Exception:
+            return False
+    
+    def _matches_payload(self, record: StorageRecord, query: Dict[str, Any]) -> bool:
+        """Check the metadata and data criteria of a query against a loaded record"""
+        try:
+            for key, value in query.items():
+                if key == 'id' or key == 'timestamp':
+                    continue
                 elif key in record.metadata and record.metadata[key] != value:
                     return False
                 elif key in record.data and record.data[key] != value:
@@ -743,23 +2162,58 @@ class StorageComponent:
         Returns:
             Number of records cleaned up
         """
-        cleaned_count = 0
-        record_ids = list(self.memory_index.keys())
-        
-        for record_id in record_ids:
-            index_entry = self.memory_index[record_id]
-            if index_entry['timestamp'] < cutoff_timestamp:
-                if self.delete(record_id):
-                    cleaned_count += 1
+        record_ids = list(self.memory_index)
+        if np is not None:
+            timestamps = np.fromiter((entry['timestamp'] for entry in self.memory_index.values()),
+                                     dtype=np.float64, count=len(record_ids))
+            expired = [record_ids[i] for i in np.flatnonzero(timestamps < cutoff_timestamp)]
+        else:
+            expired = [record_id for record_id, entry in self.memory_index.items()
+                       if entry['timestamp'] < cutoff_timestamp]
         
-        return cleaned_count
+        return self.delete_many(expired)
+    
+    def _zstd(self) -> threading.local:
+        """zstd compressor and decompressor of the calling thread"""
+        contexts = self._zstd_contexts
+        if not hasattr(contexts, 'compressor'):
+            contexts.compressor = zstandard.ZstdCompressor(level=3)
+            contexts.decompressor = zstandard.ZstdDecompressor()
+        return contexts
+    
+    def _serialize_records(self, records: List[StorageRecord]) -> List[Tuple[bytes, bytes]]:
+        """Serialize the data and metadata of records"""
+        serialize = self._serialize_data
+        return [(serialize(record.data), serialize(record.metadata)) for record in records]
     
     def _serialize_data(self, data: Any) -> bytes:
-        """Serialize data to bytes"""
+        """
+        Serialize data to bytes
+        
+        Data msgpack can represent exactly, tuples included, is packed with
+        msgpack; anything else (sets, subclasses such as OrderedDict or
+        namedtuples, arbitrary objects) is pickled so it keeps its type.
+        """
+        packed = None
+        if msgpack is not None:
+            try:
+                packed = _msgpack_packb(data)
+            except (TypeError, ValueError, OverflowError):
+                # Objects msgpack cannot represent keep using pickle
+                packed = None
+        
         try:
+            if packed is not None:
+                if not self.enable_compression:
+                    return bytes((_CODEC_MSGPACK,)) + packed
+                if zstandard is not None:
+                    return bytes((_CODEC_MSGPACK_ZSTD,)) + self._zstd().compressor.compress(packed)
+                return bytes((_CODEC_MSGPACK_ZLIB,)) + zlib.compress(packed)
+            
             if self.enable_compression:
-                import zlib
                 serialized = pickle.dumps(data)
+                if zstandard is not None:
+                    return bytes((_CODEC_PICKLE_ZSTD,)) + self._zstd().compressor.compress(serialized)
                 return zlib.compress(serialized)
             else:
                 return pickle.dumps(data)
@@ -767,11 +2221,21 @@ class StorageComponent:
             logger.error(f"Serialization failed: {e}")
             return pickle.dumps(data)
     
-    def _deserialize_data(self, data_bytes: bytes) -> Any:
-        """Deserialize data from bytes"""
+    def _deserialize_data(self, data_bytes: Union[bytes, mmap.mmap]) -> Any:
+        """Deserialize data from bytes or any buffer"""
+        codec = data_bytes[0] if len(data_bytes) else None
+        if codec == _CODEC_MSGPACK:
+            return _msgpack_unpackb(data_bytes[1:])
+        if codec == _CODEC_MSGPACK_ZSTD:
+            packed = self._zstd().decompressor.decompress(data_bytes[1:])
+            return _msgpack_unpackb(packed)
+        if codec == _CODEC_MSGPACK_ZLIB:
+            return _msgpack_unpackb(zlib.decompress(data_bytes[1:]))
+        if codec == _CODEC_PICKLE_ZSTD:
+            return pickle.loads(self._zstd().decompressor.decompress(data_bytes[1:]))
+        
         try:
             if self.enable_compression:
-                import zlib
                 decompressed = zlib.decompress(data_bytes)
                 return pickle.loads(decompressed)
             else:
@@ -792,21 +2256,59 @@ class StorageComponent:
         }
 
 
+class StoreBatch:
+    """Records collected by SpiraPiDatabase.batch() and stored together when the block exits"""
+    
+    def __init__(self, database: 'SpiraPiDatabase'):
+        self._database = database
+        self._timestamp = time.time()
+        self.records: List[StorageRecord] = []
+    
+    def _add(self, data: Dict[str, Any], data_type: StorageType, prefix: str) -> str:
+        """Queue one record, sharing the batch timestamp"""
+        record_id = self._database._record_id(data, prefix)
+        self.records.append(self._database._new_record(record_id, data_type, data, self._timestamp))
+        return record_id
+    
+    def store_sequence(self, sequence_data: Dict[str, Any]) -> str:
+        """Queue a π sequence"""
+        return self._add(sequence_data, StorageType.SEQUENCE, "seq")
+    
+    def store_schema(self, schema_data: Dict[str, Any]) -> str:
+        """Queue a schema definition"""
+        return self._add(schema_data, StorageType.SCHEMA, "schema")
+    
+    def store_query(self, query_data: Dict[str, Any]) -> str:
+        """Queue a query result"""
+        return self._add(query_data, StorageType.QUERY, "query")
+
+
 class SpiraPiDatabase:
     """
     High-level database interface for SpiraPi
     Provides simplified access to storage engine functionality
     """
     
-    def __init__(self, base_path: str = "data"):
+    def __init__(self, base_path: str = "data", verify_reads: bool = False,
+                 checksum_algorithm: str = CHECKSUM_SHA256):
         """
         Initialize SpiraPi database
         
         Args:
             base_path: Base directory for data storage
+            verify_reads: Whether every retrieval validates the record checksum
+            checksum_algorithm: Checksum for new non-schema records, CHECKSUM_SHA256
+                or the faster, non-cryptographic CHECKSUM_XXH3
         """
-        self.storage_engine = SpiraPiStorageEngine(base_path)
+        if checksum_algorithm not in _CHECKSUM_ALGORITHMS:
+            raise ValueError(f"Unknown checksum algorithm: {checksum_algorithm}")
+        if checksum_algorithm == CHECKSUM_XXH3 and xxhash is None:
+            raise ImportError("xxhash is required for xxh3 checksums")
+        # Every database on the same directory shares one engine
+        self.storage_engine = SpiraPiStorageEngine.open_shared(base_path, verify_reads=verify_reads)
+        self._closed = False
         self._base_path = base_path
+        self._checksum_algorithm = checksum_algorithm
         logger.info("SpiraPi Database initialized")
     
     @property
@@ -819,15 +2321,26 @@ class SpiraPiDatabase:
         """Get the base path of the storage engine"""
         return self.storage_engine.base_path
     
+    def _record_id(self, data: Dict[str, Any], prefix: str) -> str:
+        """ID given in the data, or a generated one"""
+        record_id = data.get('id')
+        return generate_record_id(prefix) if record_id is None else record_id
+    
+    def _new_record(self, record_id: str, data_type: StorageType, data: Any,
+                    timestamp: Optional[float] = None) -> StorageRecord:
+        """Build a record checksummed with the configured algorithm; schemas always use SHA-256"""
+        if timestamp is None:
+            timestamp = time.time()
+        algorithm = CHECKSUM_SHA256 if data_type == StorageType.SCHEMA else self._checksum_algorithm
+        return StorageRecord.create(record_id, data_type, data, {'stored_at': timestamp},
+                                    timestamp, checksum_algorithm=algorithm)
+    
     def store_sequence(self, sequence_data: Dict[str, Any]) -> str:
         """Store a π sequence"""
-        record = StorageRecord(
-            id=sequence_data.get('id', f"seq_{int(time.time() * 1000000)}"),
-            data_type=StorageType.SEQUENCE,
-            data=sequence_data,
-            metadata={'stored_at': time.time()},
-            timestamp=time.time(),
-            checksum=""
+        record = self._new_record(
+            self._record_id(sequence_data, "seq"),
+            StorageType.SEQUENCE,
+            sequence_data
         )
         
         if self.storage_engine.store(record):
@@ -835,6 +2348,37 @@ class SpiraPiDatabase:
         else:
             raise RuntimeError(f"Failed to store sequence {record.id}")
     
+    def store_sequences_bulk(self, sequences: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store many π sequences in one batch
+        
+        Args:
+            sequences: Sequence dictionaries, as accepted by store_sequence
+            
+        Returns:
+            IDs of the stored sequences
+        """
+        with self.batch() as batch:
+            return [batch.store_sequence(sequence_data) for sequence_data in sequences]
+    
+    @contextmanager
+    def batch(self) -> Iterator[StoreBatch]:
+        """
+        Collect stores and write them with one storage engine call on exit
+        
+        Nothing is stored if the block raises.
+        
+        Yields:
+            StoreBatch whose store_* methods queue records and return their IDs
+        """
+        batch = StoreBatch(self)
+        yield batch
+        
+        records = batch.records
+        stored_count = self.storage_engine.store_many(records)
+        if stored_count != len(records):
+            raise RuntimeError(f"Failed to store {len(records) - stored_count} of {len(records)} records")
+    
     def retrieve_sequence(self, sequence_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a π sequence"""
         record = self.storage_engine.retrieve(sequence_id, StorageType.SEQUENCE)
@@ -842,13 +2386,10 @@ class SpiraPiDatabase:
     
     def store_schema(self, schema_data: Dict[str, Any]) -> str:
         """Store a schema definition"""
-        record = StorageRecord(
-            id=schema_data.get('id', f"schema_{int(time.time() * 1000000)}"),
-            data_type=StorageType.SCHEMA,
-            data=schema_data,
-            metadata={'stored_at': time.time()},
-            timestamp=time.time(),
-            checksum=""
+        record = self._new_record(
+            self._record_id(schema_data, "schema"),
+            StorageType.SCHEMA,
+            schema_data
         )
         
         if self.storage_engine.store(record):
@@ -863,13 +2404,10 @@ class SpiraPiDatabase:
     
     def store_query(self, query_data: Dict[str, Any]) -> str:
         """Store a query result"""
-        record = StorageRecord(
-            id=query_data.get('id', f"query_{int(time.time() * 1000000)}"),
-            data_type=StorageType.QUERY,
-            data=query_data,
-            metadata={'stored_at': time.time()},
-            timestamp=time.time(),
-            checksum=""
+        record = self._new_record(
+            self._record_id(query_data, "query"),
+            StorageType.QUERY,
+            query_data
         )
         
         if self.storage_engine.store(record):
@@ -900,29 +2438,33 @@ class SpiraPiDatabase:
         """Create database backup"""
         return self.storage_engine.backup(backup_path)
     
+    def scrub_database(self) -> Dict[str, List[str]]:
+        """Validate the checksums of all stored records"""
+        return self.storage_engine.scrub()
+    
     def cleanup_database(self, older_than_days: int = 30) -> int:
         """Clean up old data"""
         return self.storage_engine.cleanup(older_than_days)
     
     def close(self):
         """Close database and cleanup resources"""
+        if self._closed:
+            return
+        self._closed = True
         logger.info("Closing SpiraPi Database")
-        # Cleanup is handled by storage engine
+        self.storage_engine.release()
     
     def delete_schema(self, schema_name: str) -> bool:
         """Delete a schema and all related data"""
         try:
-            # Search for and delete schema records
-            schema_records = self.search_schemas({'name': schema_name})
-            for record in schema_records:
-                if record.get('id'):
-                    self.storage_engine.delete(record['id'], StorageType.SCHEMA)
+            # Search for and delete schema records; the field index resolves the
+            # matches without loading them
+            schema_ids = self.storage_engine.search_ids({'name': schema_name}, StorageType.SCHEMA)
+            self.storage_engine.delete_many(schema_ids, StorageType.SCHEMA)
             
             # Search for and delete related evolution records
-            evolution_records = self.search_queries({'schema_name': schema_name})
-            for record in evolution_records:
-                if record.get('id'):
-                    self.storage_engine.delete(record['id'], StorageType.QUERY)
+            evolution_ids = self.storage_engine.search_ids({'schema_name': schema_name}, StorageType.QUERY)
+            self.storage_engine.delete_many(evolution_ids, StorageType.QUERY)
             
             return True
         except Exception as e:
@@ -956,6 +2498,8 @@ class SpiraPiDatabase:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     # Initialize database
     db = SpiraPiDatabase("test_spirapi")
     
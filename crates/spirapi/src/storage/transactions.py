@@ -4,13 +4,68 @@ Handles ACID transactions, rollbacks, and data consistency
 """
 
 from enum import Enum
-from typing import Dict, List, Any, Optional, Set, Callable
+from typing import Dict, List, Any, Optional, Set, Tuple, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
+import os
 import uuid
 import json
 import threading
+import time
 from contextlib import contextmanager
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ._compat import DATACLASS_OPTIONS
+
+
+# Number of logged transactions after which the history is checkpointed
+TRANSACTION_CHECKPOINT_INTERVAL = 1000
+
+# Most recent committed transactions kept in memory; older ones are read back from the archive
+MAX_CACHED_COMMITTED = 10000
+
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _datetime_from_ns(timestamp_ns: int) -> datetime:
+    """Local naive datetime for a nanosecond Unix timestamp, at microsecond precision"""
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
+
+
+def _ns_from_datetime(value: datetime) -> int:
+    """Nanosecond Unix timestamp of a datetime"""
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+def _open_log(path: Path):
+    """Open a JSON-lines file for appending, terminating a torn final line"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, 'ab+')
+    if f.seek(0, os.SEEK_END):
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+    return f
 
 
 class TransactionState(Enum):
@@ -29,7 +84,8 @@ class IsolationLevel(Enum):
     SERIALIZABLE = "serializable"
 
 
-@dataclass
+# eq=False keeps identity hashing; the generated value hash would fail on the dict payloads
+@dataclass(frozen=True, eq=False, **DATACLASS_OPTIONS)
 class TransactionLog:
     """Log entry for a transaction operation"""
     operation_id: str
@@ -38,7 +94,12 @@ class TransactionLog:
     record_id: str
     old_data: Any = None
     new_data: Any = None
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Time the operation was logged"""
+        return _datetime_from_ns(self.timestamp_ns)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert log entry to dictionary"""
@@ -55,26 +116,37 @@ class TransactionLog:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TransactionLog':
         """Create log entry from dictionary"""
-        data = data.copy()
-        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
-        return cls(**data)
+        return cls(
+            data["operation_id"],
+            data["operation_type"],
+            data["table_name"],
+            data["record_id"],
+            data.get("old_data"),
+            data.get("new_data"),
+            _ns_from_datetime(datetime.fromisoformat(data["timestamp"]))
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Transaction:
     """Represents a database transaction"""
     transaction_id: str
     state: TransactionState = TransactionState.ACTIVE
     isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at_ns: int = field(default_factory=time.time_ns)
     committed_at: Optional[datetime] = None
     rollback_reason: Optional[str] = None
     
     # Transaction data
     operations: List[TransactionLog] = field(default_factory=list)
-    locks_held: Set[str] = field(default_factory=set)
+    locks_held: Set[Tuple[str, str]] = field(default_factory=set)  # (resource, lock_type)
     savepoints: Dict[str, int] = field(default_factory=dict)
     
+    @property
+    def created_at(self) -> datetime:
+        """Time the transaction began"""
+        return _datetime_from_ns(self.created_at_ns)
+    
     def add_operation(self, operation: TransactionLog) -> None:
         """Add an operation to the transaction"""
         self.operations.append(operation)
@@ -89,10 +161,11 @@ class Transaction:
             raise ValueError(f"Savepoint '{name}' not found")
         
         savepoint_index = self.savepoints[name]
-        self.operations = self.operations[:savepoint_index]
+        del self.operations[savepoint_index:]
         
         # Remove savepoints after this one
-        self.savepoints = {k: v for k, v in self.savepoints.items() if v <= savepoint_index}
+        for later in [k for k, v in self.savepoints.items() if v > savepoint_index]:
+            del self.savepoints[later]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert transaction to dictionary"""
@@ -104,83 +177,109 @@ class Transaction:
             "committed_at": self.committed_at.isoformat() if self.committed_at else None,
             "rollback_reason": self.rollback_reason,
             "operations_count": len(self.operations),
-            "locks_held": list(self.locks_held),
+            "locks_held": [list(lock) for lock in self.locks_held],
             "savepoints": self.savepoints
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Transaction':
+        """Create a transaction summary from its dictionary form"""
+        return cls(
+            transaction_id=data["transaction_id"],
+            state=TransactionState(data["state"]),
+            isolation_level=IsolationLevel(data["isolation_level"]),
+            created_at_ns=_ns_from_datetime(datetime.fromisoformat(data["created_at"])),
+            committed_at=datetime.fromisoformat(data["committed_at"]) if data["committed_at"] else None,
+            rollback_reason=data.get("rollback_reason")
+        )
 
 
 class LockManager:
     """Manages database locks for transaction isolation"""
     
     def __init__(self):
-        self.locks: Dict[str, Dict[str, Transaction]] = {}  # resource -> {lock_type -> transaction}
+        self.shared_holders: Dict[str, Set[str]] = {}  # resource -> IDs of SHARED holders
+        self.exclusive_holder: Dict[str, str] = {}  # resource -> ID of the EXCLUSIVE holder
         self.waiting_transactions: Dict[str, List[Transaction]] = {}  # resource -> waiting transactions
         self.lock_timeout = 30  # seconds
+        
+        # Guards the lock tables; waiters block on a per-resource condition sharing it
+        self._mu = threading.Lock()
+        self._conditions: Dict[str, threading.Condition] = {}
     
     def acquire_lock(self, transaction: Transaction, resource: str, 
                     lock_type: str = "SHARED", timeout: int = None) -> bool:
         """Acquire a lock on a resource"""
         if timeout is None:
             timeout = self.lock_timeout
+        deadline = time.monotonic() + timeout
         
-        if resource not in self.locks:
-            self.locks[resource] = {}
-            self.waiting_transactions[resource] = []
-        
-        # Check if lock can be acquired
-        if self._can_acquire_lock(transaction, resource, lock_type):
-            self.locks[resource][lock_type] = transaction
-            transaction.locks_held.add(f"{resource}:{lock_type}")
+        with self._mu:
+            if resource not in self._conditions:
+                self.waiting_transactions[resource] = []
+                self._conditions[resource] = threading.Condition(self._mu)
+            
+            waiting = self.waiting_transactions[resource]
+            while not self._can_acquire_lock(transaction, resource, lock_type):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Timeout reached
+                    if transaction in waiting:
+                        waiting.remove(transaction)
+                    return False
+                
+                # Wait until a holder releases the resource
+                if transaction not in waiting:
+                    waiting.append(transaction)
+                self._conditions[resource].wait(remaining)
+            
+            if transaction in waiting:
+                waiting.remove(transaction)
+            if lock_type == "SHARED":
+                self.shared_holders.setdefault(resource, set()).add(transaction.transaction_id)
+            elif lock_type == "EXCLUSIVE":
+                self.exclusive_holder[resource] = transaction.transaction_id
+            transaction.locks_held.add((resource, lock_type))
             return True
-        
-        # Add to waiting queue
-        if transaction not in self.waiting_transactions[resource]:
-            self.waiting_transactions[resource].append(transaction)
-        
-        # Wait for lock (simplified implementation)
-        start_time = datetime.now()
-        while (datetime.now() - start_time).seconds < timeout:
-            if self._can_acquire_lock(transaction, resource, lock_type):
-                self.locks[resource][lock_type] = transaction
-                transaction.locks_held.add(f"{resource}:{lock_type}")
-                self.waiting_transactions[resource].remove(transaction)
-                return True
-        
-        # Timeout reached
-        self.waiting_transactions[resource].remove(transaction)
-        return False
     
     def release_lock(self, transaction: Transaction, resource: str, lock_type: str = "SHARED") -> None:
         """Release a lock on a resource"""
-        lock_key = f"{resource}:{lock_type}"
-        if lock_key in transaction.locks_held:
-            transaction.locks_held.remove(lock_key)
-            
-            if resource in self.locks and lock_type in self.locks[resource]:
-                if self.locks[resource][lock_type] == transaction:
-                    del self.locks[resource][lock_type]
+        lock_key = (resource, lock_type)
+        with self._mu:
+            if lock_key in transaction.locks_held:
+                transaction.locks_held.remove(lock_key)
+                
+                transaction_id = transaction.transaction_id
+                if lock_type == "SHARED":
+                    holders = self.shared_holders.get(resource)
+                    if holders is not None:
+                        holders.discard(transaction_id)
+                        if not holders:
+                            del self.shared_holders[resource]
+                elif lock_type == "EXCLUSIVE" and self.exclusive_holder.get(resource) == transaction_id:
+                    del self.exclusive_holder[resource]
+                self._conditions[resource].notify_all()
     
     def release_all_locks(self, transaction: Transaction) -> None:
         """Release all locks held by a transaction"""
-        locks_to_release = list(transaction.locks_held)
-        for lock_key in locks_to_release:
-            resource, lock_type = lock_key.split(":", 1)
+        for resource, lock_type in list(transaction.locks_held):
             self.release_lock(transaction, resource, lock_type)
     
     def _can_acquire_lock(self, transaction: Transaction, resource: str, lock_type: str) -> bool:
         """Check if a lock can be acquired"""
-        if resource not in self.locks:
-            return True
-        
-        current_locks = self.locks[resource]
+        transaction_id = transaction.transaction_id
+        exclusive = self.exclusive_holder.get(resource)
         
         # SHARED locks can coexist with other SHARED locks
         if lock_type == "SHARED":
-            return "EXCLUSIVE" not in current_locks
+            return exclusive is None or exclusive == transaction_id
         
-        # EXCLUSIVE locks require no other locks
+        # EXCLUSIVE locks require no other holders; a sole SHARED holder may upgrade
         if lock_type == "EXCLUSIVE":
-            return len(current_locks) == 0
+            if exclusive is not None and exclusive != transaction_id:
+                return False
+            holders = self.shared_holders.get(resource)
+            return not holders or holders == {transaction_id}
         
         return True
 
@@ -191,10 +290,25 @@ class TransactionManager:
     def __init__(self, storage_path: str = "data"):
         self.storage_path = storage_path
         self.active_transactions: Dict[str, Transaction] = {}
-        self.committed_transactions: Dict[str, Transaction] = {}
+        self.committed_transactions: 'OrderedDict[str, Transaction]' = OrderedDict()
+        self._committing: Dict[str, Transaction] = {}
         self.lock_manager = LockManager()
         self.transaction_counter = 0
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        
+        # Finished transactions are appended to a log replayed after the snapshot
+        self._history_dir = Path(storage_path) / "transactions"
+        self._history_file = self._history_dir / "transaction_history.json"
+        self._log_file = self._history_dir / "transaction_history.wal"
+        self._log = None
+        self._log_entries = 0
+        self._log_lock = threading.Lock()
+        
+        # Committed transactions evicted from memory, by byte offset in the archive
+        self._archive_file = self._history_dir / "transaction_archive.jsonl"
+        self._archive = None
+        self._archive_offsets: Dict[str, int] = {}
+        self._evicted: List[Transaction] = []
         
         # Load transaction history
         self._load_transaction_history()
@@ -215,40 +329,56 @@ class TransactionManager:
     
     def commit_transaction(self, transaction_id: str) -> bool:
         """Commit a transaction"""
+        # Only the bookkeeping holds the manager lock; validation, application
+        # and logging run concurrently with other commits
         with self._lock:
             if transaction_id not in self.active_transactions:
                 raise ValueError(f"Transaction '{transaction_id}' not found or already committed")
             
-            transaction = self.active_transactions[transaction_id]
+            transaction = self.active_transactions.pop(transaction_id)
+            self._committing[transaction_id] = transaction
+        
+        try:
+            # Validate transaction; every operation is checked before any is
+            # applied, since applied operations cannot be undone
+            valid = self._validate_transaction(transaction)
             
-            try:
-                # Validate transaction
-                if not self._validate_transaction(transaction):
-                    return False
-                
-                # Apply all operations
+            # Apply all operations
+            if valid:
                 self._apply_transaction(transaction)
                 
-                # Update transaction state
-                transaction.state = TransactionState.COMMITTED
-                transaction.committed_at = datetime.now()
-                
-                # Move to committed transactions
-                self.committed_transactions[transaction_id] = transaction
-                del self.active_transactions[transaction_id]
-                
-                # Release all locks
-                self.lock_manager.release_all_locks(transaction)
-                
-                # Save transaction history
-                self._save_transaction_history()
-                
-                return True
-                
-            except Exception as e:
-                # Rollback on error
-                self.rollback_transaction(transaction_id, str(e))
-                return False
+        except Exception as e:
+            # Rollback on error
+            self._reactivate(transaction)
+            self.rollback_transaction(transaction_id, str(e))
+            return False
+        
+        if not valid:
+            self._reactivate(transaction)
+            return False
+        
+        # Update transaction state
+        transaction.state = TransactionState.COMMITTED
+        transaction.committed_at = datetime.now()
+        
+        # Move to committed transactions
+        with self._lock:
+            self._remember_committed(transaction)
+            del self._committing[transaction_id]
+        
+        # Release all locks
+        self.lock_manager.release_all_locks(transaction)
+        
+        # Log the committed transaction
+        self._append_to_log(transaction)
+        
+        return True
+    
+    def _reactivate(self, transaction: Transaction) -> None:
+        """Return a transaction that failed to commit to the active set"""
+        with self._lock:
+            del self._committing[transaction.transaction_id]
+            self.active_transactions[transaction.transaction_id] = transaction
     
     def rollback_transaction(self, transaction_id: str, reason: str = "User requested rollback") -> bool:
         """Rollback a transaction"""
@@ -256,26 +386,38 @@ class TransactionManager:
             if transaction_id not in self.active_transactions:
                 raise ValueError(f"Transaction '{transaction_id}' not found or already committed")
             
-            transaction = self.active_transactions[transaction_id]
-            
-            # Update transaction state
-            transaction.state = TransactionState.ROLLED_BACK
-            transaction.rollback_reason = reason
-            
-            # Release all locks
-            self.lock_manager.release_all_locks(transaction)
-            
             # Remove from active transactions
-            del self.active_transactions[transaction_id]
-            
-            # Save transaction history
-            self._save_transaction_history()
-            
-            return True
+            transaction = self.active_transactions.pop(transaction_id)
+        
+        # Update transaction state
+        transaction.state = TransactionState.ROLLED_BACK
+        transaction.rollback_reason = reason
+        
+        # Release all locks
+        self.lock_manager.release_all_locks(transaction)
+        
+        # Log the rolled back transaction
+        self._append_to_log(transaction)
+        
+        return True
+    
+    def close(self) -> None:
+        """Close the transaction log"""
+        with self._log_lock:
+            for f in (self._log, self._archive):
+                if f is not None:
+                    f.close()
+            self._log = None
+            self._archive = None
     
     def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
         """Get a transaction by ID"""
-        return self.active_transactions.get(transaction_id) or self.committed_transactions.get(transaction_id)
+        transaction = (self.active_transactions.get(transaction_id)
+                       or self._committing.get(transaction_id)
+                       or self.committed_transactions.get(transaction_id))
+        if transaction is None:
+            transaction = self._load_archived_transaction(transaction_id)
+        return transaction
     
     def is_transaction_active(self, transaction_id: str) -> bool:
         """Check if a transaction is active"""
@@ -317,11 +459,8 @@ class TransactionManager:
     
     def _validate_transaction(self, transaction: Transaction) -> bool:
         """Validate a transaction before committing"""
-        # Check if all operations are valid
-        for operation in transaction.operations:
-            if not self._validate_operation(operation):
-                return False
-        return True
+        # Check if all operations are valid; all() stops at the first failure
+        return all(map(self._validate_operation, transaction.operations))
     
     def _validate_operation(self, operation: TransactionLog) -> bool:
         """Validate a single operation"""
@@ -343,51 +482,127 @@ class TransactionManager:
         pass
     
     def _load_transaction_history(self) -> None:
-        """Load transaction history from storage"""
+        """Index the archive, load the transaction history snapshot, then replay the transaction log"""
         try:
-            import os
-            from pathlib import Path
+            if self._archive_file.exists():
+                with open(self._archive_file, 'rb') as f:
+                    offset = 0
+                    for line in f:
+                        try:
+                            self._archive_offsets[_loads(line)["transaction_id"]] = offset
+                        except ValueError:
+                            pass
+                        offset += len(line)
             
-            history_file = Path(f"{self.storage_path}/transactions/transaction_history.json")
-            if history_file.exists():
-                with open(history_file, 'r') as f:
-                    history_data = json.load(f)
-                
+            if self._history_file.exists():
+                with open(self._history_file, 'rb') as f:
+                    history_data = _loads(f.read())
                 for tx_data in history_data.values():
-                    if tx_data["state"] == "committed":
-                        transaction = Transaction(
-                            transaction_id=tx_data["transaction_id"],
-                            state=TransactionState.COMMITTED,
-                            isolation_level=IsolationLevel(tx_data["isolation_level"]),
-                            created_at=datetime.fromisoformat(tx_data["created_at"]),
-                            committed_at=datetime.fromisoformat(tx_data["committed_at"]) if tx_data["committed_at"] else None
-                        )
-                        self.committed_transactions[transaction.transaction_id] = transaction
+                    self._restore_transaction(tx_data)
+            
+            if self._log_file.exists():
+                with open(self._log_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            tx_data = _loads(line)
+                        except ValueError:
+                            # Torn line from an interrupted append
+                            continue
+                        self._restore_transaction(tx_data)
+                        self._log_entries += 1
+            
+            evicted, self._evicted = self._evicted, []
+            self._archive_transactions(evicted)
         except Exception as e:
             print(f"Warning: Could not load transaction history: {e}")
     
-    def _save_transaction_history(self) -> None:
-        """Save transaction history to storage"""
+    def _restore_transaction(self, tx_data: Dict[str, Any]) -> None:
+        """Keep a committed transaction read from the history"""
+        if tx_data["state"] == TransactionState.COMMITTED.value:
+            self._remember_committed(Transaction.from_dict(tx_data))
+    
+    def _remember_committed(self, transaction: Transaction) -> None:
+        """Add a committed transaction to memory, queueing the oldest for the archive; called with the lock held"""
+        committed = self.committed_transactions
+        committed[transaction.transaction_id] = transaction
+        committed.move_to_end(transaction.transaction_id)
+        while len(committed) > MAX_CACHED_COMMITTED:
+            self._evicted.append(committed.popitem(last=False)[1])
+    
+    def _archive_transactions(self, transactions: List[Transaction]) -> None:
+        """Append evicted committed transactions to the archive; called with the log lock held"""
+        pending = [t for t in transactions if t.transaction_id not in self._archive_offsets]
+        if not pending:
+            return
+        if self._archive is None:
+            self._archive = _open_log(self._archive_file)
+        offset = self._archive.seek(0, os.SEEK_END)
+        for transaction in pending:
+            line = _dumps(transaction.to_dict()) + b"\n"
+            self._archive.write(line)
+            self._archive_offsets[transaction.transaction_id] = offset
+            offset += len(line)
+        self._archive.flush()
+    
+    def _load_archived_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Read an evicted committed transaction back from the archive"""
+        with self._lock:
+            for transaction in self._evicted:
+                if transaction.transaction_id == transaction_id:
+                    return transaction
+        
+        with self._log_lock:
+            offset = self._archive_offsets.get(transaction_id)
+            if offset is None:
+                return None
+            try:
+                if self._archive is None:
+                    self._archive = _open_log(self._archive_file)
+                self._archive.seek(offset)
+                return Transaction.from_dict(_loads(self._archive.readline()))
+            except Exception as e:
+                print(f"Warning: Could not read archived transaction {transaction_id}: {e}")
+                return None
+    
+    def _append_to_log(self, transaction: Transaction) -> None:
+        """Append a finished transaction to the transaction log as one JSON line"""
+        line = _dumps(transaction.to_dict()) + b"\n"
         try:
-            import os
-            from pathlib import Path
-            
-            history_dir = Path(f"{self.storage_path}/transactions")
-            history_dir.mkdir(parents=True, exist_ok=True)
-            
-            history_file = history_dir / "transaction_history.json"
-            
-            # Save both active and committed transactions
-            all_transactions = {**self.active_transactions, **self.committed_transactions}
-            
-            history_data = {}
-            for tx_id, transaction in all_transactions.items():
-                history_data[tx_id] = transaction.to_dict()
-            
-            with open(history_file, 'w') as f:
-                json.dump(history_data, f, indent=2, default=str)
+            with self._log_lock:
+                self._write_log_line(line)
         except Exception as e:
             print(f"Warning: Could not save transaction history: {e}")
+    
+    def _write_log_line(self, line: bytes) -> None:
+        """Write one log line and checkpoint when the log is long; called with the log lock held"""
+        if self._log is None:
+            self._log = _open_log(self._log_file)
+        self._log.write(line)
+        self._log.flush()
+        self._log_entries += 1
+        
+        if self._log_entries >= TRANSACTION_CHECKPOINT_INTERVAL:
+            self._checkpoint()
+    
+    def _checkpoint(self) -> None:
+        """Write committed transactions to a fresh snapshot and empty the transaction log"""
+        with self._lock:
+            history_data = {tx_id: transaction.to_dict()
+                            for tx_id, transaction in self.committed_transactions.items()}
+            evicted, self._evicted = self._evicted, []
+        
+        # Transactions dropped from memory must reach the archive before the
+        # log entries that still hold them are truncated
+        self._archive_transactions(evicted)
+        temp_file = self._history_file.with_suffix('.json.tmp')
+        with open(temp_file, 'wb') as f:
+            f.write(_dumps(history_data))
+        os.replace(temp_file, self._history_file)
+        
+        # Replaying entries already in the snapshot is harmless, so a crash
+        # before this truncate loses nothing
+        self._log.truncate(0)
+        self._log_entries = 0
 
 
 @contextmanager
@@ -5,8 +5,16 @@ Makes SpiraPi as easy to manage as other market databases
 2025 Technologies: Tailwind CSS 3.4, Alpine.js 3.x, HTMX, CSS Grid/Flexbox
 """
 
+import asyncio
+import csv
+import hashlib
+import io
 import os
+import re
 import sys
+import threading
+from datetime import date, time as dt_time
+from functools import lru_cache, singledispatch
 from pathlib import Path
 
 # Add src path to sys.path
@@ -20,10 +28,12 @@ for path in [project_root, src_dir]:
 
 try:
     from fastapi import FastAPI, HTTPException, Request, Form
-    from fastapi.responses import HTMLResponse, JSONResponse
+    from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
     from fastapi.staticfiles import StaticFiles
     from fastapi.templating import Jinja2Templates
     from loguru import logger
+    from jinja2 import FileSystemBytecodeCache
+    import httpx
 
     # Import existing SpiraPi modules
     from src.storage.spirapi_database import SpiraPiDatabase, StorageRecord, StorageType
@@ -34,7 +44,7 @@ try:
 
     import time
     import json
-    from typing import List, Dict, Any, Optional
+    from typing import List, Dict, Any, Iterator, Optional, Tuple
     from fastapi import Response
 
 except ImportError as e:
@@ -42,6 +52,11 @@ except ImportError as e:
     print("Please install: pip install fastapi uvicorn jinja2 python-multipart loguru")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize core components
 try:
     # Create a simple database instance for the web interface
@@ -56,46 +71,166 @@ except Exception as e:
     pi_engine = None
     semantic_indexer = None
 
+# JSON encoding shared by every API response
+@singledispatch
+def _coerce(obj):
+    """Convert a value the JSON encoder does not handle natively"""
+    if hasattr(obj, 'isoformat'):  # other datetime-like objects
+        return obj.isoformat()
+    if hasattr(obj, 'timestamp'):  # timestamp objects
+        return obj.timestamp()
+    if hasattr(obj, '__dict__'):  # custom objects
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+@_coerce.register(date)
+@_coerce.register(dt_time)
+def _coerce_temporal(obj):
+    # datetime is a date subclass, so it dispatches here without probing attributes
+    return obj.isoformat()
+
+class SpiraJSONResponse(JSONResponse):
+    """JSON response encoded in a single pass, with orjson when it is installed"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_coerce, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(content, default=_coerce, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _loads(text: str) -> Any:
+    """Parse a JSON form payload, with orjson when it is installed"""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def _ndjson_line(record: Any) -> bytes:
+    """Encode one record as a newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record, default=_coerce, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(record, default=_coerce, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
 app = FastAPI(
     title="SpiraPiWeb 2025",
     description="Modern web administration interface for SpiraPi, the π-based semantic-fractal database with native AI.",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=SpiraJSONResponse
 )
 
 # Configure Jinja2Templates
 templates_path = os.path.join(project_root, "src", "web", "templates")
 templates = Jinja2Templates(directory=templates_path)
-templates.env.auto_reload = True
+# Re-stat templates on every render only while developing (SPIRA_DEBUG=1)
+templates.env.auto_reload = os.environ.get("SPIRA_DEBUG") == "1"
+# Keep compiled templates on disk so restarts skip the parse/compile step
+templates.env.bytecode_cache = FileSystemBytecodeCache(pattern="spirapi-%s.cache")
+PRELOADED_TEMPLATES = (
+    "dashboard.html", "tables.html", "table_detail.html",
+    "query.html", "semantic.html", "stats.html", "error.html"
+)
 
 # Mount static files for assets
-from fastapi.staticfiles import StaticFiles
+# Seconds browsers may reuse an unversioned asset; content-hashed names are cached for good
+ASSET_MAX_AGE = 86400
+_HASHED_ASSET = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers skip revalidating assets between page loads"""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if _HASHED_ASSET.search(str(full_path)):
+            response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["cache-control"] = f"public, max-age={ASSET_MAX_AGE}"
+        return response
+
 # Use absolute path to assets directory
 assets_path = os.path.join(project_root, "assets")
-app.mount("/assets", StaticFiles(directory=assets_path), name="assets")
+app.mount("/assets", CachedStaticFiles(directory=assets_path), name="assets")
+
+# SpiraPi API used by the page helpers; one pooled client keeps connections alive across renders
+API_BASE_URL = "http://localhost:8000"
+API_TIMEOUT = 5
+# Seconds a browser may reuse a rendered admin page before revalidating it with its ETag
+PAGE_MAX_AGE = 2
+# Fields every table gets automatically; schema editing only exposes the others
+SYSTEM_FIELDS = frozenset({'id', 'created_at', 'updated_at'})
+# Rows written to the in-memory buffer between CSV export chunks
+CSV_EXPORT_CHUNK_ROWS = 1000
+# Records fetched for the table detail preview; the page header shows the full count
+TABLE_PREVIEW_LIMIT = 20
+# Seconds a schema list or health snapshot fetched from the API is reused across page renders
+API_CACHE_TTL = 2.0
+
+_api_cache: Dict[str, Any] = {}
+_api_cache_lock = threading.Lock()
+
+@app.on_event("startup")
+async def open_api_client():
+    """Open the shared SpiraPi API client"""
+    app.state.api_client = httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        timeout=API_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=32)
+    )
+
+@app.on_event("startup")
+async def preload_templates():
+    """Compile page templates before the first request"""
+    for template_name in PRELOADED_TEMPLATES:
+        templates.env.get_template(template_name)
+
+@app.on_event("shutdown")
+async def close_api_client():
+    """Close the shared SpiraPi API client"""
+    await app.state.api_client.aclose()
+
+@app.middleware("http")
+async def html_page_etag(request: Request, call_next):
+    """Tag rendered HTML pages so repeat loads can be answered with 304 Not Modified"""
+    response = await call_next(request)
+    if (request.method != "GET" or response.status_code != 200
+            or request.url.path.startswith("/assets")
+            or not response.headers.get("content-type", "").startswith("text/html")):
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    cache_headers = {"etag": etag, "cache-control": f"private, max-age={PAGE_MAX_AGE}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=cache_headers)
+    
+    headers = dict(response.headers)
+    headers.update(cache_headers)
+    return Response(content=body, status_code=response.status_code, headers=headers)
 
 # --- Helper Functions ---
-def make_json_serializable(obj):
-    """Convert object to JSON serializable format"""
-    if isinstance(obj, dict):
-        return {key: make_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [make_json_serializable(item) for item in obj]
-    elif hasattr(obj, 'isoformat'):  # datetime objects
-        return obj.isoformat()
-    elif hasattr(obj, 'timestamp'):  # timestamp objects
-        return obj.timestamp()
-    elif hasattr(obj, '__dict__'):  # custom objects
-        return make_json_serializable(obj.__dict__)
-    else:
-        return obj
+def _cached(key: str):
+    """Return a cached API result that is still fresh, or None"""
+    with _api_cache_lock:
+        entry = _api_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < API_CACHE_TTL:
+        return entry[1]
+    return None
 
-def get_available_schemas():
+def _cache(key: str, value):
+    """Store an API result in the page helper cache"""
+    with _api_cache_lock:
+        _api_cache[key] = (time.monotonic(), value)
+    return value
+
+def invalidate_api_cache():
+    """Drop cached schemas and stats after a table is created, changed or removed"""
+    with _api_cache_lock:
+        _api_cache.clear()
+
+
+async def get_available_schemas():
     """Get available schemas from SpiraPi API"""
+    cached = _cached("schemas")
+    if cached is not None:
+        return cached
     try:
-        # Récupérer les schémas depuis l'API SpiraPi de manière synchrone
-        import requests
-        
-        response = requests.get("http://localhost:8000/api/schemas", timeout=5)
+        # Récupérer les schémas depuis l'API SpiraPi sans bloquer la boucle d'événements
+        response = await app.state.api_client.get("/api/schemas")
         if response.status_code == 200:
             schemas = response.json()
             
@@ -110,7 +245,7 @@ def get_available_schemas():
                     'created_at': schema.get('created_at', 'N/A')
                 })
             
-            return formatted_schemas
+            return _cache("schemas", formatted_schemas)
         else:
             logger.warning(f"API returned status {response.status_code}")
             return []
@@ -120,20 +255,23 @@ def get_available_schemas():
         # Fallback: retourner une liste vide
         return []
 
-def get_system_stats():
+async def get_system_stats():
     """Get system statistics from SpiraPi API"""
+    cached = _cached("stats")
+    if cached is not None:
+        return cached
     try:
-        # Récupérer les statistiques depuis l'API SpiraPi de manière synchrone
-        import requests
-        
-        response = requests.get("http://localhost:8000/health", timeout=5)
+        # Récupérer la santé et les schémas en parallèle depuis l'API SpiraPi
+        response, schemas = await asyncio.gather(
+            app.state.api_client.get("/health"),
+            get_available_schemas()
+        )
         if response.status_code == 200:
             health_data = response.json()
         else:
             health_data = {}
         
         # Formater les statistiques pour l'interface web
-        schemas = get_available_schemas()
         
         stats = {
             'total_records': 0,  # TODO: Récupérer depuis l'API
@@ -154,39 +292,107 @@ def get_system_stats():
             'memory_usage': 0  # TODO: Récupérer depuis l'API
         }
         
-        return stats
+        return _cache("stats", stats)
     except Exception as e:
         logger.error(f"Error getting system stats from API: {e}")
         return {}
 
+@lru_cache(maxsize=128)
+def _parse_custom_fields(custom_fields: str) -> Tuple[Tuple[str, FieldType, bool, bool], ...]:
+    """Parse a custom_fields form payload into (name, type, required, unique) specs"""
+    fields_data = _loads(custom_fields)
+    return tuple(
+        (
+            field_data['name'],
+            getattr(FieldType, field_data.get('type', 'STRING')),
+            field_data.get('required', False),
+            field_data.get('unique', False)
+        )
+        for field_data in fields_data
+    )
+
+def table_exists(table_name: str) -> bool:
+    """Check a table against the schemas held in memory rather than stat'ing a file per request"""
+    return schema_manager is not None and schema_manager.has_schema(table_name)
+
+def get_table_record(table_name: str, record_id: str) -> Optional[StorageRecord]:
+    """Fetch a table record by key instead of scanning the METADATA store"""
+    record = spirapi_db.storage_engine.retrieve(record_id, StorageType.METADATA)
+    if record is None or record.metadata.get("table", table_name) != table_name:
+        return None
+    return record
+
+def iter_table_records(table_name: str) -> Iterator[Dict[str, Any]]:
+    """Yield the payloads of a table's records one at a time"""
+    storage_engine = spirapi_db.storage_engine
+    for record_id in storage_engine.search_ids({"table": table_name}, StorageType.METADATA):
+        record = storage_engine.retrieve(record_id, StorageType.METADATA)
+        if record is not None and isinstance(record.data, dict):
+            # Records are shared with the engine cache, so add the ID to a copy
+            yield {**record.data, 'id': record.id}
+
+def _csv_chunks(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Write rows as CSV, yielding the text every CSV_EXPORT_CHUNK_ROWS rows"""
+    output = io.StringIO()
+    writer = None
+    for count, row in enumerate(rows, 1):
+        if writer is None:
+            # Columns come from the first record, as before; later extra keys are dropped
+            writer = csv.DictWriter(output, fieldnames=list(row.keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        if count % CSV_EXPORT_CHUNK_ROWS == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue()
+
 def get_breadcrumbs(path: str) -> List[Dict[str, str]]:
     """Generate breadcrumbs for navigation"""
+    breadcrumbs = _STATIC_BREADCRUMBS.get(path)
+    if breadcrumbs is None:
+        breadcrumbs = _build_breadcrumbs(path)
+    return breadcrumbs
+
+@lru_cache(maxsize=512)
+def _build_breadcrumbs(path: str) -> List[Dict[str, str]]:
+    """Build the breadcrumb trail for a path (results are shared, do not mutate)"""
     breadcrumbs = [{"name": "Home", "url": "/"}]
     
     if path == "/":
         return breadcrumbs
     
     path_parts = path.strip("/").split("/")
-    current_path = ""
     
-    for part in path_parts:
-        current_path += f"/{part}"
-        if part == "tables" and len(path_parts) > 1:
-            breadcrumbs.append({"name": "Tables", "url": "/tables"})
-        elif part != "tables":
-            # Capitalize and format part names
-            name = part.replace("_", " ").title()
-            breadcrumbs.append({"name": name, "url": current_path})
+    for i, part in enumerate(path_parts, 1):
+        if part == "tables":
+            if len(path_parts) > 1:
+                breadcrumbs.append({"name": "Tables", "url": "/tables"})
+        else:
+            breadcrumbs.append({"name": _breadcrumb_title(part), "url": "/" + "/".join(path_parts[:i])})
     
     return breadcrumbs
 
+@lru_cache(maxsize=256)
+def _breadcrumb_title(part: str) -> str:
+    """Capitalize and format a path segment for display"""
+    return part.replace("_", " ").title()
+
+# Breadcrumbs of the top-level pages never change, so they are built once at import time
+_STATIC_BREADCRUMBS = {
+    path: _build_breadcrumbs(path)
+    for path in ("/", "/tables", "/query", "/semantic", "/stats")
+}
+
 # --- Web Routes (HTML Responses) ---
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Main dashboard"""
     try:
-        system_stats = get_system_stats()
-        tables = get_available_schemas()
+        # Stats fetch /health and /api/schemas concurrently; the table list is then a cache hit
+        system_stats = await get_system_stats()
+        tables = await get_available_schemas()
         breadcrumbs = get_breadcrumbs("/")
         
         return templates.TemplateResponse("dashboard.html", {
@@ -208,7 +414,7 @@ async def dashboard(request: Request):
 async def tables_management(request: Request):
     """Tables management"""
     try:
-        tables_list = get_available_schemas()
+        tables_list = await get_available_schemas()
         breadcrumbs = get_breadcrumbs("/tables")
         
         return templates.TemplateResponse("tables.html", {
@@ -236,55 +442,26 @@ async def table_detail(request: Request, table_name: str):
         if not schema:
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
-        # S'assurer que le schéma a le bon format pour le template
-        if hasattr(schema, 'fields'):
-            # Convertir les champs en format utilisable par le template
-            formatted_fields = []
-            
-            # Handle both dict and list formats for schema fields
-            if isinstance(schema.fields, dict):
-                # Original format: fields is a dictionary
-                for field_name, field in schema.fields.items():
-                    if hasattr(field, 'field_type'):
-                        formatted_fields.append({
-                            'name': field.name,
-                            'field_type': field.field_type,
-                            'description': getattr(field, 'description', ''),
-                            'is_required': getattr(field, 'is_required', False),
-                            'is_unique': getattr(field, 'is_unique', False),
-                            'default_value': getattr(field, 'default_value', None)
-                        })
-                    else:
-                        # Fallback si le champ n'a pas le bon format
-                        formatted_fields.append({
-                            'name': field_name,
-                            'field_type': type(field).__name__,
-                            'description': str(field),
-                            'is_required': False,
-                            'is_unique': False,
-                            'default_value': None
-                        })
-            elif isinstance(schema.fields, list):
-                # Already in list format, just use as is
-                formatted_fields = schema.fields
-            else:
-                # Unknown format, create empty list
-                formatted_fields = []
-                
-            schema.fields = formatted_fields
+        # Le template lit directement les attributs des SchemaField ; le schéma partagé n'est pas modifié
+        fields = schema.fields.values() if isinstance(schema.fields, dict) else schema.fields
         
         # Get real data from the API
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"http://localhost:8000/api/tables/{table_name}/records?limit=100")
-                if response.status_code == 200:
-                    table_data = response.json()
-                    total_records = len(table_data)
-                else:
-                    # Fallback to empty data if API fails
-                    table_data = []
-                    total_records = 0
+            # The true row count and a short preview are fetched concurrently
+            client = request.app.state.api_client
+            count_response, response = await asyncio.gather(
+                client.get(f"/api/tables/{table_name}/count"),
+                client.get(f"/api/tables/{table_name}/records", params={"limit": TABLE_PREVIEW_LIMIT})
+            )
+            if response.status_code == 200:
+                table_data = response.json()
+            else:
+                # Fallback to empty data if API fails
+                table_data = []
+            if count_response.status_code == 200:
+                total_records = count_response.json()["count"]
+            else:
+                total_records = len(table_data)
         except Exception as e:
             logger.warning(f"Could not fetch real data for table {table_name}: {e}")
             # Fallback to empty data
@@ -297,6 +474,7 @@ async def table_detail(request: Request, table_name: str):
             "request": request,
             "table_name": table_name,
             "schema": schema,
+            "fields": fields,
             "table_data": table_data,
             "total_records": total_records,
             "breadcrumbs": breadcrumbs,
@@ -322,7 +500,7 @@ async def table_detail(request: Request, table_name: str):
 async def query_interface(request: Request):
     """Query interface"""
     try:
-        tables = get_available_schemas()
+        tables = await get_available_schemas()
         breadcrumbs = get_breadcrumbs("/query")
         
         return templates.TemplateResponse("query.html", {
@@ -343,7 +521,7 @@ async def query_interface(request: Request):
 async def semantic_search_interface(request: Request):
     """Semantic search interface"""
     try:
-        tables = get_available_schemas()
+        tables = await get_available_schemas()
         breadcrumbs = get_breadcrumbs("/semantic")
         
         return templates.TemplateResponse("semantic.html", {
@@ -364,7 +542,7 @@ async def semantic_search_interface(request: Request):
 async def stats_interface(request: Request):
     """Statistics interface"""
     try:
-        stats_data = get_system_stats()
+        stats_data = await get_system_stats()
         breadcrumbs = get_breadcrumbs("/stats")
         
         return templates.TemplateResponse("stats.html", {
@@ -382,16 +560,17 @@ async def stats_interface(request: Request):
         }, status_code=500)
 
 # --- API Endpoints (JSON Responses) ---
-@app.post("/api/tables", response_class=JSONResponse)
-async def create_table_api(request: Request, name: str = Form(...), description: Optional[str] = Form(None), custom_fields: Optional[str] = Form(None)):
+# Endpoints doing blocking schema/storage I/O are plain `def`, so FastAPI runs them in its threadpool
+@app.post("/api/tables", response_class=SpiraJSONResponse)
+def create_table_api(request: Request, name: str = Form(...), description: Optional[str] = Form(None), custom_fields: Optional[str] = Form(None)):
     """API to create a new table"""
     try:
         if not schema_manager:
             raise HTTPException(status_code=500, detail="Schema manager not available")
         
         # Check if schema already exists
-        if schema_manager.get_schema(name):
-            return JSONResponse(status_code=400, content={"status": "error", "message": f"Table '{name}' already exists."})
+        if schema_manager.has_schema(name):
+            return SpiraJSONResponse(status_code=400, content={"status": "error", "message": f"Table '{name}' already exists."})
 
         # Create default fields for new tables
         default_fields = [
@@ -403,17 +582,14 @@ async def create_table_api(request: Request, name: str = Form(...), description:
         # Add custom fields if provided
         if custom_fields:
             try:
-                custom_fields_data = json.loads(custom_fields)
-                for field_data in custom_fields_data:
-                    field_type = getattr(FieldType, field_data.get('type', 'STRING'))
-                    custom_field = SchemaField(
-                        name=field_data['name'],
+                for field_name, field_type, is_required, is_unique in _parse_custom_fields(custom_fields):
+                    default_fields.append(SchemaField(
+                        name=field_name,
                         field_type=field_type,
-                        is_required=field_data.get('required', False),
-                        is_unique=field_data.get('unique', False),
-                        description=f"Custom field: {field_data['name']}"
-                    )
-                    default_fields.append(custom_field)
+                        is_required=is_required,
+                        is_unique=is_unique,
+                        description=f"Custom field: {field_name}"
+                    ))
             except (json.JSONDecodeError, KeyError, AttributeError) as e:
                 logger.warning(f"Failed to parse custom fields: {e}")
         
@@ -427,29 +603,34 @@ async def create_table_api(request: Request, name: str = Form(...), description:
         )
         
         schema_manager.create_schema(new_schema.name, new_schema.zone, default_fields)
+        invalidate_api_cache()
         
-        return JSONResponse(status_code=201, content={"status": "success", "message": f"Table '{name}' created successfully."})
+        return SpiraJSONResponse(status_code=201, content={"status": "success", "message": f"Table '{name}' created successfully."})
     except Exception as e:
         logger.error(f"Error creating table '{name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
 # --- API Endpoints pour les données des tables ---
-@app.get("/api/tables/{table_name}/data", response_class=JSONResponse)
-async def get_table_data_api(request: Request, table_name: str, limit: int = 100):
+@app.get("/api/tables/{table_name}/data", response_class=SpiraJSONResponse)
+def get_table_data_api(request: Request, table_name: str, limit: int = 100, format: Optional[str] = None):
     """API pour récupérer les données d'une table"""
     try:
         if not schema_manager:
             raise HTTPException(status_code=500, detail="Schema manager not available")
         
         # Vérifier que la table existe
-        schema = schema_manager.get_schema(table_name)
-        if not schema:
+        if not schema_manager.has_schema(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
+        # Clients that ask for NDJSON get a stream that never holds every record at once
+        if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+            rows = schema_manager.iter_records(table_name, limit=limit)
+            return StreamingResponse(map(_ndjson_line, rows), media_type="application/x-ndjson")
+        
         # Récupérer les données directement via le schema manager
         try:
             records = schema_manager.get_records(table_name, limit=limit)
-            return JSONResponse(status_code=200, content={
+            return SpiraJSONResponse(status_code=200, content={
                 "status": "success",
                 "table_name": table_name,
                 "data": records,
@@ -457,29 +638,28 @@ async def get_table_data_api(request: Request, table_name: str, limit: int = 100
             })
         except Exception as e:
             logger.error(f"Error retrieving data: {e}")
-            return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+            return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
         
     except Exception as e:
         logger.error(f"Error getting data for table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status_code": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status_code": "error", "message": str(e)})
 
-@app.post("/api/tables/{table_name}/data", response_class=JSONResponse)
-async def create_record_api(request: Request, table_name: str, record_data: str = Form(...)):
+@app.post("/api/tables/{table_name}/data", response_class=SpiraJSONResponse)
+def create_record_api(request: Request, table_name: str, record_data: str = Form(...)):
     """API pour créer un nouvel enregistrement"""
     try:
         if not schema_manager:
             raise HTTPException(status_code=500, detail="Schema manager not available")
         
         # Vérifier que la table existe
-        schema = schema_manager.get_schema(table_name)
-        if not schema:
+        if not schema_manager.has_schema(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Parser les données
         try:
-            data = json.loads(record_data)
+            data = _loads(record_data)
         except json.JSONDecodeError:
-            return JSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data"})
+            return SpiraJSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data"})
         
         # Créer l'enregistrement directement via le schema manager
         try:
@@ -496,7 +676,7 @@ async def create_record_api(request: Request, table_name: str, record_data: str
             # Créer l'enregistrement
             record_id = schema_manager.create_record(table_name, data)
             
-            return JSONResponse(status_code=201, content={
+            return SpiraJSONResponse(status_code=201, content={
                 "status": "success",
                 "message": f"Record created successfully",
                 "record_id": record_id
@@ -504,13 +684,13 @@ async def create_record_api(request: Request, table_name: str, record_data: str
             
         except Exception as e:
             logger.error(f"Error creating record: {e}")
-            return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+            return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
         
     except Exception as e:
         logger.error(f"Error creating record in table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.put("/api/tables/{table_name}/data/{record_id}", response_class=JSONResponse)
+@app.put("/api/tables/{table_name}/data/{record_id}", response_class=SpiraJSONResponse)
 async def update_record_api(request: Request, table_name: str, record_id: str, record_data: str = Form(...)):
     """API pour mettre à jour un enregistrement"""
     try:
@@ -518,43 +698,41 @@ async def update_record_api(request: Request, table_name: str, record_id: str, r
             raise HTTPException(status_code=500, detail="Schema manager not available")
         
         # Vérifier que la table existe
-        schema = schema_manager.get_schema(table_name)
-        if not schema:
+        if not schema_manager.has_schema(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Parser les données
         try:
-            data = json.loads(record_data)
+            data = _loads(record_data)
         except json.JSONDecodeError:
-            return JSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data"})
+            return SpiraJSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data"})
         
         # Mettre à jour l'enregistrement via l'API
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"http://localhost:8000/api/tables/{table_name}/records/{record_id}",
-                    json={"data": data}
-                )
-                if response.status_code == 200:
-                    return JSONResponse(status_code=200, content={
-                        "status": "success",
-                        "message": f"Record updated successfully"
-                    })
-                else:
-                    return JSONResponse(status_code=response.status_code, content={
-                        "status": "error",
-                        "message": f"Failed to update record: {response.text}"
-                    })
+            client = request.app.state.api_client
+            response = await client.put(
+                f"/api/tables/{table_name}/records/{record_id}",
+                json={"data": data}
+            )
+            if response.status_code == 200:
+                return SpiraJSONResponse(status_code=200, content={
+                    "status": "success",
+                    "message": f"Record updated successfully"
+                })
+            else:
+                return SpiraJSONResponse(status_code=response.status_code, content={
+                    "status": "error",
+                    "message": f"Failed to update record: {response.text}"
+                })
         except Exception as e:
             logger.error(f"Error updating record via API: {e}")
-            return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+            return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
         
     except Exception as e:
         logger.error(f"Error updating record '{record_id}' in table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.delete("/api/tables/{table_name}/data/{record_id}", response_class=JSONResponse)
+@app.delete("/api/tables/{table_name}/data/{record_id}", response_class=SpiraJSONResponse)
 async def delete_record_api(request: Request, table_name: str, record_id: str):
     """API pour supprimer un enregistrement"""
     try:
@@ -562,36 +740,34 @@ async def delete_record_api(request: Request, table_name: str, record_id: str):
             raise HTTPException(status_code=500, detail="Schema manager not available")
         
         # Vérifier que la table existe
-        schema = schema_manager.get_schema(table_name)
-        if not schema:
+        if not schema_manager.has_schema(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Supprimer l'enregistrement via l'API
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(f"http://localhost:8000/api/tables/{table_name}/records/{record_id}")
-                if response.status_code == 200:
-                    return JSONResponse(status_code=200, content={
-                        "status": "success",
-                        "message": f"Record deleted successfully"
-                    })
-                else:
-                    return JSONResponse(status_code=response.status_code, content={
-                        "status": "error",
-                        "message": f"Failed to delete record: {response.text}"
-                    })
+            client = request.app.state.api_client
+            response = await client.delete(f"/api/tables/{table_name}/records/{record_id}")
+            if response.status_code == 200:
+                return SpiraJSONResponse(status_code=200, content={
+                    "status": "success",
+                    "message": f"Record deleted successfully"
+                })
+            else:
+                return SpiraJSONResponse(status_code=response.status_code, content={
+                    "status": "error",
+                    "message": f"Failed to delete record: {response.text}"
+                })
         except Exception as e:
             logger.error(f"Error deleting record via API: {e}")
-            return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+            return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
         
     except Exception as e:
         logger.error(f"Error deleting record '{record_id}' from table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
 # --- API Endpoints pour la gestion des tables ---
-@app.put("/api/tables/{table_name}", response_class=JSONResponse)
-async def update_table_api(request: Request, table_name: str, name: str = Form(...), description: Optional[str] = Form(None)):
+@app.put("/api/tables/{table_name}", response_class=SpiraJSONResponse)
+def update_table_api(request: Request, table_name: str, name: str = Form(...), description: Optional[str] = Form(None)):
     """API to update an existing table"""
     try:
         if not schema_manager:
@@ -603,8 +779,8 @@ async def update_table_api(request: Request, table_name: str, name: str = Form(.
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Check if new name conflicts with existing table
-        if name != table_name and schema_manager.get_schema(name):
-            return JSONResponse(status_code=400, content={"status": "error", "message": f"Table name '{name}' already exists."})
+        if name != table_name and schema_manager.has_schema(name):
+            return SpiraJSONResponse(status_code=400, content={"status": "error", "message": f"Table name '{name}' already exists."})
         
         # Update schema metadata
         if hasattr(existing_schema, 'metadata'):
@@ -619,25 +795,25 @@ async def update_table_api(request: Request, table_name: str, name: str = Form(.
         
         # Persist changes
         schema_manager._persist_schema(existing_schema)
+        invalidate_api_cache()
         
-        return JSONResponse(status_code=200, content={"status": "success", "message": f"Table '{table_name}' updated successfully."})
+        return SpiraJSONResponse(status_code=200, content={"status": "success", "message": f"Table '{table_name}' updated successfully."})
     except HTTPException as e:
         logger.error(f"HTTP Error updating table '{table_name}': {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error updating table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.delete("/api/tables/{table_name}", response_class=JSONResponse)
-async def delete_table_api(request: Request, table_name: str):
+@app.delete("/api/tables/{table_name}", response_class=SpiraJSONResponse)
+def delete_table_api(request: Request, table_name: str):
     """API to delete a table"""
     try:
         if not schema_manager:
             raise HTTPException(status_code=500, detail="Schema manager not available")
         
-        # Check if table exists by checking schema file
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        # Check if table exists
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Try to delete the schema from schema manager (but don't fail if it doesn't work)
@@ -646,55 +822,39 @@ async def delete_table_api(request: Request, table_name: str):
         except Exception as e:
             logger.warning(f"Could not delete schema '{table_name}' from schema manager: {e}")
         
-        # Also delete the physical schema file
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if schema_file.exists():
-            try:
-                schema_file.unlink()
-                logger.info(f"Deleted physical schema file: {schema_file}")
-            except Exception as e:
-                logger.warning(f"Could not delete physical schema file {schema_file}: {e}")
-        
         # Delete all data records associated with this table
         if spirapi_db:
             try:
-                # Search for all records in this table
-                records = spirapi_db.storage_engine.search(
+                # Delete every record of this table in one batch
+                deleted_count = spirapi_db.storage_engine.delete_matching(
                     query={"table": table_name}, data_type=StorageType.METADATA
                 )
                 
-                # Delete each record
-                deleted_count = 0
-                for record in records:
-                    if hasattr(record, 'id'):
-                        if spirapi_db.storage_engine.delete(record.id):
-                            deleted_count += 1
-                
                 logger.info(f"Deleted {deleted_count} data records from table '{table_name}'")
             except Exception as e:
                 logger.warning(f"Could not delete all data records for table '{table_name}': {e}")
         
-        return JSONResponse(status_code=200, content={"status": "success", "message": f"Table '{table_name}' deleted successfully."})
+        invalidate_api_cache()
+        return SpiraJSONResponse(status_code=200, content={"status": "success", "message": f"Table '{table_name}' deleted successfully."})
     except HTTPException as e:
         logger.error(f"HTTP Error deleting table '{table_name}': {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error deleting table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.post("/api/data", response_class=JSONResponse)
-async def insert_data_api(request: Request, table_name: str = Form(...), data: str = Form(...)):
+@app.post("/api/data", response_class=SpiraJSONResponse)
+def insert_data_api(request: Request, table_name: str = Form(...), data: str = Form(...)):
     """API to insert data into a table"""
     try:
         if not spirapi_db:
             raise HTTPException(status_code=500, detail="SpiraPi database not available")
         
-        # Check if table exists by checking schema file
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        # Check if table exists
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
 
-        data_dict = json.loads(data)
+        data_dict = _loads(data)
         
         # Generate π-ID if not provided
         if "id" not in data_dict:
@@ -719,26 +879,25 @@ async def insert_data_api(request: Request, table_name: str = Form(...), data: s
         
         spirapi_db.storage_engine.store(record)
         
-        return JSONResponse(status_code=201, content={"status": "success", "message": "Data inserted successfully.", "pi_id": data_dict["id"]})
+        return SpiraJSONResponse(status_code=201, content={"status": "success", "message": "Data inserted successfully.", "pi_id": data_dict["id"]})
     except json.JSONDecodeError:
-        return JSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data provided."})
+        return SpiraJSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data provided."})
     except HTTPException as e:
         logger.error(f"HTTP Error inserting data into {table_name}: {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error inserting data into {table_name}: {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.get("/api/data/{table_name}", response_class=JSONResponse)
-async def get_table_data_api(request: Request, table_name: str):
+@app.get("/api/data/{table_name}", response_class=SpiraJSONResponse)
+def get_table_data_api(request: Request, table_name: str):
     """API to get all data from a table"""
     try:
         if not spirapi_db:
             raise HTTPException(status_code=500, detail="SpiraPi database not available")
         
         # Check if table exists
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Get all records for this table
@@ -746,7 +905,7 @@ async def get_table_data_api(request: Request, table_name: str):
             query={"table": table_name}, data_type=StorageType.METADATA
         )
         
-        # Convert records to JSON-serializable format
+        # Collect record payloads; SpiraJSONResponse encodes them in one pass
         data = []
         for record in records:
             if hasattr(record, 'data'):
@@ -755,87 +914,69 @@ async def get_table_data_api(request: Request, table_name: str):
                     # Ensure we have the record ID
                     if hasattr(record, 'id'):
                         record_data['id'] = record.id
-                    # Make data JSON serializable
-                    serializable_data = make_json_serializable(record_data)
-                    data.append(serializable_data)
+                    data.append(record_data)
         
-        return JSONResponse(status_code=200, content={
+        return SpiraJSONResponse(status_code=200, content={
             "status": "success", 
             "data": data,
             "total": len(data)
         })
     except HTTPException as e:
         logger.error(f"HTTP Error getting data from {table_name}: {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error getting data from {table_name}: {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.get("/api/data/{table_name}/{record_id}", response_class=JSONResponse)
-async def get_record_api(request: Request, table_name: str, record_id: str):
+@app.get("/api/data/{table_name}/{record_id}", response_class=SpiraJSONResponse)
+def get_record_api(request: Request, table_name: str, record_id: str):
     """API to get a specific record by ID"""
     try:
         if not spirapi_db:
             raise HTTPException(status_code=500, detail="SpiraPi database not available")
         
         # Check if table exists
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
-        # Search for the specific record
-        records = spirapi_db.storage_engine.search(
-            query={"id": record_id, "table": table_name}, data_type=StorageType.METADATA
-        )
+        # Look up the specific record by key
+        record = get_table_record(table_name, record_id)
         
-        if not records:
+        if record is None:
             raise HTTPException(status_code=404, detail=f"Record '{record_id}' not found in table '{table_name}'")
         
-        record = records[0]
-        record_data = record.data if hasattr(record, 'data') else {}
-        if hasattr(record, 'id'):
-            record_data['id'] = record.id
-        
-        # Make data JSON serializable
-        serializable_data = make_json_serializable(record_data)
+        record_data = {**record.data, 'id': record.id}
         
-        return JSONResponse(status_code=200, content={
+        return SpiraJSONResponse(status_code=200, content={
             "status": "success", 
-            "data": serializable_data
+            "data": record_data
         })
     except HTTPException as e:
         logger.error(f"HTTP Error getting record {record_id} from {table_name}: {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error getting record {record_id} from {table_name}: {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.put("/api/data/{table_name}/{record_id}", response_class=JSONResponse)
-async def update_record_api(request: Request, table_name: str, record_id: str, data: str = Form(...)):
+@app.put("/api/data/{table_name}/{record_id}", response_class=SpiraJSONResponse)
+def update_record_api(request: Request, table_name: str, record_id: str, data: str = Form(...)):
     """API to update a specific record"""
     try:
         if not spirapi_db:
             raise HTTPException(status_code=500, detail="SpiraPi database not available")
         
         # Check if table exists
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
         # Parse update data
-        update_data = json.loads(data)
+        update_data = _loads(data)
         update_data["updated_at"] = time.time()
         
-        # Search for the existing record
-        existing_records = spirapi_db.storage_engine.search(
-            query={"id": record_id, "table": table_name}, data_type=StorageType.METADATA
-        )
-        
-        if not existing_records:
+        # Check the record exists with a keyed lookup
+        if get_table_record(table_name, record_id) is None:
             raise HTTPException(status_code=404, detail=f"Record '{record_id}' not found in table '{table_name}'")
         
-        existing_record = existing_records[0]
-        
         # Create updated record
         updated_record = StorageRecord(
             id=record_id,
@@ -849,110 +990,76 @@ async def update_record_api(request: Request, table_name: str, record_id: str, d
         # Store updated record (this will replace the old one)
         spirapi_db.storage_engine.store(updated_record)
         
-        return JSONResponse(status_code=200, content={
+        return SpiraJSONResponse(status_code=200, content={
             "status": "success", 
             "message": f"Record '{record_id}' updated successfully"
         })
     except json.JSONDecodeError:
-        return JSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data provided."})
+        return SpiraJSONResponse(status_code=400, content={"status": "error", "message": "Invalid JSON data provided."})
     except HTTPException as e:
         logger.error(f"HTTP Error updating record {record_id} in {table_name}: {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error updating record {record_id} in {table_name}: {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.delete("/api/data/{table_name}/{record_id}", response_class=JSONResponse)
-async def delete_record_api(request: Request, table_name: str, record_id: str):
+@app.delete("/api/data/{table_name}/{record_id}", response_class=SpiraJSONResponse)
+def delete_record_api(request: Request, table_name: str, record_id: str):
     """API to delete a specific record"""
     try:
         if not spirapi_db:
             raise HTTPException(status_code=500, detail="SpiraPi database not available")
         
         # Check if table exists
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
-        # Search for the record to delete
-        existing_records = spirapi_db.storage_engine.search(
-            query={"id": record_id, "table": table_name}, data_type=StorageType.METADATA
-        )
-        
-        if not existing_records:
+        # Check the record belongs to this table with a keyed lookup
+        if get_table_record(table_name, record_id) is None:
             raise HTTPException(status_code=404, detail=f"Record '{record_id}' not found in table '{table_name}'")
         
         # Delete the record
-        success = spirapi_db.storage_engine.delete(record_id)
+        success = spirapi_db.storage_engine.delete(record_id, StorageType.METADATA)
         
         if not success:
-            return JSONResponse(status_code=500, content={
+            return SpiraJSONResponse(status_code=500, content={
                 "status": "error", 
                 "message": f"Failed to delete record '{record_id}'"
             })
         
-        return JSONResponse(status_code=200, content={
+        return SpiraJSONResponse(status_code=200, content={
             "status": "success", 
             "message": f"Record '{record_id}' deleted successfully"
         })
     except HTTPException as e:
         logger.error(f"HTTP Error deleting record {record_id} from {table_name}: {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error deleting record {record_id} from {table_name}: {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.get("/api/export/{table_name}", response_class=JSONResponse)
-async def export_table_data_api(request: Request, table_name: str, format: str = "json"):
+@app.get("/api/export/{table_name}", response_class=SpiraJSONResponse)
+def export_table_data_api(request: Request, table_name: str, format: str = "json"):
     """API to export table data in various formats"""
     try:
         if not spirapi_db:
             raise HTTPException(status_code=500, detail="SpiraPi database not available")
         
         # Check if table exists
-        schema_file = Path(f"data/schema/data/{table_name}.dat")
-        if not schema_file.exists():
+        if not table_exists(table_name):
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
-        # Get all records for this table
-        records = spirapi_db.storage_engine.search(
-            query={"table": table_name}, data_type=StorageType.METADATA
-        )
-        
-        # Convert records to exportable format
-        data = []
-        for record in records:
-            if hasattr(record, 'data'):
-                record_data = record.data
-                if isinstance(record_data, dict):
-                    if hasattr(record, 'id'):
-                        record_data['id'] = record.id
-                    # Make data JSON serializable
-                    serializable_data = make_json_serializable(record_data)
-                    data.append(serializable_data)
-        
         if format.lower() == "csv":
-            # Convert to CSV format
-            import csv
-            import io
-            
-            output = io.StringIO()
-            if data:
-                writer = csv.DictWriter(output, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
-            
-            csv_content = output.getvalue()
-            output.close()
-            
-            return Response(
-                content=csv_content,
+            # Stream CSV in chunks so the export never holds the whole table as text
+            return StreamingResponse(
+                _csv_chunks(iter_table_records(table_name)),
                 media_type="text/csv",
                 headers={"Content-Disposition": f"attachment; filename={table_name}_export.csv"}
             )
         else:
             # Default to JSON
-            return JSONResponse(status_code=200, content={
+            data = list(iter_table_records(table_name))
+            return SpiraJSONResponse(status_code=200, content={
                 "status": "success", 
                 "data": data,
                 "total": len(data),
@@ -960,13 +1067,13 @@ async def export_table_data_api(request: Request, table_name: str, format: str =
             })
     except HTTPException as e:
         logger.error(f"HTTP Error exporting data from {table_name}: {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error exporting data from {table_name}: {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.get("/api/tables/{table_name}/schema", response_class=JSONResponse)
-async def get_table_schema_api(request: Request, table_name: str):
+@app.get("/api/tables/{table_name}/schema", response_class=SpiraJSONResponse)
+def get_table_schema_api(request: Request, table_name: str):
     """API to get table schema fields"""
     try:
         if not schema_manager:
@@ -977,55 +1084,53 @@ async def get_table_schema_api(request: Request, table_name: str):
         if not existing_schema:
             raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
         
-        # Convert schema fields to serializable format
-        fields = []
-        
-        # Handle both dict and list formats for schema fields
-        if isinstance(existing_schema.fields, dict):
+        # Convert schema fields to serializable format, skipping default system fields
+        schema_fields = existing_schema.fields
+        if isinstance(schema_fields, dict):
             # Original format: fields is a dictionary
-            for field_name, field in existing_schema.fields.items():
-                # Skip default system fields
-                if field_name in ['id', 'created_at', 'updated_at']:
-                    continue
-                    
-                fields.append({
+            fields = [
+                {
                     'name': field.name,
                     'type': field.field_type.name,
                     'required': field.is_required,
                     'unique': field.is_unique,
                     'description': field.description,
                     'default_value': field.default_value
-                })
-        elif isinstance(existing_schema.fields, list):
-            # Modified format: fields is a list (from table_detail)
-            for field in existing_schema.fields:
-                # Skip default system fields
-                if field.get('name') in ['id', 'created_at', 'updated_at']:
-                    continue
-                    
-                fields.append({
+                }
+                for field_name, field in schema_fields.items()
+                if field_name not in SYSTEM_FIELDS
+            ]
+        elif isinstance(schema_fields, list):
+            # Modified format: fields is a list of dicts (written by older table_detail renders)
+            fields = [
+                {
                     'name': field.get('name', ''),
-                    'type': field.get('field_type', {}).name if hasattr(field.get('field_type'), 'name') else 'STRING',
+                    'type': getattr(field.get('field_type'), 'name', 'STRING'),
                     'required': field.get('is_required', False),
                     'unique': field.get('is_unique', False),
                     'description': field.get('description', ''),
                     'default_value': field.get('default_value', None)
-                })
+                }
+                for field in schema_fields
+                if field.get('name') not in SYSTEM_FIELDS
+            ]
+        else:
+            fields = []
         
-        return JSONResponse(status_code=200, content={
+        return SpiraJSONResponse(status_code=200, content={
             "status": "success",
             "table_name": table_name,
             "fields": fields
         })
     except HTTPException as e:
         logger.error(f"HTTP Error getting schema for table '{table_name}': {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error getting schema for table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
-@app.put("/api/tables/{table_name}/schema", response_class=JSONResponse)
-async def update_table_schema_api(request: Request, table_name: str, fields: str = Form(...)):
+@app.put("/api/tables/{table_name}/schema", response_class=SpiraJSONResponse)
+def update_table_schema_api(request: Request, table_name: str, fields: str = Form(...)):
     """API to update table schema fields"""
     try:
         if not schema_manager:
@@ -1038,20 +1143,14 @@ async def update_table_schema_api(request: Request, table_name: str, fields: str
         
         # Parse fields data
         try:
-            fields_data = json.loads(fields)
+            fields_data = _loads(fields)
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid fields data format")
         
-        # Clear existing custom fields (keep only essential system fields)
-        system_fields = ['id', 'created_at', 'updated_at']
-        
-        # Always get the original schema from schema_manager to ensure we work with the correct format
-        original_schema = schema_manager.get_schema(table_name)
-        if not original_schema:
-            raise HTTPException(status_code=500, detail="Could not retrieve original schema")
+        # The schema looked up above is the one held by schema_manager
+        original_schema = existing_schema
         
         # Create a new schema instance to avoid modifying the original
-        from src.storage.schema_manager import AdaptiveSchema
         new_schema = AdaptiveSchema(name=table_name, version=original_schema.version if hasattr(original_schema, 'version') else 1)
         
         # Clean up any existing phantom fields by starting fresh
@@ -1099,17 +1198,18 @@ async def update_table_schema_api(request: Request, table_name: str, fields: str
         
         # Update the schema manager's cache
         schema_manager.schemas[table_name] = new_schema
+        invalidate_api_cache()
         
-        return JSONResponse(status_code=200, content={
+        return SpiraJSONResponse(status_code=200, content={
             "status": "success", 
             "message": f"Schema for table '{table_name}' updated successfully."
         })
     except HTTPException as e:
         logger.error(f"HTTP Error updating schema for table '{table_name}': {e.detail}")
-        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
+        return SpiraJSONResponse(status_code=e.status_code, content={"status": "error", "message": e.detail})
     except Exception as e:
         logger.error(f"Error updating schema for table '{table_name}': {e}")
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        return SpiraJSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
 if __name__ == "__main__":
     import uvicorn
@@ -1117,10 +1217,15 @@ if __name__ == "__main__":
     print("📱 Web Interface: http://localhost:8001")
     print("📚 API docs: http://localhost:8001/docs")
     
+    # The file watcher only runs in debug; uvicorn's "auto" loop/http pick uvloop and httptools when installed.
+    # A single worker: the storage engine locks ./data, so other worker processes could not open it.
+    debug = os.environ.get("SPIRA_DEBUG") == "1"
     uvicorn.run(
         "src.web.admin_interface:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
+        reload=debug,
+        loop="auto",
+        http="auto",
         log_level="info"
     )
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests de la validation des contraintes SpiraPi
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.storage.constraints import (
+    CheckConstraint, ConstraintManager, ConstraintType, ConstraintViolationError,
+    PrimaryKeyConstraint, UniqueConstraint
+)
+
+
+def test_only_violation_errors_reject_data(tmp_path):
+    """validate_data fails on ConstraintViolationError, not on a False result"""
+    manager = ConstraintManager(str(tmp_path))
+    manager.add_constraint(CheckConstraint(
+        name="chk_users_name", constraint_type=ConstraintType.CHECK, table_name="users",
+        fields=["name"], check_expression="name != 'x'"
+    ))
+    manager.add_constraint(UniqueConstraint(
+        name="uq_users_name", constraint_type=ConstraintType.UNIQUE, table_name="users", fields=["name"]
+    ))
+
+    assert manager.validate_data("users", {'name': 'x'}) is True
+    assert manager.validate_data("users", {'age': 3}) is True
+
+
+def test_validation_follows_constraint_changes(tmp_path):
+    """Adding, removing or deactivating a constraint applies to the next validation"""
+    manager = ConstraintManager(str(tmp_path))
+    primary_key = PrimaryKeyConstraint(
+        name="pk_users_id", constraint_type=ConstraintType.PRIMARY_KEY, table_name="users", fields=["id"]
+    )
+    assert manager.validate_data("users", {'name': 'a'}) is True
+
+    manager.add_constraint(primary_key)
+    with pytest.raises(ConstraintViolationError):
+        manager.validate_data("users", {'name': 'a'})
+
+    primary_key.is_active = False
+    assert manager.validate_data("users", {'name': 'a'}) is True
+    primary_key.is_active = True
+    with pytest.raises(ConstraintViolationError):
+        manager.validate_data("users", {'name': 'a'})
+
+    manager.remove_constraint("pk_users_id")
+    assert manager.validate_data("users", {'name': 'a'}) is True
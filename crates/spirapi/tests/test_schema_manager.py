@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Tests du gestionnaire de schémas SpiraPi
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.storage.schema_manager import (
+    AdaptiveSchema, FieldType, SchemaField, SchemaManager, SchemaZone, ValidationRule
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run in an empty directory; table record logs live under ./data"""
+    monkeypatch.chdir(tmp_path)
+    return "data"
+
+
+def test_schemas_survive_reopen(data_dir):
+    """Schemas stored in segment-backed schema storage load back with their fields"""
+    manager = SchemaManager(data_dir)
+    manager.create_schema("users", SchemaZone.FLEXIBLE, [
+        SchemaField("name", FieldType.STRING, is_required=True),
+        SchemaField("age", FieldType.INTEGER),
+    ])
+    manager.close()
+
+    reopened = SchemaManager(data_dir)
+    assert sorted(reopened.schemas) == ["users"]
+    assert set(reopened.get_schema("users").fields) >= {"name", "age"}
+    reopened.close()
+
+
+def _open_users_table(data_dir):
+    manager = SchemaManager(data_dir)
+    if manager.get_schema("users") is None:
+        manager.create_schema("users", SchemaZone.FLEXIBLE, [SchemaField("name", FieldType.STRING)])
+    return manager
+
+
+def test_record_log_round_trip(data_dir):
+    """Records append to the table log and read back in order, newest version per ID"""
+    manager = _open_users_table(data_dir)
+    ids = [manager.create_record("users", {'name': f'n{i}'}) for i in range(10)]
+    ids += manager.create_records("users", [{'id': f'b{i}', 'name': f'b{i}'} for i in range(5)])
+    manager.create_record("users", {'id': ids[0], 'name': 'updated'})
+
+    records = manager.get_records("users", limit=100)
+    assert [record['id'] for record in records] == ids
+    assert records[0]['name'] == 'updated'
+    assert len(manager.get_records("users", limit=3)) == 3
+
+    table_dir = os.path.join("data", "tables", "users")
+    assert sorted(os.listdir(table_dir)) == ["records.idx", "records.log"]
+    manager.close()
+
+
+def test_record_log_survives_reopen(data_dir):
+    """The offset index is reloaded from records.idx after a reopen"""
+    manager = _open_users_table(data_dir)
+    ids = manager.create_records("users", [{'name': f'n{i}'} for i in range(20)], sync=True)
+    manager.close()
+
+    reopened = _open_users_table(data_dir)
+    assert [record['id'] for record in reopened.get_records("users", limit=100)] == ids
+    reopened.create_record("users", {'id': 'late', 'name': 'late'})
+    assert reopened.get_records("users", limit=100)[-1]['name'] == 'late'
+    reopened.close()
+
+
+def test_record_index_is_rebuilt_from_log(data_dir):
+    """A missing records.idx is rebuilt by scanning records.log"""
+    manager = _open_users_table(data_dir)
+    ids = [manager.create_record("users", {'name': f'n{i}'}) for i in range(5)]
+    manager.create_record("users", {'id': ids[2], 'name': 'updated'})
+    manager.close()
+
+    os.remove(os.path.join("data", "tables", "users", "records.idx"))
+    reopened = _open_users_table(data_dir)
+    records = reopened.get_records("users", limit=100)
+    assert [record['id'] for record in records] == ids
+    assert records[2]['name'] == 'updated'
+    reopened.close()
+
+
+def test_torn_index_entry_is_ignored(data_dir):
+    """A partially written trailing index entry does not break loading"""
+    manager = _open_users_table(data_dir)
+    ids = [manager.create_record("users", {'name': f'n{i}'}) for i in range(3)]
+    manager.close()
+
+    with open(os.path.join("data", "tables", "users", "records.idx"), 'ab') as f:
+        f.write(b'["torn", 12')
+    reopened = _open_users_table(data_dir)
+    assert [record['id'] for record in reopened.get_records("users", limit=100)] == ids
+    reopened.close()
+
+
+def test_unindexed_log_records_are_recovered(data_dir):
+    """Records that reached records.log but not records.idx are reindexed on load"""
+    manager = _open_users_table(data_dir)
+    ids = [manager.create_record("users", {'name': f'n{i}'}) for i in range(3)]
+    manager.close()
+
+    index_path = os.path.join("data", "tables", "users", "records.idx")
+    with open(index_path, 'rb') as f:
+        lines = f.readlines()
+    with open(index_path, 'wb') as f:
+        f.write(b''.join(lines[:-1]) + lines[-1][:5])
+
+    reopened = _open_users_table(data_dir)
+    assert [record['id'] for record in reopened.get_records("users", limit=100)] == ids
+    reopened.create_record("users", {'id': 'late', 'name': 'late'})
+    reopened.close()
+
+    with open(index_path, 'rb') as f:
+        assert [json.loads(line)[0] for line in f] == ids + ['late']
+    reopened = _open_users_table(data_dir)
+    assert [record['id'] for record in reopened.get_records("users", limit=100)] == ids + ['late']
+    reopened.close()
+
+
+def test_record_log_shared_by_two_managers(data_dir):
+    """Managers with their own record indexes, as in two processes, append to one table log"""
+    first = _open_users_table(data_dir)
+    first.flush()
+    second = _open_users_table(data_dir)
+
+    ids = []
+    for i in range(5):
+        ids.append(first.create_record("users", {'name': f'a{i}'}))
+        ids += second.create_records("users", [{'name': f'b{i}_{j}'} for j in range(3)])
+    second.create_record("users", {'id': ids[0], 'name': 'updated'})
+
+    for manager in (first, second):
+        records = manager.get_records("users", limit=100)
+        assert [record['id'] for record in records] == ids
+        assert records[0]['name'] == 'updated'
+    first.close()
+    second.close()
+
+    reopened = _open_users_table(data_dir)
+    assert [record['id'] for record in reopened.get_records("users", limit=100)] == ids
+    reopened.close()
+
+
+def test_imported_schema_is_persisted_without_close(data_dir):
+    """Queued schema writes finish before the interpreter exits"""
+    manager = _open_users_table(data_dir)
+    exported = manager.get_schema("users").to_dict()
+    manager.close()
+
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from src.storage.schema_manager import SchemaManager\n"
+        "import json\n"
+        "manager = SchemaManager('data')\n"
+        "manager.import_schema(json.loads(sys.argv[2]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, project_root, json.dumps({**exported, 'name': 'imported'})],
+        timeout=60
+    )
+    assert result.returncode == 0
+
+    reopened = SchemaManager(data_dir)
+    assert reopened.get_schema("imported") is not None
+    reopened.close()
+
+
+def test_restore_schemas_persists_backup(data_dir, tmp_path):
+    """Restored schemas are usable at once and stored for the next reopen"""
+    source = SchemaManager(str(tmp_path / "source"))
+    for name in ("users", "orders", "items"):
+        source.create_schema(name, SchemaZone.FLEXIBLE, [SchemaField("name", FieldType.STRING)])
+    backup_path = source.backup_schemas(str(tmp_path / "schemas.json"))
+    source.close()
+
+    manager = SchemaManager(data_dir)
+    assert manager.restore_schemas(backup_path) == 3
+    assert sorted(manager.schemas) == ["items", "orders", "users"]
+    manager.close()
+
+    reopened = SchemaManager(data_dir)
+    assert sorted(reopened.schemas) == ["items", "orders", "users"]
+    reopened.close()
+
+
+def test_generated_record_ids_follow_creation_order(data_dir):
+    """Table records and database records share one ID scheme"""
+    manager = _open_users_table(data_dir)
+    record_ids = [manager.create_record("users", {'name': f'n{i}'}) for i in range(5)]
+    sequence_id = manager.database.store_sequence({'n': 1})
+
+    assert all(record_id.startswith("record_") for record_id in record_ids)
+    assert sequence_id.startswith("seq_")
+    counters = [int(record_id.split("_")[1], 16) for record_id in record_ids + [sequence_id]]
+    assert counters == sorted(counters) and len(set(counters)) == len(counters)
+    manager.close()
+
+
+def test_serialized_schema_tracks_field_and_schema_changes(data_dir):
+    """Field edits, container edits and direct assignments show up in to_dict and backups"""
+    schema = AdaptiveSchema("users", fields={"a": SchemaField("a", FieldType.STRING)})
+    schema.fields["a"].add_validation_rule(ValidationRule.MAX_LENGTH, 5)
+    schema.fields["a"].validation_rules['MIN_LENGTH'] = 1
+    schema.zone = SchemaZone.STRUCTURED
+    schema.metadata['description'] = 'people'
+
+    data = schema.to_dict()
+    assert data['fields']['a']['validation_rules'] == {'MAX_LENGTH': 5, 'MIN_LENGTH': 1}
+    assert data['zone'] == 'STRUCTURED'
+    assert data['metadata'] == {'description': 'people'}
+
+    manager = SchemaManager(data_dir)
+    manager.create_schema("users", SchemaZone.FLEXIBLE, [SchemaField("name", FieldType.STRING)])
+    manager.backup_schemas("before.json")
+    manager.get_schema("users").metadata['description'] = 'edited'
+    with open(manager.backup_schemas("after.json"), 'rb') as f:
+        assert json.load(f)['schemas']['users']['metadata'] == {'description': 'edited'}
+    manager.close()
+
+
+def test_integers_beyond_64_bits_round_trip(data_dir):
+    """Record values too wide for orjson are stored and read back exactly"""
+    manager = _open_users_table(data_dir)
+    manager.create_record("users", {'id': 'wide', 'name': 'w', 'n': 2**70, 'neg': -(2**65)})
+    manager.close()
+
+    reopened = _open_users_table(data_dir)
+    record = reopened.get_records("users", limit=10)[0]
+    assert record['n'] == 2**70 and record['neg'] == -(2**65)
+    reopened.close()
+
+
+def test_legacy_record_files_rewritten_to_the_log_are_not_repeated(data_dir):
+    """Legacy one-file-per-record tables list a rewritten record once, from the log"""
+    manager = _open_users_table(data_dir)
+    table_dir = os.path.join("data", "tables", "users")
+    os.makedirs(table_dir, exist_ok=True)
+    for i in range(10):
+        with open(os.path.join(table_dir, f"old{i}.json"), 'w') as f:
+            json.dump({'id': f'old{i}', 'name': 'legacy'}, f)
+    manager.create_record("users", {'id': 'old3', 'name': 'rewritten'})
+
+    records = manager.get_records("users", limit=100)
+    assert sorted(record['id'] for record in records) == sorted(f'old{i}' for i in range(10))
+    assert [record['name'] for record in records if record['id'] == 'old3'] == ['rewritten']
+    manager.close()
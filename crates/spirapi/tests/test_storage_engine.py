@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Tests du moteur de stockage SpiraPi: segments, journal d'index, accès multi-processus
+et dépendances optionnelles (msgpack, zstandard, xxhash, numpy)
+"""
+
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.storage import spirapi_database
+from src.storage.spirapi_database import (
+    CHECKSUM_XXH3, SpiraPiDatabase, SpiraPiStorageEngine, StorageRecord, StorageType
+)
+
+
+def test_segment_round_trip_and_reopen(tmp_path):
+    """Records written to segment files read back before and after a reopen"""
+    db = SpiraPiDatabase(str(tmp_path))
+    for i in range(50):
+        db.store_sequence({'id': f's{i}', 'n': i, 'payload': 'x' * i})
+    db.store_schema({'id': 'schema1', 'name': 'users'})
+
+    segments = list((tmp_path / "sequence" / "data").glob("seg_*.dat"))
+    assert segments
+    assert db.retrieve_sequence('s42')['payload'] == 'x' * 42
+
+    db.close()
+
+    reopened = SpiraPiDatabase(str(tmp_path))
+    assert [reopened.retrieve_sequence(f's{i}')['n'] for i in range(50)] == list(range(50))
+    assert reopened.retrieve_schema('schema1')['name'] == 'users'
+    reopened.close()
+
+
+def _join_snapshots(db):
+    """Wait for background index snapshots on every storage component"""
+    for component in db.storage_engine.components.values():
+        if component._snapshot_thread is not None:
+            component._snapshot_thread.join()
+
+
+def test_operation_log_replay_after_crash(tmp_path, monkeypatch):
+    """An unclosed directory is recovered from the index snapshot plus the operation log"""
+    monkeypatch.setattr(spirapi_database, 'MEMORY_INDEX_SNAPSHOT_INTERVAL', 7)
+    source = tmp_path / "source"
+    db = SpiraPiDatabase(str(source))
+    for i in range(30):
+        db.store_sequence({'id': f's{i}', 'n': i})
+    for i in range(0, 30, 3):
+        db.storage_engine.delete(f's{i}', StorageType.SEQUENCE)
+    _join_snapshots(db)
+
+    # Copy the directory as a crash would leave it: no final snapshot
+    crashed = tmp_path / "crashed"
+    shutil.copytree(source, crashed)
+    assert (crashed / "sequence" / "meta" / "memory_index.wal").exists()
+    db.close()
+
+    recovered = SpiraPiDatabase(str(crashed))
+    assert len(recovered.storage_engine.sequence_storage.memory_index) == 20
+    assert recovered.retrieve_sequence('s3') is None
+    assert recovered.retrieve_sequence('s4')['n'] == 4
+    recovered.close()
+
+
+def test_failed_snapshot_keeps_rotated_operation_log(tmp_path, monkeypatch):
+    """A rotation after a failed snapshot extends the rotated log instead of replacing it"""
+    monkeypatch.setattr(spirapi_database, 'MEMORY_INDEX_SNAPSHOT_INTERVAL', 5)
+    source = tmp_path / "source"
+    db = SpiraPiDatabase(str(source))
+    component = db.storage_engine.sequence_storage
+
+    def fail_snapshot(value, indent=False):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(spirapi_database, '_json_bytes', fail_snapshot)
+    for batch in range(3):
+        for i in range(5):
+            db.store_sequence({'id': f's{batch}_{i}', 'n': i})
+        component._snapshot_thread.join()
+    assert (source / "sequence" / "meta" / "memory_index.wal.1").exists()
+
+    crashed = tmp_path / "crashed"
+    shutil.copytree(source, crashed)
+    monkeypatch.undo()
+    db.close()
+
+    recovered = SpiraPiDatabase(str(crashed))
+    assert len(recovered.storage_engine.sequence_storage.memory_index) == 15
+    assert recovered.retrieve_sequence('s0_0')['n'] == 0
+    recovered.close()
+
+
+def test_databases_on_one_directory_share_the_engine(tmp_path):
+    """Two databases on one directory see each other's writes through one engine"""
+    first = SpiraPiDatabase(str(tmp_path))
+    second = SpiraPiDatabase(os.path.join(str(tmp_path), "."))
+    assert first.storage_engine is second.storage_engine
+
+    for i in range(20):
+        first.store_sequence({'id': f'a{i}', 'n': i})
+        second.store_sequence({'id': f'b{i}', 'n': i})
+    assert second.retrieve_sequence('a7')['n'] == 7
+    assert first.retrieve_sequence('b7')['n'] == 7
+
+    # The engine stays open until its last user closes
+    first.close()
+    assert second.retrieve_sequence('a19')['n'] == 19
+    second.close()
+
+    reopened = SpiraPiDatabase(str(tmp_path))
+    assert reopened.storage_engine is not first.storage_engine
+    assert all(reopened.retrieve_sequence(f'{p}{i}')['n'] == i for p in 'ab' for i in range(20))
+    reopened.close()
+
+
+def test_engines_on_one_directory_see_each_other(tmp_path, monkeypatch):
+    """Separate engines on one directory, as in two processes, apply each other's writes"""
+    monkeypatch.setattr(spirapi_database, 'MEMORY_INDEX_SNAPSHOT_INTERVAL', 7)
+    first = SpiraPiStorageEngine(str(tmp_path))
+    second = SpiraPiStorageEngine(str(tmp_path))
+
+    def record(record_id, n):
+        return StorageRecord.create(record_id, StorageType.SEQUENCE, {'n': n}, {'owner': 'test'}, time.time())
+
+    for i in range(20):
+        assert first.store(record(f'a{i}', i))
+        assert second.store(record(f'b{i}', i))
+    assert second.retrieve('a7', StorageType.SEQUENCE).data['n'] == 7
+    assert first.retrieve('b7', StorageType.SEQUENCE).data['n'] == 7
+
+    # Cached records and the field index follow updates and deletes made elsewhere
+    assert second.store(record('a7', 70))
+    assert second.delete('a8', StorageType.SEQUENCE)
+    assert first.retrieve('a7', StorageType.SEQUENCE).data['n'] == 70
+    assert first.retrieve('a8', StorageType.SEQUENCE) is None
+    assert first.search_ids({'n': 70}, StorageType.SEQUENCE) == ['a7']
+    assert len(first.search_ids({'owner': 'test'}, StorageType.SEQUENCE)) == 39
+
+    first.close()
+    assert second.store(record('late', 1))
+    second.close()
+
+    reopened = SpiraPiStorageEngine(str(tmp_path))
+    assert len(reopened.sequence_storage.memory_index) == 40
+    assert reopened.retrieve('a7', StorageType.SEQUENCE).data['n'] == 70
+    assert reopened.retrieve('late', StorageType.SEQUENCE) is not None
+    reopened.close()
+
+
+def test_other_process_writes_alongside(tmp_path):
+    """Another process can store records in a directory this process has open"""
+    db = SpiraPiDatabase(str(tmp_path))
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from src.storage.spirapi_database import SpiraPiDatabase\n"
+        "db = SpiraPiDatabase(sys.argv[2])\n"
+        "for i in range(300):\n"
+        "    db.store_sequence({'id': f'child{i}', 'n': i})\n"
+        "assert db.retrieve_sequence('parent0')['n'] == 0\n"
+        "db.close()\n"
+    )
+    db.store_sequence({'id': 'parent0', 'n': 0})
+    child = subprocess.Popen([sys.executable, "-c", script, project_root, str(tmp_path)])
+    for i in range(1, 300):
+        db.store_sequence({'id': f'parent{i}', 'n': i})
+    assert child.wait(timeout=60) == 0
+
+    assert all(db.retrieve_sequence(f'child{i}')['n'] == i for i in range(300))
+    assert all(db.retrieve_sequence(f'parent{i}')['n'] == i for i in range(300))
+    assert len(db.search_sequences({'n': 5})) == 2
+    db.close()
+
+    reopened = SpiraPiDatabase(str(tmp_path))
+    assert len(reopened.storage_engine.sequence_storage.memory_index) == 600
+    reopened.close()
+
+
+def test_update_during_read_does_not_leave_stale_cache_entry(tmp_path, monkeypatch):
+    """A read racing with an update cannot put the previous version back in the cache"""
+    db = SpiraPiDatabase(str(tmp_path))
+    engine = db.storage_engine
+    db.store_query({'id': 'q1', 'v': 'old'})
+    engine._record_cache.clear()
+
+    component = engine.query_storage
+    original_retrieve = component.retrieve
+    read_started = threading.Event()
+    release_read = threading.Event()
+
+    def slow_retrieve(record_id, verify=False):
+        record = original_retrieve(record_id, verify=verify)
+        read_started.set()
+        release_read.wait(5)
+        return record
+
+    monkeypatch.setattr(component, 'retrieve', slow_retrieve)
+    reader = threading.Thread(target=engine.retrieve, args=('q1', StorageType.QUERY))
+    reader.start()
+    read_started.wait(5)
+
+    writer = threading.Thread(target=db.store_query, args=({'id': 'q1', 'v': 'new'},))
+    writer.start()
+    time.sleep(0.05)
+    release_read.set()
+    reader.join()
+    writer.join()
+    monkeypatch.setattr(component, 'retrieve', original_retrieve)
+
+    assert db.retrieve_query('q1')['v'] == 'new'
+    db.close()
+
+
+CodecPoint = namedtuple('CodecPoint', 'x y')
+CODEC_SAMPLE = {'n': 1, 'items': [1, 2.5, 'x'], 'raw': b'\x00\x01', 'none': None}
+
+
+def _assert_legacy_payloads_decode(component, monkeypatch):
+    """Untagged pickle payloads written before the codec byte still decode"""
+    monkeypatch.setattr(component, 'enable_compression', True)
+    assert component._deserialize_data(zlib.compress(pickle.dumps(CODEC_SAMPLE))) == CODEC_SAMPLE
+    monkeypatch.setattr(component, 'enable_compression', False)
+    assert component._deserialize_data(pickle.dumps(CODEC_SAMPLE)) == CODEC_SAMPLE
+
+
+def test_msgpack_codec_round_trip(tmp_path, monkeypatch):
+    """msgpack payloads round-trip, and 0x01 / 0x03 payloads decode under any settings"""
+    msgpack = pytest.importorskip("msgpack")
+    monkeypatch.setattr(spirapi_database, 'zstandard', None)
+    db = SpiraPiDatabase(str(tmp_path))
+    component = db.storage_engine.sequence_storage
+    packed = msgpack.packb(CODEC_SAMPLE, use_bin_type=True)
+
+    for compression, codec in ((False, 0x01), (True, 0x03)):
+        monkeypatch.setattr(component, 'enable_compression', compression)
+        payload = component._serialize_data(CODEC_SAMPLE)
+        assert payload[0] == codec
+        assert component._deserialize_data(payload) == CODEC_SAMPLE
+        assert component._deserialize_data(b'\x01' + packed) == CODEC_SAMPLE
+        assert component._deserialize_data(b'\x03' + zlib.compress(packed)) == CODEC_SAMPLE
+
+    _assert_legacy_payloads_decode(component, monkeypatch)
+    db.store_sequence({'id': 's1', 'payload': CODEC_SAMPLE})
+    db.close()
+
+    reopened = SpiraPiDatabase(str(tmp_path))
+    assert reopened.retrieve_sequence('s1')['payload'] == CODEC_SAMPLE
+    reopened.close()
+
+
+def test_zstd_codecs_round_trip(tmp_path, monkeypatch):
+    """zstd payloads round-trip, and every codec byte from 0x01 to 0x04 decodes"""
+    msgpack = pytest.importorskip("msgpack")
+    zstandard = pytest.importorskip("zstandard")
+    db = SpiraPiDatabase(str(tmp_path))
+    component = db.storage_engine.sequence_storage
+    packed = msgpack.packb(CODEC_SAMPLE, use_bin_type=True)
+    compress = zstandard.ZstdCompressor().compress
+
+    # Values msgpack cannot represent fall back to zstd-compressed pickle
+    pickled_only = {'tags': {'a', 'b'}}
+    for value, codec in ((CODEC_SAMPLE, 0x02), (pickled_only, 0x04)):
+        payload = component._serialize_data(value)
+        assert payload[0] == codec
+        assert component._deserialize_data(payload) == value
+
+    assert component._deserialize_data(b'\x01' + packed) == CODEC_SAMPLE
+    assert component._deserialize_data(b'\x02' + compress(packed)) == CODEC_SAMPLE
+    assert component._deserialize_data(b'\x03' + zlib.compress(packed)) == CODEC_SAMPLE
+    assert component._deserialize_data(b'\x04' + compress(pickle.dumps(pickled_only))) == pickled_only
+    _assert_legacy_payloads_decode(component, monkeypatch)
+    db.close()
+
+
+def test_xxh3_checksums(tmp_path):
+    """xxh3 records validate, batch checksums match, and SHA-256 records still validate"""
+    pytest.importorskip("xxhash")
+    db = SpiraPiDatabase(str(tmp_path), checksum_algorithm=CHECKSUM_XXH3)
+    db.store_sequence({'id': 's1', 'n': 1})
+    db.close()
+
+    reopened = SpiraPiDatabase(str(tmp_path), verify_reads=True)
+    record = reopened.storage_engine.retrieve('s1', StorageType.SEQUENCE)
+    assert record.checksum.startswith(CHECKSUM_XXH3 + ":")
+    assert record.validate_integrity()
+    reopened.store_sequence({'id': 's2', 'n': 2})
+    assert reopened.storage_engine.retrieve('s2', StorageType.SEQUENCE).validate_integrity()
+
+    records = [StorageRecord.create(f'r{i}', StorageType.SEQUENCE, {'n': i}, {}, 1.0, CHECKSUM_XXH3)
+               for i in range(3)]
+    assert StorageRecord.calculate_checksums_batch(records, CHECKSUM_XXH3) == [r.checksum for r in records]
+    records[0].data['n'] = 99
+    assert not records[0].validate_integrity()
+    reopened.close()
+
+
+def test_numpy_cleanup_matches_pure_python(tmp_path, monkeypatch):
+    """The NumPy timestamp filter removes the same records as the pure-Python one"""
+    pytest.importorskip("numpy")
+    expired = {}
+    for use_numpy in (True, False):
+        db = SpiraPiDatabase(str(tmp_path / str(use_numpy)))
+        component = db.storage_engine.sequence_storage
+        for i in range(20):
+            db.store_sequence({'id': f's{i}', 'n': i})
+        for i, entry in enumerate(component.memory_index.values()):
+            entry['timestamp'] = float(i)
+        if not use_numpy:
+            monkeypatch.setattr(spirapi_database, 'np', None)
+        assert component.cleanup_old_records(7.5) == 8
+        expired[use_numpy] = sorted(set(f's{i}' for i in range(20)) - set(component.memory_index))
+        db.close()
+
+    assert expired[True] == expired[False] == sorted(f's{i}' for i in range(8))
+
+
+def test_indexed_search_returns_oldest_records_first(tmp_path):
+    """Field-indexed searches walk only the candidates and return them in timestamp order"""
+    db = SpiraPiDatabase(str(tmp_path))
+    for i in range(20):
+        db.store_query({'id': f'q{i:02d}', 'schema_name': 'even' if i % 2 == 0 else 'odd'})
+    engine = db.storage_engine
+
+    expected = [f'q{i:02d}' for i in range(0, 20, 2)]
+    assert engine.search_ids({'schema_name': 'even'}, StorageType.QUERY) == expected
+    assert [r.id for r in engine.search({'schema_name': 'even'}, StorageType.QUERY)] == expected
+    assert engine.search_ids({'schema_name': 'even', 'id': 'q04'}, StorageType.QUERY) == ['q04']
+    db.close()
+
+
+def test_msgpack_codec_keeps_tuples_and_subclasses(tmp_path):
+    """Tuples and container subclasses decode with the types they were stored with"""
+    pytest.importorskip("msgpack")
+    db = SpiraPiDatabase(str(tmp_path))
+    component = db.storage_engine.sequence_storage
+
+    values = [
+        {'pair': (1, 2), 'nested': [(3, (4, 'five')), []], (6, 7): 'tuple key'},
+        (1, [2, (3,)]),
+        {'ordered': OrderedDict(a=1), 'point': CodecPoint(1, 2)},
+    ]
+    for compression in (False, True):
+        component.enable_compression = compression
+        for value in values:
+            decoded = component._deserialize_data(component._serialize_data(value))
+            assert decoded == value
+            assert repr(decoded) == repr(value)
+    db.close()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests du journal des transactions SpiraPi
+"""
+
+import dataclasses
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.storage import transactions
+from src.storage.transactions import (
+    LockManager, Transaction, TransactionLog, TransactionManager, TransactionState
+)
+
+
+def test_transaction_log_is_hashable_and_frozen():
+    """Log entries with dict payloads can be hashed and cannot be modified"""
+    entry = TransactionLog("op1", "UPDATE", "users", "r1", old_data={'v': 1}, new_data={'v': 2})
+    assert {entry: True}[entry]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        entry.table_name = "orders"
+
+
+def test_transaction_log_round_trip():
+    """to_dict and from_dict preserve a log entry"""
+    entry = TransactionLog("op1", "INSERT", "users", "r1", new_data={'name': 'a'})
+    restored = TransactionLog.from_dict(entry.to_dict())
+    assert restored.to_dict() == entry.to_dict()
+
+
+def test_lock_waits_for_release_and_times_out():
+    """A blocked acquire wakes on release, and gives up once its timeout passes"""
+    locks = LockManager()
+    writer, reader, other = Transaction("w"), Transaction("r"), Transaction("o")
+    assert locks.acquire_lock(writer, "users", "EXCLUSIVE")
+
+    assert not locks.acquire_lock(other, "users", "SHARED", timeout=0.05)
+    assert locks.waiting_transactions["users"] == []
+
+    acquired = []
+
+    def wait_for_shared():
+        acquired.append(locks.acquire_lock(reader, "users", "SHARED", timeout=5))
+
+    waiter = threading.Thread(target=wait_for_shared)
+    waiter.start()
+    time.sleep(0.05)
+    assert waiter.is_alive() and locks.waiting_transactions["users"] == [reader]
+    locks.release_all_locks(writer)
+    waiter.join(timeout=5)
+
+    assert acquired == [True]
+    assert locks.shared_holders["users"] == {"r"}
+    assert "users" not in locks.exclusive_holder
+    assert locks.waiting_transactions["users"] == []
+
+
+def test_sole_shared_holder_upgrades_to_exclusive():
+    """Only a transaction holding the sole SHARED lock may take the EXCLUSIVE lock"""
+    locks = LockManager()
+    first, second = Transaction("a"), Transaction("b")
+    assert locks.acquire_lock(first, "users", "SHARED")
+    assert locks.acquire_lock(second, "users", "SHARED")
+    assert not locks.acquire_lock(first, "users", "EXCLUSIVE", timeout=0.05)
+
+    locks.release_lock(second, "users", "SHARED")
+    assert locks.acquire_lock(first, "users", "EXCLUSIVE", timeout=0)
+    assert first.locks_held == {("users", "SHARED"), ("users", "EXCLUSIVE")}
+    assert not locks.acquire_lock(second, "users", "SHARED", timeout=0.05)
+
+
+def _commit(manager, count):
+    ids = []
+    for _ in range(count):
+        transaction_id = manager.begin_transaction()
+        manager.add_operation(transaction_id, TransactionLog("op", "INSERT", "users", "r1", new_data={'n': 1}))
+        assert manager.commit_transaction(transaction_id)
+        ids.append(transaction_id)
+    return ids
+
+
+def test_committed_transactions_survive_restart_after_checkpoint(tmp_path, monkeypatch):
+    """A checkpoint truncates the log, and the snapshot plus the log tail replay on restart"""
+    monkeypatch.setattr(transactions, 'TRANSACTION_CHECKPOINT_INTERVAL', 3)
+    manager = TransactionManager(str(tmp_path))
+    committed = _commit(manager, 4)
+    rolled_back = manager.begin_transaction()
+    manager.rollback_transaction(rolled_back)
+
+    history_dir = tmp_path / "transactions"
+    assert (history_dir / "transaction_history.json").exists()
+    with open(history_dir / "transaction_history.wal", 'rb') as f:
+        assert len(f.readlines()) == 2
+    # No close: the log is flushed on every append
+    reopened = TransactionManager(str(tmp_path))
+
+    assert list(reopened.committed_transactions) == committed
+    assert reopened.get_transaction(committed[0]).state == TransactionState.COMMITTED
+    assert reopened.get_transaction(rolled_back) is None
+    manager.close()
+    reopened.close()
+
+
+def test_evicted_transactions_are_read_back_from_the_archive(tmp_path, monkeypatch):
+    """Committed transactions dropped from memory stay reachable before and after a restart"""
+    monkeypatch.setattr(transactions, 'MAX_CACHED_COMMITTED', 2)
+    monkeypatch.setattr(transactions, 'TRANSACTION_CHECKPOINT_INTERVAL', 3)
+    manager = TransactionManager(str(tmp_path))
+    committed = _commit(manager, 5)
+
+    assert list(manager.committed_transactions) == committed[-2:]
+    assert all(manager.get_transaction(tx_id).state == TransactionState.COMMITTED for tx_id in committed)
+    manager.close()
+
+    reopened = TransactionManager(str(tmp_path))
+    assert list(reopened.committed_transactions) == committed[-2:]
+    assert sorted(reopened._archive_offsets) == sorted(committed[:3])
+    archived = reopened.get_transaction(committed[0])
+    assert archived.transaction_id == committed[0]
+    assert archived.state == TransactionState.COMMITTED
+    reopened.close()